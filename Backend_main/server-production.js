@@ -968,6 +968,68 @@ app.use(express.static(frontendPath));
     }
   });
 
+  // Proxy endpoint for batched SODA analysis (many words, one request)
+  app.post("/analyze_soda/batch", upload.array("audio"), async (req, res) => {
+    try {
+      const targetWords = [].concat(req.body.target_word || []);
+      const files = req.files || [];
+
+      if (targetWords.length === 0 || targetWords.length !== files.length) {
+        return res.status(400).json({
+          error: "Send one audio file per target_word",
+        });
+      }
+
+      // Re-emit the pairs in their original order
+      const formData = new FormData();
+      targetWords.forEach((word, i) => {
+        formData.append("target_word", word);
+        formData.append("audio", files[i].buffer, {
+          filename: files[i].originalname || `recording_${i}.wav`,
+          contentType: files[i].mimetype,
+        });
+      });
+
+      const response = await axios.post(
+        `${PYTHON_BACKEND_URL}/analyze_soda/batch`,
+        formData,
+        {
+          headers: {
+            ...formData.getHeaders(),
+          },
+          maxContentLength: Infinity,
+          maxBodyLength: Infinity,
+          timeout: 300000, // 5 minute timeout for a whole session
+        },
+      );
+
+      console.log(`✅ SODA batch analysis successful (${targetWords.length} items)`);
+      res.json(response.data);
+    } catch (error) {
+      console.error("❌ SODA batch proxy error:", error.message);
+
+      if (error.response) {
+        res.status(error.response.status).json(error.response.data);
+      } else if (error.code === "ECONNREFUSED") {
+        res.status(503).json({
+          error: "Python backend unavailable",
+          details: `Cannot connect to ${PYTHON_BACKEND_URL}. Make sure Flask server is running.`,
+        });
+      } else if (error.code === "ETIMEDOUT") {
+        res.status(504).json({
+          error: "Request timeout",
+          details: "Python backend took too long to respond",
+        });
+      } else {
+        res.status(500).json({
+          error: "Failed to analyze audio",
+          details: error.message || "Unknown error occurred",
+          code: error.code,
+        });
+      }
+    }
+  });
+
   // Proxy endpoint for IPA to Kannada conversion
   app.post("/ipa2kannada", async (req, res) => {
     try {
@@ -1025,6 +1087,52 @@ app.use(express.static(frontendPath));
     }
   });
 
+  // Proxy endpoint for batched IPA to Kannada conversion
+  app.post("/ipa2kannada/batch", async (req, res) => {
+    try {
+      if (!req.body.items || !Array.isArray(req.body.items)) {
+        return res.status(400).json({
+          error: "Missing or invalid items parameter",
+        });
+      }
+
+      const response = await axios.post(
+        `${PYTHON_BACKEND_URL}/ipa2kannada/batch`,
+        req.body,
+        {
+          headers: {
+            "Content-Type": "application/json",
+          },
+          timeout: 10000, // 10 second timeout
+        },
+      );
+
+      res.json(response.data);
+    } catch (error) {
+      console.error("❌ IPA2Kannada batch proxy error:", error.message);
+
+      if (error.response) {
+        res.status(error.response.status).json(error.response.data);
+      } else if (error.code === "ECONNREFUSED") {
+        res.status(503).json({
+          error: "Python backend unavailable",
+          details: `Cannot connect to ${PYTHON_BACKEND_URL}. Make sure Flask server is running.`,
+        });
+      } else if (error.code === "ETIMEDOUT") {
+        res.status(504).json({
+          error: "Request timeout",
+          details: "Python backend took too long to respond",
+        });
+      } else {
+        res.status(500).json({
+          error: "Failed to convert IPA to Kannada",
+          details: error.message || "Unknown error occurred",
+          code: error.code,
+        });
+      }
+    }
+  });
+
   // Fallback: serve index.html for any unknown route (SPA fallback - MUST be last)
   // Express 5 requires named wildcard parameter syntax instead of just "*"
   app.get("/{*splat}", (req, res) => {
@@ -429,63 +429,40 @@ async function buildReportDetails(report) {
   );
 
   /**
-   * Convert a target_syllable IPA list into a single Kannada word
-   * by calling the Flask backend, which uses ipa2kannada_value
+   * Convert many target_syllable IPA lists into Kannada words with a
+   * single call to the Flask backend, which uses ipa2kannada_batch
    * from txt2ipa/kannada2ipa/ipaconvert.py.
    *
-   * @param {string[]} targetSyllable
-   * @returns {Promise<string>}
+   * @param {string[][]} syllableLists
+   * @returns {Promise<string[]>} one word per list ("" on failure)
    */
-  async function ipaSyllablesToKannadaWord(targetSyllable) {
-    if (!Array.isArray(targetSyllable) || targetSyllable.length === 0) {
-      return "";
+  async function ipaSyllableListsToKannadaWords(syllableLists) {
+    if (syllableLists.length === 0) {
+      return [];
     }
     try {
-      const res = await fetch(`${PYTHON_API_URL}/ipa2kannada`, {
+      const res = await fetch(`${PYTHON_API_URL}/ipa2kannada/batch`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ syllables: targetSyllable }),
+        body: JSON.stringify({ items: syllableLists }),
       });
       if (!res.ok) {
-        console.error("ipa2kannada error:", res.status);
-        return "";
+        console.error("ipa2kannada batch error:", res.status);
+        return syllableLists.map(() => "");
       }
       const data = await res.json();
-      return data.word || "";
+      return syllableLists.map((_, i) => (data.words && data.words[i]) || "");
     } catch (err) {
-      console.error("ipa2kannada request failed:", err);
-      return "";
+      console.error("ipa2kannada batch request failed:", err);
+      return syllableLists.map(() => "");
     }
   }
 
-  // ---------- Correct list (convert target_syllable → Kannada) ----------
-  const correctKannadaWords = await Promise.all(
-    correctResults.map(async (r) => {
-      if (Array.isArray(r.target_syllable) && r.target_syllable.length > 0) {
-        return await ipaSyllablesToKannadaWord(r.target_syllable);
-      }
-      return r.target_word || "";
-    }),
-  );
-  const correctList = [
-    ...new Set(correctKannadaWords.filter((w) => w && String(w).trim().length)),
-  ];
-
-  // ---------- Wrong list (convert target_syllable → Kannada) ----------
-  const wrongKannadaWords = await Promise.all(
-    errorResults.map(async (r) => {
-      if (Array.isArray(r.target_syllable) && r.target_syllable.length > 0) {
-        return await ipaSyllablesToKannadaWord(r.target_syllable);
-      }
-      return r.target_word || "";
-    }),
-  );
-  const wrongList = [
-    ...new Set(wrongKannadaWords.filter((w) => w && String(w).trim().length)),
-  ];
+  const hasSyllables = (r) =>
+    Array.isArray(r.target_syllable) && r.target_syllable.length > 0;
 
   // ---------- Practice syllables ----------
-  // Step 1: collect raw syllables (IPA or objects) from error_syllables
+  // Collect raw syllables (IPA or objects) from error_syllables
   const practiceRaw = errorResults
     .flatMap((r) => {
       if (Array.isArray(r.error_syllables)) {
@@ -499,14 +476,40 @@ async function buildReportDetails(report) {
     })
     .filter(Boolean);
 
-  // Step 2: convert each syllable to Kannada using ipa2kannada_value via Flask
-  const practiceKannada = await Promise.all(
-    practiceRaw.map(async (syl) => {
-      // Call helper with a single-syllable list
-      const word = await ipaSyllablesToKannadaWord([syl]);
-      return word || "";
-    }),
+  // Convert every target_syllable list and practice syllable in one request
+  const correctLists = correctResults.filter(hasSyllables);
+  const wrongLists = errorResults.filter(hasSyllables);
+  const converted = await ipaSyllableListsToKannadaWords([
+    ...correctLists.map((r) => r.target_syllable),
+    ...wrongLists.map((r) => r.target_syllable),
+    ...practiceRaw.map((syl) => [syl]),
+  ]);
+  const convertedCorrect = converted.slice(0, correctLists.length);
+  const convertedWrong = converted.slice(
+    correctLists.length,
+    correctLists.length + wrongLists.length,
   );
+  const practiceKannada = converted.slice(
+    correctLists.length + wrongLists.length,
+  );
+
+  // ---------- Correct list (target_syllable → Kannada) ----------
+  let correctIdx = 0;
+  const correctKannadaWords = correctResults.map((r) =>
+    hasSyllables(r) ? convertedCorrect[correctIdx++] : r.target_word || "",
+  );
+  const correctList = [
+    ...new Set(correctKannadaWords.filter((w) => w && String(w).trim().length)),
+  ];
+
+  // ---------- Wrong list (target_syllable → Kannada) ----------
+  let wrongIdx = 0;
+  const wrongKannadaWords = errorResults.map((r) =>
+    hasSyllables(r) ? convertedWrong[wrongIdx++] : r.target_word || "",
+  );
+  const wrongList = [
+    ...new Set(wrongKannadaWords.filter((w) => w && String(w).trim().length)),
+  ];
 
   const uniquePractice = [
     ...new Set(
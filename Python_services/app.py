@@ -1,15 +1,22 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import uuid
+import json
 import os
 import tempfile
-from pydub import AudioSegment
 from soda_analysis import perform_soda_analysis
-from txt2ipa.kannada2ipa.ipaconvert import ipa2kannada_value
+from utils import audio as audio_io
+from utils.audio import AudioBuffer
+from utils.pools import LazyPool
+from utils.acoustics import extract_features
+from txt2ipa.kannada2ipa.ipaconvert import kannada2ipa, ipa2kannada_word, ipa2kannada_batch
+from audio2text.recognizers import get_recognizer
+from utils.target_cache import warm_target_cache, target_cache_stats
+from syllable_Comparision.syllabify_main import syllabify_cache_stats
+from utils.phonetic_costs import get_cost_matrix
 
 # ✅ Use environment variable for ffmpeg path
 FFMPEG_PATH = os.environ.get('FFMPEG_PATH', r"C:\ffmpeg\ffmpeg-8.0-essentials_build\bin\ffmpeg.exe")
-AudioSegment.converter = FFMPEG_PATH
+audio_io.FFMPEG_PATH = FFMPEG_PATH
 
 app = Flask(__name__)
 CORS(app)  # 👈 enables cross-origin requests
@@ -17,6 +24,38 @@ CORS(app)  # 👈 enables cross-origin requests
 UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'uploads')
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Threads per worker process for /analyze_soda/batch items
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', 4))
+# Upper bound on items in one batch request
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 100))
+
+_batch_pool = LazyPool(BATCH_WORKERS, "soda-batch")
+
+
+def get_batch_pool():
+    return _batch_pool.get()
+
+
+def analyze_upload(target_word, audio_bytes):
+    """Decode one uploaded recording in memory and run SODA analysis on it."""
+    # Decode once, straight from the request body; every analysis
+    # stage shares this in-memory buffer and nothing touches the disk
+    audio = AudioBuffer.from_bytes(audio_bytes)
+    return perform_soda_analysis(target_word, audio)
+
+
+def _analyze_batch_item(target_word, audio_bytes):
+    try:
+        if not target_word or not audio_bytes:
+            return {"error": "Missing target word or audio file"}
+        result = analyze_upload(target_word, audio_bytes)
+        # Serialise here so a result jsonify can't encode fails this item
+        # only, not the whole batch response
+        return json.loads(json.dumps(result))
+    except Exception as e:
+        print("💥 Batch item exception:", e)
+        return {"error": f"Audio processing failed: {str(e)}"}
+
 
 @app.route("/", methods=["GET"])
 def health_check():
@@ -24,7 +63,9 @@ def health_check():
     return jsonify({
         "status": "OK",
         "service": "Flask SODA Analysis Backend",
-        "version": "1.0"
+        "version": "1.0",
+        "target_cache": target_cache_stats(),
+        "syllabify_cache": syllabify_cache_stats(),
     })
 
 
@@ -38,18 +79,8 @@ def analyze_soda():
             print("🚨 Missing fields:", target_word, audio_file)
             return jsonify({"error": "Missing target word or audio file"}), 400
 
-        unique_id = str(uuid.uuid4())
-        temp_path = os.path.join(UPLOAD_FOLDER, f"temp_audio_{unique_id}")
-        wav_path = os.path.join(UPLOAD_FOLDER, f"recording_{unique_id}.wav")
-        audio_file.save(temp_path)
-
-        sound = AudioSegment.from_file(temp_path)
-        sound.export(wav_path, format="wav")
-        os.remove(temp_path)
-
-        result = perform_soda_analysis(target_word, wav_path)
+        result = analyze_upload(target_word, audio_file.read())
         print("✅ SODA Result:", result)
-        os.remove(wav_path)  # Clean up processed file
 
         return jsonify(result)
       
@@ -58,6 +89,39 @@ def analyze_soda():
         return jsonify({"error": f"Audio processing failed: {str(e)}"}), 400
 
 
+@app.route("/analyze_soda/batch", methods=["POST"])
+def analyze_soda_batch():
+    """
+    Analyze many recordings from one screening session in one request.
+
+    Expects multipart/form-data with repeated, paired fields:
+      target_word=<word 1>, audio=<file 1>, target_word=<word 2>, audio=<file 2>, ...
+    Returns:
+      { "results": [<result 1>, <result 2>, ...] }   (same order as the pairs)
+
+    Items run concurrently on the worker's thread pool. Each result is
+    the same dict /analyze_soda returns, or {"error": ...} for an item
+    that failed; one bad item does not fail the batch.
+    """
+    target_words = request.form.getlist("target_word")
+    audio_files = request.files.getlist("audio")
+
+    if not target_words or len(target_words) != len(audio_files):
+        print("🚨 Batch field mismatch:", len(target_words), len(audio_files))
+        return jsonify({"error": "Send one audio file per target_word"}), 400
+    if len(target_words) > BATCH_MAX_ITEMS:
+        return jsonify({"error": f"At most {BATCH_MAX_ITEMS} items per batch"}), 400
+
+    # Read uploads on the request thread; the pool only sees bytes
+    items = [(word, f.read()) for word, f in zip(target_words, audio_files)]
+    futures = [get_batch_pool().submit(_analyze_batch_item, word, data) for word, data in items]
+    results = [future.result() for future in futures]
+    print(f"✅ SODA batch: {len(results)} items, "
+          f"{sum('error' in r for r in results)} failed")
+
+    return jsonify({"results": results})
+
+
 @app.route("/ipa2kannada", methods=["POST"])
 def ipa2kannada_api():
     """
@@ -75,12 +139,63 @@ def ipa2kannada_api():
         return jsonify({"error": "syllables must be a list"}), 400
 
     try:
-        kannada_word = "".join(ipa2kannada_value(s) for s in syllables)
+        kannada_word = ipa2kannada_word(syllables)
         return jsonify({"word": kannada_word})
     except Exception as e:
         print("💥 ipa2kannada error:", e)
         return jsonify({"error": f"Conversion failed: {str(e)}"}), 400
 
+
+@app.route("/ipa2kannada/batch", methods=["POST"])
+def ipa2kannada_batch_api():
+    """
+    Convert many IPA syllable lists into Kannada words in one call.
+
+    Expects JSON:
+      { "items": [["ipa1", "ipa2", ...], ["ipa1", ...], ...] }
+    Returns:
+      { "words": ["<kannada_word>", ...] }   (same order as items)
+    A malformed item (not a list of strings) comes back as "" on its own.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get("items", [])
+
+    if not isinstance(items, list):
+        return jsonify({"error": "items must be a list of syllable lists"}), 400
+
+    try:
+        return jsonify({"words": ipa2kannada_batch(items)})
+    except Exception as e:
+        print("💥 ipa2kannada batch error:", e)
+        return jsonify({"error": f"Conversion failed: {str(e)}"}), 400
+
+def warm_up():
+    """
+    Load everything a request needs up front: the kannada2ipa tables, the
+    words.json target cache, the phonetic cost matrix, the ingest
+    resampler (scipy.signal), the configured acoustics backend (Praat
+    bindings or the NumPy tracks) and the configured ASR backend (e.g. the
+    Whisper model).
+    Under gunicorn with preload_app this runs once in the master before it
+    forks, so workers share the loaded memory copy-on-write and the first
+    request doesn't pay for it.
+    """
+    kannada2ipa("ಅಮ್ಮ")
+    print(f"📚 Target cache warmed with {warm_target_cache()} words")
+    get_cost_matrix()
+    # 44.1 kHz stereo, so to_analysis_format really resamples (a 16 kHz
+    # mono buffer is returned as is and would skip the scipy import)
+    audio = AudioBuffer([[0.0] * 4410] * 2, 44100).to_analysis_format()
+    extract_features(audio)
+    get_recognizer().load()
+
+
+def create_app():
+    """App factory for production servers: gunicorn "app:create_app()"."""
+    warm_up()
+    return app
+
+
 # ✅ This block must exist at the end to actually run Flask
 if __name__ == "__main__":
     # Use PYTHON_PORT to avoid conflict with Node.js PORT
@@ -14,27 +14,28 @@
 #             print("please speak again")
 
 
-import speech_recognition as sr
+from audio2text.recognizers import get_recognizer
+from utils.audio import AudioBuffer
 
-def convert_audio_to_kannada_text(wav_file_path):
-    recognizer = sr.Recognizer()
-    try:
-        with sr.AudioFile(wav_file_path) as source:
-            print("📥 Loading audio file...")
-            audio_data = recognizer.record(source)
+def convert_audio_to_kannada_text(audio):
+    """
+    audio: an AudioBuffer already decoded in memory (see utils/audio.py),
+           or a path to an audio file.
 
-        print("🔍 Analysing...")
-        text = recognizer.recognize_google(audio_data, language="kn-IN")
-        print("✅ Did you say:", text)
-        print(wav_file_path)
-        return text
+    The recognizer backend (Google, local Whisper, ...) is chosen with
+    ASR_BACKEND; see audio2text/recognizers.py.
+    """
+    if isinstance(audio, str):
+        try:
+            print("📥 Loading audio file...")
+            audio = AudioBuffer.from_file(audio)
+        except FileNotFoundError:
+            print(f"⚠️ File not found: {audio}")
+            return None
 
-    except sr.UnknownValueError:
-        print("⚠️ Could not understand audio. Please try again.")
-    except sr.RequestError as e:
-        print(f"⚠️ Google API error: {e}")
-    except FileNotFoundError:
-        print(f"⚠️ File not found: {wav_file_path}")
+    return get_recognizer().transcribe(audio)
 
-# Example usage:
-result = convert_audio_to_kannada_text("recording.wav")
+if __name__ == "__main__":
+    # Example usage: python -m audio2text.a2t recording.wav
+    import sys
+    print(convert_audio_to_kannada_text(sys.argv[1] if len(sys.argv) > 1 else "recording.wav"))
@@ -0,0 +1,137 @@
+"""
+Speech recognizer backends for Kannada ASR.
+
+Every backend takes an in-memory AudioBuffer (see utils/audio.py) and
+returns the recognised Kannada text, or None when nothing could be
+recognised. Pick one with the ASR_BACKEND environment variable:
+
+    ASR_BACKEND=google    Google Web Speech API (default, needs network)
+    ASR_BACKEND=whisper   local openai-whisper model on CPU
+
+The selected recognizer is created once per process and reused, so a
+local model is loaded a single time per worker and stays resident.
+"""
+
+import os
+import threading
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+ASR_BACKEND = os.environ.get("ASR_BACKEND", "google").lower()
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "small")
+WHISPER_MODEL_DIR = os.environ.get("WHISPER_MODEL_DIR") or None
+
+
+class Recognizer(ABC):
+    """Interface every ASR backend implements."""
+
+    name = ""
+
+    def load(self):
+        """Load models / clients up front. Default: nothing to load."""
+
+    @abstractmethod
+    def transcribe(self, audio):
+        """Return the Kannada text spoken in `audio`, or None."""
+
+
+class GoogleRecognizer(Recognizer):
+    """Google Web Speech API through speech_recognition (network call)."""
+
+    name = "google"
+
+    def __init__(self, language="kn-IN"):
+        self.language = language
+
+    def transcribe(self, audio):
+        import speech_recognition as sr
+
+        recognizer = sr.Recognizer()
+        try:
+            audio_data = sr.AudioData(audio.to_pcm16(), audio.sample_rate, 2)
+
+            print("🔍 Analysing...")
+            text = recognizer.recognize_google(audio_data, language=self.language)
+            print("✅ Did you say:", text)
+            return text
+
+        except sr.UnknownValueError:
+            print("⚠️ Could not understand audio. Please try again.")
+        except sr.RequestError as e:
+            print(f"⚠️ Google API error: {e}")
+
+
+class WhisperRecognizer(Recognizer):
+    """
+    Local openai-whisper model, CPU only, loaded once and kept resident.
+
+    The one model is shared by every thread of the process, and whisper's
+    decoder installs KV-cache hooks on the model's modules for the length
+    of a decode, so transcribe() calls are serialised by a lock. Extra
+    request threads or batch items therefore queue for the model rather
+    than decode in parallel; scale Whisper with more worker processes.
+    """
+
+    name = "whisper"
+    sample_rate = 16000  # whisper.audio.SAMPLE_RATE
+
+    def __init__(self, model_name=WHISPER_MODEL, download_root=WHISPER_MODEL_DIR, language="kn"):
+        self.model_name = model_name
+        self.download_root = download_root
+        self.language = language
+        self._model = None
+        self._lock = threading.Lock()          # guards load()
+        self._decode_lock = threading.Lock()   # one decode at a time on the shared model
+
+    def load(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import whisper
+
+                    print(f"📦 Loading Whisper model '{self.model_name}'...")
+                    self._model = whisper.load_model(
+                        self.model_name, device="cpu", download_root=self.download_root
+                    )
+        return self._model
+
+    def _to_whisper_input(self, audio):
+        # Whisper expects mono float32 at 16 kHz, the default analysis format
+        return audio.to_analysis_format(self.sample_rate).samples[0].astype(np.float32)
+
+    def transcribe(self, audio):
+        model = self.load()
+        samples = self._to_whisper_input(audio)
+        print("🔍 Analysing...")
+        with self._decode_lock:
+            result = model.transcribe(samples, language=self.language, task="transcribe", fp16=False)
+        text = result.get("text", "").strip()
+        if not text:
+            print("⚠️ Could not understand audio. Please try again.")
+            return None
+        print("✅ Did you say:", text)
+        return text
+
+
+RECOGNIZERS = {
+    GoogleRecognizer.name: GoogleRecognizer,
+    WhisperRecognizer.name: WhisperRecognizer,
+}
+
+_recognizer = None
+_recognizer_lock = threading.Lock()
+
+
+def get_recognizer():
+    """Process-wide recognizer selected by ASR_BACKEND (created once)."""
+    global _recognizer
+    if _recognizer is None:
+        with _recognizer_lock:
+            if _recognizer is None:
+                if ASR_BACKEND not in RECOGNIZERS:
+                    raise ValueError(
+                        f"Unknown ASR_BACKEND '{ASR_BACKEND}', expected one of {sorted(RECOGNIZERS)}"
+                    )
+                _recognizer = RECOGNIZERS[ASR_BACKEND]()
+    return _recognizer
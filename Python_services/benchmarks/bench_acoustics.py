@@ -0,0 +1,101 @@
+"""
+Benchmark the numpy acoustics backend against Praat, with a numerical
+agreement report on a synthetic corpus.
+
+Clips are 16 kHz harmonic "vowels" (90-400 Hz, with and without vibrato)
+at several noise levels, some with silence around them, the shapes the
+screening pipeline sees after ingest. For each clip both backends run on
+a fresh AudioBuffer (so Praat pays for its Sound object every time, as a
+request does) and the numbers the pipeline reads are compared: mean
+pitch, mean / sd intensity, voicing per frame, the speech gate and the
+distortion flag. Run from Python_services/:
+    python benchmarks/bench_acoustics.py [runs]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from soda_analysis import has_clear_speech
+from utils.acoustics import extract_features
+from utils.audio import AudioBuffer
+from utils.distortion import detect_distortion
+
+RATE = 16000
+
+
+def make_clip(rng, f0, vibrato, noise, pad, seconds=1.0):
+    t = np.arange(int(seconds * RATE)) / RATE
+    f = f0 * (1 + vibrato * np.sin(2 * np.pi * 4 * t))
+    phase = 2 * np.pi * np.cumsum(f) / RATE
+    x = sum(0.3 / k * np.sin(k * phase) for k in range(1, 6)) * np.hanning(t.size) ** 0.3
+    silence = np.zeros(int(pad * RATE))
+    x = np.concatenate([silence, x, silence])
+    return x + noise * rng.standard_normal(x.size)
+
+
+def corpus():
+    rng = np.random.default_rng(0)
+    clips = []
+    for f0 in (90, 150, 250, 400):
+        for vibrato in (0.0, 0.08):
+            for noise in (0.0, 0.01, 0.05, 0.15):
+                for pad in (0.0, 0.5):
+                    clips.append(((f0, vibrato, noise, pad), make_clip(rng, f0, vibrato, noise, pad)))
+    return clips
+
+
+def timed(samples, backend, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        features = extract_features(AudioBuffer(samples, RATE), backend)
+    return (time.perf_counter() - start) / runs, features
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    clips = corpus()
+    for backend in ("praat", "numpy"):
+        extract_features(AudioBuffer(clips[0][1], RATE), backend)   # warm up imports
+
+    totals = {"praat": 0.0, "numpy": 0.0}
+    pitch_err, int_err, sd_err, voicing_err = [], [], [], []
+    gate_agree = distortion_agree = 0
+    worst = None
+    for params, samples in clips:
+        t_praat, praat = timed(samples, "praat", runs)
+        t_numpy, ours = timed(samples, "numpy", runs)
+        totals["praat"] += t_praat
+        totals["numpy"] += t_numpy
+
+        pitch_err.append(abs(praat.mean_pitch - ours.mean_pitch))
+        int_err.append(abs(praat.mean_intensity - ours.mean_intensity))
+        sd_err.append(abs(praat.sd_intensity - ours.sd_intensity))
+        voicing_err.append(np.mean((praat.pitch > 0) != (ours.pitch > 0)))
+        gate_agree += has_clear_speech(praat) == has_clear_speech(ours)
+        distortion_agree += detect_distortion(praat)[0] == detect_distortion(ours)[0]
+        if worst is None or pitch_err[-1] > worst[0]:
+            worst = (pitch_err[-1], params, praat.mean_pitch, ours.mean_pitch)
+
+    n = len(clips)
+    print(f"{n} clips, {runs} runs each")
+    print(f"time per clip: praat {totals['praat'] / n * 1000:.2f} ms, "
+          f"numpy {totals['numpy'] / n * 1000:.2f} ms ({totals['praat'] / totals['numpy']:.1f}x)")
+    for name, errors, unit in (("mean pitch", pitch_err, "Hz"), ("mean intensity", int_err, "dB"),
+                               ("sd intensity", sd_err, "dB")):
+        print(f"|Δ {name}|: median {np.median(errors):.4f} {unit}, max {np.max(errors):.4f} {unit}")
+    print(f"voicing disagreement: mean {np.mean(voicing_err) * 100:.2f}% of frames, "
+          f"max {np.max(voicing_err) * 100:.2f}%")
+    print(f"speech gate agrees on {gate_agree}/{n}, distortion flag on {distortion_agree}/{n}")
+    print("largest pitch difference: {:.3f} Hz for (f0, vibrato, noise, pad)={} "
+          "(praat {:.2f}, numpy {:.2f})".format(*worst))
+    return 0 if gate_agree == n and distortion_agree == n else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Benchmark align_batch against looping over align_phonemes_list, and check
+both give the same alignments.
+
+Pairs are words.json targets against mutated copies (a syllable dropped,
+added, replaced or swapped), the shape of batch screening and offline
+re-scoring. Also times the full, banded and hirschberg edit_ops modes on
+long utterance-sized sequences. Run from Python_services/:
+    python benchmarks/bench_alignment.py [pairs]
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from utils.alignment import OP_NAMES, align_batch, align_phonemes_list, choose_mode, edit_ops
+from utils.syllable_vocab import SyllableVocab
+from utils.target_cache import analyze_target, find_words_json
+
+
+def load_syllables():
+    with open(find_words_json(), encoding="utf-8") as f:
+        bands = json.load(f)
+    words = sorted({item["word"] for band in bands.values() for item in band})
+    return [list(analyze_target(word).syllables) for word in words]
+
+
+def mutate(rng, syllables, pool):
+    spoken = list(syllables)
+    op = rng.randrange(5)
+    i = rng.randrange(len(spoken))
+    if op == 1 and len(spoken) > 1:
+        del spoken[i]
+    elif op == 2:
+        spoken.insert(i, rng.choice(pool))
+    elif op == 3:
+        spoken[i] = rng.choice(pool)
+    elif op == 4:
+        spoken[i], spoken[-1] = spoken[-1], spoken[i]
+    return spoken
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rng = random.Random(0)
+    words = load_syllables()
+    pool = [syl for word in words for syl in word]
+    pairs = []
+    for _ in range(count):
+        target = rng.choice(words)
+        pairs.append((target, mutate(rng, target, pool)))
+    encode = SyllableVocab().encode
+    id_pairs = [(encode(t), encode(s)) for t, s in pairs]
+
+    start = time.perf_counter()
+    looped = [align_phonemes_list(t, s) for t, s in pairs]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    alignments, summaries = align_batch(id_pairs)
+    batch_time = time.perf_counter() - start
+
+    bad = 0
+    for result, alignment, summary in zip(looped, alignments, summaries):
+        types = [row["type"] for row in result["alignment"]]
+        if types != [OP_NAMES[op] for op in alignment.ops] or summary != result["summary"]:
+            bad += 1
+    print(f"parity: {count - bad}/{count} pairs identical")
+    print(f"{count} pairs: align_phonemes_list loop {loop_time * 1000:.0f} ms, "
+          f"align_batch {batch_time * 1000:.0f} ms ({loop_time / batch_time:.1f}x)")
+
+    # long utterances: concatenated targets with ~10% of syllables changed
+    for size in (200, 1000, 3000):
+        target = []
+        while len(target) < size:
+            target.extend(rng.choice(words))
+        spoken = list(target)
+        for _ in range(size // 10):
+            spoken = mutate(rng, spoken, pool)
+        t, s = np.frombuffer(encode(target), dtype=np.uint16), np.frombuffer(encode(spoken), dtype=np.uint16)
+        timings = []
+        distances = set()
+        for mode in ("full", "banded", "hirschberg"):
+            start = time.perf_counter()
+            distances.add(edit_ops(t, s, mode=mode).distance)
+            timings.append(f"{mode} {(time.perf_counter() - start) * 1000:.0f} ms")
+        if len(distances) != 1:
+            bad += 1
+        print(f"{len(t)} x {len(s)} syllables (auto: {choose_mode(len(t), len(s))}): " + ", ".join(timings))
+
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Import-time regression check for worker cold start.
+
+Runs `python -X importtime` on a module (default: app) in a fresh
+interpreter, prints the slowest imports, and fails if any of the heavy
+speech dependencies were imported eagerly or if the total is over budget.
+Those dependencies must load on first use, not when a worker boots.
+
+Run from Python_services/:
+    python benchmarks/bench_import.py [--module app] [--budget-ms 1500]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported just by importing the service modules
+LAZY_MODULES = ("parselmouth", "speech_recognition", "whisper", "torch", "scipy", "pydub")
+
+
+def import_times(module):
+    """Return {module name: (self_us, cumulative_us)} from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONWARNINGS="ignore"),
+    )
+    if proc.returncode != 0:
+        sys.exit(f"import {module} failed:\n{proc.stderr}")
+
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fail if the cumulative import time is above this")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    times = import_times(args.module)
+    total_ms = times[args.module][1] / 1000
+
+    print(f"import {args.module}: {total_ms:.1f} ms cumulative, {len(times)} modules")
+    print(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    for name, (self_us, cum_us) in sorted(times.items(), key=lambda kv: -kv[1][1])[:args.top]:
+        print(f"{cum_us / 1000:>14.1f}  {self_us / 1000:>8.1f}  {name}")
+
+    failures = []
+    eager = sorted({name.split(".")[0] for name in times} & set(LAZY_MODULES))
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(eager)}")
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        failures.append(f"{total_ms:.1f} ms is over the {args.budget_ms:.1f} ms budget")
+
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
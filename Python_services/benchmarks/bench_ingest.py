@@ -0,0 +1,88 @@
+"""
+Per-request CPU of the audio side of SODA analysis with and without the
+canonical ingest stage (mono, polyphase resample to ANALYSIS_SAMPLE_RATE).
+
+Uploads are synthetic WAVs in the formats browsers send (44.1 / 48 kHz,
+mono and stereo): a 0.7 s voiced "word" inside 3 s of room noise. Each
+request decodes the bytes, optionally canonicalises, trims with the VAD,
+runs the Praat feature pass and builds the PCM sent to the recognizer.
+Mean pitch / intensity are printed for both paths so the resampling can
+be checked not to move the features. Run from Python_services/:
+    python benchmarks/bench_ingest.py [requests]
+"""
+
+import io
+import os
+import sys
+import time
+import wave
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from scipy.signal import butter, lfilter
+
+from utils.acoustics import extract_features
+from utils.audio import ANALYSIS_SAMPLE_RATE, AudioBuffer
+from utils.vad import trim_to_speech
+
+FORMATS = [(48000, 2), (44100, 2), (48000, 1), (16000, 1)]
+
+
+def make_upload(rate, channels, seconds=3.0, seed=0):
+    rng = np.random.default_rng(seed)
+    # room noise sits well below 8 kHz; white noise up to 24 kHz would
+    # make the comparison mostly about what the resampler filters out
+    x = lfilter(*butter(4, 4000, fs=rate), 0.005 * rng.standard_normal(int(rate * seconds)))
+    t = np.arange(int(0.7 * rate)) / rate
+    f0 = 220 + 40 * np.sin(2 * np.pi * 2 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / rate
+    word = sum(0.3 / k * np.sin(k * phase) for k in range(1, 6)) * np.hanning(len(t))
+    start = int(1.2 * rate)
+    x[start:start + len(word)] += word
+    pcm = np.clip(x * 32767, -32768, 32767).astype("<i2")
+    pcm = np.repeat(pcm[:, None], channels, axis=1)
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm.tobytes())
+    return out.getvalue()
+
+
+def request(data, sample_rate):
+    audio = AudioBuffer.from_bytes(data)
+    if sample_rate is not False:
+        audio = audio.to_analysis_format(sample_rate)
+    audio, _ = trim_to_speech(audio)
+    features = extract_features(audio)
+    payload = audio.to_pcm16()
+    return features, len(payload)
+
+
+def cpu_ms(data, sample_rate, runs):
+    request(data, sample_rate)   # warm up imports / caches
+    start = time.process_time()
+    for _ in range(runs):
+        features, payload = request(data, sample_rate)
+    return (time.process_time() - start) * 1000 / runs, features, payload
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rate = ANALYSIS_SAMPLE_RATE or 16000
+    print(f"{runs} requests per format, analysis rate {rate} Hz")
+    for fmt in FORMATS:
+        data = make_upload(*fmt)
+        before, f0, p0 = cpu_ms(data, False, runs)
+        after, f1, p1 = cpu_ms(data, rate, runs)
+        print(f"{fmt[0]} Hz x{fmt[1]}: {before:6.1f} -> {after:6.1f} ms CPU ({before / after:.1f}x), "
+              f"ASR payload {p0 // 1024} -> {p1 // 1024} KiB, "
+              f"pitch {f0.mean_pitch:.1f} / {f1.mean_pitch:.1f} Hz, "
+              f"intensity {f0.mean_intensity:.2f} / {f1.mean_intensity:.2f} dB")
+
+
+if __name__ == "__main__":
+    main()
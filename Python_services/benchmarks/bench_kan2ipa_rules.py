@@ -0,0 +1,130 @@
+"""
+Check the rule-based kan2ipa engine (txt2ipa/kannada2ipa/rules.py) against
+kannada2ipaMap.py, and compare its memory and import cost with the table
+engine.
+
+Parity covers the generated map (keys, values and order), the
+(rank, ipa) lookup of every key, kannada2ipa over every key, the
+words.json words and random joins, and the ipa -> Kannada reverse lookup
+of every map value. Exits non-zero on any mismatch. Run from
+Python_services/:
+    python benchmarks/bench_kan2ipa_rules.py [runs]
+"""
+
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from txt2ipa.kannada2ipa import maptable, rules
+from txt2ipa.kannada2ipa.ipaconvert import CharmapMatcher, RuleMatcher, reverse_charmap
+from txt2ipa.kannada2ipa.kannada2ipaMap import kan2ipa
+
+WORDS_JSON = os.path.join(os.path.dirname(ROOT), "Frontend_main", "assets", "data", "words.json")
+
+# Import ipaconvert in a fresh interpreter, convert one word, and report
+# import time, Python heap retained by the import and process RSS.
+SNIPPET = """
+import sys, time, tracemalloc
+trace = sys.argv[1] == 'trace'
+if trace:
+    tracemalloc.start()
+t = time.perf_counter()
+import txt2ipa.kannada2ipa.ipaconvert as m
+m.kannada2ipa('ಅಮ್ಮ')
+ms = (time.perf_counter() - t) * 1000
+heap = tracemalloc.get_traced_memory()[0] if trace else 0
+rss = 0
+try:
+    with open('/proc/self/statm') as f:
+        import os
+        rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+except OSError:
+    pass
+print(ms, heap, rss)
+"""
+
+
+def load_words():
+    with open(WORDS_JSON, encoding="utf-8") as f:
+        data = json.load(f)
+    return [item["word"] for band in data.values() for item in band]
+
+
+def check_parity():
+    failures = 0
+
+    generated = rules.build_kan2ipa()
+    if list(generated.items()) != list(kan2ipa.items()):
+        print("MISMATCH: generated map differs from kannada2ipaMap.py")
+        failures += 1
+    print(f"generated map: {len(generated)} entries, kannada2ipaMap.py: {len(kan2ipa)}")
+
+    table = CharmapMatcher(kan2ipa)
+    bad = [k for k in kan2ipa if rules.rule_lookup(k) != table.table[k]]
+    failures += len(bad)
+    print(f"rule_lookup: {len(kan2ipa) - len(bad)}/{len(kan2ipa)} keys identical")
+
+    rng = random.Random(0)
+    keys = list(kan2ipa)
+    words = load_words()
+    joined = ["".join(rng.choice(keys) for _ in range(rng.randint(2, 6))) for _ in range(2000)]
+    samples = keys + words + joined
+    matcher = RuleMatcher()
+    bad = [s for s in samples if matcher.convert(s) != table.convert(s)]
+    for s in bad[:10]:
+        print("MISMATCH:", s, matcher.convert(s), table.convert(s))
+    failures += len(bad)
+    print(f"conversion: {len(samples) - len(bad)}/{len(samples)} identical "
+          f"({len(keys)} map keys, {len(words)} words, {len(joined)} random joins)")
+
+    reverse = reverse_charmap(kan2ipa)
+    bad = [v for v in reverse if rules.rule_reverse(v) != reverse[v]]
+    for v in bad[:10]:
+        print("MISMATCH:", v, rules.rule_reverse(v), reverse[v])
+    failures += len(bad)
+    print(f"reverse: {len(reverse) - len(bad)}/{len(reverse)} ipa values identical")
+    return failures
+
+
+def sample(env, runs, mode):
+    rows = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", SNIPPET, mode], cwd=ROOT, env=env,
+                             check=True, capture_output=True, text=True).stdout
+        ms, heap, rss = out.split()
+        rows.append((float(ms), int(heap), int(rss)))
+    return rows
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failures = check_parity()
+
+    maptable.build_artifact()
+    engines = (
+        ("table (.py)", dict(os.environ, KAN2IPA_ENGINE="table",
+                             KAN2IPA_ARTIFACT=os.devnull + ".missing")),
+        ("table (.bin)", dict(os.environ, KAN2IPA_ENGINE="table",
+                              KAN2IPA_ARTIFACT=maptable.ARTIFACT_PATH)),
+        ("rules", dict(os.environ, KAN2IPA_ENGINE="rules")),
+    )
+    print()
+    for label, env in engines:
+        sample(env, 1, "time")  # warm the .pyc cache
+        times = [r[0] for r in sample(env, runs, "time")]
+        heap = sample(env, 1, "trace")[0][1]
+        rss = sample(env, 1, "time")[0][2]
+        print(f"{label:>13}: import median {statistics.median(times):6.1f} ms  "
+              f"heap retained {heap / 2**20:6.2f} MiB  RSS {rss / 2**20:6.1f} MiB")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Benchmark the compiled kannada2ipa matcher against the original
+ordered str.replace loop, and check both give identical output.
+
+Run from Python_services/:
+    python benchmarks/bench_kannada2ipa.py
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from txt2ipa.kannada2ipa.ipaconvert import kan2ipa, kannada2ipa
+
+WORDS_JSON = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "Frontend_main", "assets", "data", "words.json",
+)
+
+
+def ordered_replace(text):
+    """The original unicode2ipa loop, kept here as the reference."""
+    for key, val in kan2ipa.items():
+        if key in text:
+            text = text.replace(key, val)
+    return text
+
+
+def load_words():
+    with open(WORDS_JSON, encoding="utf-8") as f:
+        data = json.load(f)
+    return [item["word"] for band in data.values() for item in band]
+
+
+def check_parity(samples):
+    mismatches = [s for s in samples if kannada2ipa(s) != ordered_replace(s)]
+    for s in mismatches[:10]:
+        print("MISMATCH:", s, kannada2ipa(s), ordered_replace(s))
+    return len(mismatches)
+
+
+def timeit(fn, samples, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for s in samples:
+            fn(s)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    rng = random.Random(0)
+    keys = list(kan2ipa)
+    words = load_words()
+    joined = ["".join(rng.choice(keys) for _ in range(rng.randint(2, 6)))
+              for _ in range(2000)]
+
+    samples = keys + words + joined
+    bad = check_parity(samples)
+    print(f"parity: {len(samples) - bad}/{len(samples)} identical "
+          f"({len(keys)} map keys, {len(words)} words, {len(joined)} random joins)")
+
+    old = timeit(ordered_replace, words, repeat=1)
+    new = timeit(kannada2ipa, words)
+    print(f"words.json ({len(words)} words): ordered replace {old * 1000:.1f} ms, "
+          f"compiled {new * 1000:.2f} ms ({old / new:.0f}x)")
+
+    for size in (100, 1000, 10000):
+        text = "".join(rng.choice(words) for _ in range(size // 4))
+        print(f"{len(text):>6} chars: compiled {timeit(kannada2ipa, [text]) * 1000:.2f} ms")
+
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Request latency of perform_soda_analysis with the Praat pass overlapped
+with the ASR call (ASR_OVERLAP) versus run one after the other, a check
+that both give the same result, and a check that silent and unvoiced
+clips never reach the recognizer.
+
+The recognizer is simulated: it sleeps for a network-like delay and
+returns a fixed transcript, so only the scheduling is measured. The
+acoustic side is real (ingest, VAD, feature pass) on a synthetic 48 kHz
+stereo recording of continuous voicing, so the VAD keeps all of it. Run
+from Python_services/:
+    python benchmarks/bench_overlap.py [asr_ms] [seconds] [requests]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+import soda_analysis
+from bench_acoustics import make_clip
+from utils.audio import AudioBuffer
+
+TARGET = "ಮನೆ"
+SPOKEN = "ಮನ"
+
+
+def make_recording(seconds, rate=48000):
+    samples = make_clip(np.random.default_rng(0), 180, 0.08, 0.01, 0.0, seconds)
+    stereo = np.repeat(samples[np.newaxis, :], 2, axis=0)
+    # make_clip works at 16 kHz; stretch the index to fake a 48 kHz upload
+    index = np.linspace(0, samples.size - 1, int(seconds * rate))
+    return np.array([np.interp(index, np.arange(samples.size), ch) for ch in stereo]), rate
+
+
+def run(recording, overlap, requests):
+    soda_analysis.ASR_OVERLAP = overlap
+    latencies, results = [], []
+    for _ in range(requests):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = soda_analysis.perform_soda_analysis(TARGET, AudioBuffer(*recording))
+        latencies.append(time.perf_counter() - start)
+        results.append(result)
+    return sorted(latencies)[len(latencies) // 2] * 1000, results
+
+
+def main():
+    asr_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 300
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 6
+    requests = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    calls = []
+
+    def recognizer(audio):
+        calls.append(audio.duration)
+        time.sleep(asr_ms / 1000)
+        return SPOKEN
+
+    soda_analysis.convert_audio_to_kannada_text = recognizer
+    recording = make_recording(seconds)
+    run(recording, True, 1)   # warm up caches and the features pool
+
+    serial, serial_results = run(recording, False, requests)
+    overlapped, overlap_results = run(recording, True, requests)
+
+    stages = {s["stage"]: s["ms"] for s in overlap_results[-1]["stages"]}
+    print(f"{seconds:.0f} s recording: simulated ASR {asr_ms:.0f} ms, "
+          f"features {stages['features']:.1f} ms (the part that overlaps)")
+    print(f"median latency: serial {serial:.1f} ms, overlapped {overlapped:.1f} ms "
+          f"(saved {serial - overlapped:.1f} ms)")
+
+    strip = lambda r: {k: v for k, v in r.items() if k != "stages"}
+    same = all(strip(a) == strip(b) for a, b in zip(serial_results, overlap_results))
+    print("results identical:", same)
+
+    del calls[:]
+    silent = np.zeros((1, int(seconds * 16000)))
+    unvoiced = np.random.default_rng(1).normal(0, 0.1, silent.shape)
+    for name, samples in (("silent", silent), ("unvoiced", unvoiced)):
+        for overlap in (False, True):
+            soda_analysis.ASR_OVERLAP = overlap
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = soda_analysis.perform_soda_analysis(TARGET, AudioBuffer(samples, 16000))
+            same = same and result["early_exit"] == "no_speech"
+        print(f"{name} clip: early_exit={result['early_exit']}, recognizer calls {len(calls)}")
+    return 0 if same and not calls else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Compare cold-start import time of txt2ipa.kannada2ipa with and without
+the prebuilt kannada2ipaMap.bin artifact.
+
+Each sample is a fresh interpreter importing ipaconvert with
+KAN2IPA_ENGINE=table (the rules engine loads neither file), so the
+numbers include everything a Flask worker on the table engine pays
+before it can serve. The artifact is built in a temporary directory, the
+package's own kannada2ipaMap.bin is left alone. Run from
+Python_services/:
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from txt2ipa.kannada2ipa import maptable
+
+SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "import txt2ipa.kannada2ipa.ipaconvert as m; "
+    "print((time.perf_counter() - t) * 1000, m.kannada2ipa('ಅಮ್ಮ'))"
+)
+
+
+def sample(env, runs):
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", SNIPPET], cwd=ROOT, env=env,
+                             check=True, capture_output=True, text=True).stdout
+        times.append(float(out.split()[0]))
+    return times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = os.path.join(tmp, "kannada2ipaMap.bin")
+        size = maptable.build_artifact(artifact)
+        print(f"artifact: {artifact} ({size / 1024:.0f} KiB)")
+
+        source_env = dict(os.environ, KAN2IPA_ENGINE="table",
+                          KAN2IPA_ARTIFACT=os.path.join(tmp, "missing.bin"))
+        binary_env = dict(os.environ, KAN2IPA_ENGINE="table", KAN2IPA_ARTIFACT=artifact)
+
+        # one throwaway run each so the .pyc cache is warm for the source path
+        sample(source_env, 1)
+        sample(binary_env, 1)
+
+        for label, env in (("kannada2ipaMap.py", source_env),
+                           ("kannada2ipaMap.bin", binary_env)):
+            times = sample(env, runs)
+            print(f"{label:>20}: median {statistics.median(times):7.1f} ms  "
+                  f"min {min(times):7.1f} ms  ({runs} runs)")
+
+
+if __name__ == "__main__":
+    main()
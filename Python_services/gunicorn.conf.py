@@ -0,0 +1,35 @@
+# Gunicorn settings for the production Flask service.
+#
+#   gunicorn -c gunicorn.conf.py "app:create_app()"
+#
+# The app is preloaded in the master, which runs warm_up() (kannada2ipa
+# tables, Praat, ASR model) once before forking, so every worker starts
+# warm and shares that memory copy-on-write. Everything below can be
+# tuned through environment variables.
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PYTHON_PORT', '5000')}"
+
+# Analysis is CPU bound (Praat, local ASR), so default to one process per
+# core; extra threads let a worker overlap network ASR calls and uploads.
+workers = int(os.environ.get("GUNICORN_WORKERS", os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count())))
+threads = int(os.environ.get("GUNICORN_THREADS", "2"))
+worker_class = "gthread" if threads > 1 else "sync"
+
+# ASR on a long clip can take a while, and a whole /analyze_soda/batch
+# session (up to BATCH_MAX_ITEMS recordings) runs in one request; keep this
+# above the Node proxy's timeouts (60 s single, 300 s batch)
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "330"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers now and then to bound memory growth (0 disables)
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
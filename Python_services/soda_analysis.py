@@ -1,14 +1,15 @@
 import json
 import os
-import parselmouth
-from utils.alignment import align_phonemes_string, align_phonemes_list
+import time
+from contextlib import contextmanager
 from utils.distortion import detect_distortion
-from utils.letter_identification import (
-    identify_omission,
-    identify_addition,
-    identify_substitution,
-    identify_distortion,
-)
+from utils.audio import AudioBuffer
+from utils.acoustics import extract_features
+from utils.vad import level_db, rough_mean_pitch, trim_to_speech
+from utils.target_cache import analyze_target
+from utils.syllable_vocab import GAP, SyllableVocab
+from utils.letter_identification import classify_errors, mark_near_misses
+from utils.pools import LazyPool
 import numpy as np
 
 
@@ -16,42 +17,203 @@ import numpy as np
 
 
 from audio2text.a2t import convert_audio_to_kannada_text
-from syllable_Comparision.syllabify_main import syllabify
+from syllable_Comparision.syllabify_main import syllabify_ids
 
 
 from txt2ipa.kannada2ipa.ipaconvert import kannada2ipa, ipa2kannada_value
 
 
 
-def transcribe_audio_to_text(audio_path):
+# Speech gate thresholds: below either, the clip is treated as silent
+MIN_SPEECH_INTENSITY = float(os.environ.get("MIN_SPEECH_INTENSITY", 20))   # dB
+MIN_SPEECH_PITCH = float(os.environ.get("MIN_SPEECH_PITCH", 60))           # Hz, unvoiced frames count as 0
+NO_SPEECH_REMARK = "No clear speech detected — please try again."
+
+# Once a clip passes the speech pre-check, ASR overlaps the Praat pass:
+# Praat runs on a per-process thread pool while the request thread waits
+# on the recognizer. Praat holds the GIL for its whole pass, so it goes on
+# the pool; the recognizer releases the GIL while it waits on the network
+# / its model. ASR_OVERLAP=false runs them one after the other instead.
+ASR_OVERLAP = os.environ.get("ASR_OVERLAP", "true").lower() == "true"
+FEATURES_WORKERS = int(os.environ.get("FEATURES_WORKERS", 4))
+_features_pool = LazyPool(FEATURES_WORKERS, "soda-features")
+
+
+def transcribe_audio_to_text(audio):
     # audio_path = os.path.join(parent_dir,"backend", "uploads", "recording.wav")
-    kannada_text = convert_audio_to_kannada_text(audio_path)
+    kannada_text = convert_audio_to_kannada_text(audio)
     return kannada_text.strip()
 
 
-def perform_soda_analysis(target_word: str, audio_path: str):
+def get_features_pool():
+    return _features_pool.get()
+
+
+def _extract_features_timed(audio):
+    start = time.perf_counter()
+    features = extract_features(audio)
+    return features, round((time.perf_counter() - start) * 1000, 2)
+
+
+class StageTimer:
+    """Records which pipeline stages ran and how long each took."""
+
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, round((time.perf_counter() - start) * 1000, 2))
+
+    def record(self, name, ms, **extra):
+        """Add a stage timed elsewhere (e.g. on another thread)."""
+        self.stages.append({"stage": name, "ms": ms, **extra})
+
+
+def has_speech_energy(audio):
+    """
+    Cheap gate before ASR and Praat: the clip's overall level. Praat's mean
+    intensity is never much above it, so a clip this gate rejects would
+    fail has_clear_speech too.
+    """
+    return level_db(audio) >= MIN_SPEECH_INTENSITY
+
+
+def has_rough_voicing(audio):
+    """
+    Cheap gate before ASR: has_clear_speech's pitch test on a rough,
+    lenient pitch estimate, so loud but unvoiced clips (noise, clicks)
+    never reach the recognizer.
+    """
+    return rough_mean_pitch(audio) >= MIN_SPEECH_PITCH
+
+
+def has_clear_speech(features):
+    """Speech gate: enough loudness and voicing to be worth transcribing."""
+    return features.mean_intensity >= MIN_SPEECH_INTENSITY and features.mean_pitch >= MIN_SPEECH_PITCH
+
+
+def perform_soda_analysis(target_word: str, audio):
     """
     Perform SODA analysis for a given target word and child's audio.
     Uses pitch energy and distortion to approximate correctness.
+
+    `audio` is an AudioBuffer decoded once by the caller (a file path is
+    still accepted and decoded here). Every stage below reads from it.
+
+    Stages, each gated by the one before:
+        ingest     mono at ANALYSIS_SAMPLE_RATE (already so if ffmpeg decoded it)
+        vad        trim silence / room noise around the utterance
+          gate     overall level too low → stop, no Praat, no ASR
+        voicing    rough autocorrelation pitch of the trimmed clip
+          gate     unvoiced → stop, no Praat, no ASR
+        features   one Praat pass (pitch / intensity); with ASR_OVERLAP
+                   it runs on the features pool while asr runs here,
+                   and features_wait joins it
+          gate     no clear speech → stop, any ASR result is dropped
+        target     words.json cache lookup
+        asr        speech recognition
+        syllabify  spoken text → IPA syllable IDs
+          gate     spoken phonemes == target phonemes → correct, stop
+        classify   alignment + error classification, with the
+                   intensity-based distortion score computed only for
+                   same-length mismatches
+
+    The response lists the stages that ran with their time in ms under
+    "stages" (an overlapped Praat pass is marked "overlapped"), which gate
+    ended the run early under "early_exit", and the part of the clip that
+    was analysed under "speech_span" (seconds). The upload's own rate /
+    channels / duration are under "source_format".
+
+    After the voicing gate, latency is roughly max(asr, features) rather
+    than their sum; the result is the same as running them one after
+    another.
     """
 
+    timer = StageTimer()
     try:
-        sound = parselmouth.Sound(audio_path)
-        pitch = sound.to_pitch()
-        intensity = sound.to_intensity()
-
-        mean_pitch = float(pitch.selected_array['frequency'].mean())
-        mean_intensity = float(intensity.values.mean())
-        duration = float(sound.get_total_duration())
-
-        
-        target_phonemes = kannada2ipa(target_word)
-        spoken_text = transcribe_audio_to_text(audio_path)
-        spoken_phonemes = kannada2ipa(spoken_text)
+        if isinstance(audio, str):
+            with timer.stage("decode"):
+                audio = AudioBuffer.from_file(audio)
+        # One canonical format for every stage, whatever the browser sent
+        with timer.stage("ingest"):
+            audio = audio.to_analysis_format()
+        source_format = audio.source_format._asdict()
+        # Everything downstream (Praat, ASR upload) only sees the speech
+        with timer.stage("vad"):
+            original_duration = audio.duration
+            audio, span = trim_to_speech(audio)
+            loud_enough = has_speech_energy(audio)
+        speech_span = {
+            "start": round(span.start / audio.sample_rate, 3),
+            "end": round(span.end / audio.sample_rate, 3),
+            "original_duration": round(original_duration, 3),
+            "trimmed": span.trimmed,
+        }
+        no_speech = {
+            "error": NO_SPEECH_REMARK,
+            "remark": NO_SPEECH_REMARK,
+            "early_exit": "no_speech",
+            "speech_span": speech_span,
+            "source_format": source_format,
+            "stages": timer.stages,
+        }
 
-        # Syllabify into IPA syllable lists
-        target_syllable = syllabify(target_word)
-        spoken_syllable = syllabify(spoken_text)
+        # Gate 1a: silent recording, don't spend Praat or ASR on it
+        if not loud_enough:
+            print("🔇 No clear speech, skipping ASR")
+            return no_speech
+
+        # Gate 1b: loud but unvoiced (noise, clicks), not worth Praat or ASR
+        with timer.stage("voicing"):
+            voiced = has_rough_voicing(audio)
+        if not voiced:
+            print("🔇 No clear speech, skipping ASR")
+            return no_speech
+
+        # One Praat pass for pitch / intensity, shared by every stage below.
+        # Overlapped, it runs on the pool while the recognizer waits here;
+        # both only read `audio`.
+        spoken_text = None
+        if ASR_OVERLAP:
+            pending = get_features_pool().submit(_extract_features_timed, audio)
+            with timer.stage("asr"):
+                spoken_text = transcribe_audio_to_text(audio)
+            with timer.stage("features_wait"):
+                features, features_ms = pending.result()
+            timer.record("features", features_ms, overlapped=True)
+        else:
+            with timer.stage("features"):
+                features = extract_features(audio)
+
+        # Gate 1c: the rough check passed but Praat finds no clear speech
+        if not has_clear_speech(features):
+            print("🔇 No clear speech, ignoring ASR")
+            return no_speech
+
+        # Target side comes from the words.json cache (computed once)
+        with timer.stage("target"):
+            target = analyze_target(target_word)
+        target_phonemes = target.ipa
+
+        if spoken_text is None:
+            with timer.stage("asr"):
+                spoken_text = transcribe_audio_to_text(audio)
+
+        # Syllabify into syllable IDs (array('H')) interned in a vocabulary
+        # local to this request. Comparisons and error identification run on
+        # the IDs; strings are decoded only for the result below.
+        with timer.stage("syllabify"):
+            spoken_phonemes = kannada2ipa(spoken_text)
+            vocab = SyllableVocab()
+            target_ids = vocab.encode(target.syllables)
+            spoken_ids = syllabify_ids(spoken_text, vocab)
+            target_syllable = list(target.syllables)
+            spoken_syllable = vocab.decode(spoken_ids)
 
         # Build Kannada word back from IPA syllables using ipa2kannada_value
         # This avoids storing raw Kannada in intermediate places while still
@@ -77,76 +239,41 @@ def perform_soda_analysis(target_word: str, audio_path: str):
             "error_type": "",
             "distortion_score": 0.0,
             "error_syllables": [],
+            "early_exit": None,
+            "speech_span": speech_span,
+            "source_format": source_format,
+            "stages": timer.stages,
         }
 
-    
-
-        # spoken_phonemes = target_phonemes.copy()
+        # Gate 2: said exactly right, nothing to align or score
+        if target_phonemes == spoken_phonemes:
+            result["early_exit"] = "exact_match"
+            return result
 
-        if mean_intensity < 20 or mean_pitch < 60:
-            accuracy = 0
-            remark = "No clear speech detected — please try again."
-        else:
-            accuracy = 85
-            remark = "Speech detected successfully."
-
-        alignment_result = align_phonemes_string(target_phonemes, spoken_phonemes)
-
-        correct_count = alignment_result["summary"].get("Correct", 0)
-        spoken_count = len(spoken_phonemes)
-        target_count = len(target_phonemes)
-        print(len(target_syllable),len(spoken_syllable))
-        # print(correct_count, target_count)
-        print(alignment_result["summary"])
-        print(target_phonemes, spoken_phonemes)
         # ----------------------------------------------------------
-        # If mismatch between counts → Regenerate phoneme strings
+        # Phonemes differ → classify from one syllable alignment
         # ----------------------------------------------------------
-        if correct_count != target_count or correct_count != spoken_count:
-            print("🔁 Re-aligning due to mismatch in phoneme count...")
-
-            print(len(target_syllable),len(spoken_syllable))
-
-            if len(target_syllable) > len(spoken_syllable):
-                # 🔴 TASK 1: OMISSION
-                result["error_type"] = "Omission"
-                # Identify specific omitted syllables/letters
-                omitted_syllables = identify_omission(target_syllable, spoken_syllable)
-                result["error_syllables"] = omitted_syllables
-               
-            elif len(target_syllable) < len(spoken_syllable):
-                # 🔴 TASK 2: ADDITION
-                result["error_type"] = "Addition"
-                # Identify specific added syllables/letters
-                added_syllables = identify_addition(target_syllable, spoken_syllable)
-                result["error_syllables"] = added_syllables
-               
-            else:
-                # ✅ SAME LENGTH → NORMAL ALIGNMENT
-                alignment_result = align_phonemes_list(
-                    target_syllable,
-                    spoken_syllable
-                )
-                
-               
-                # Distortion detection
-                distortion_detected, distortion_score = detect_distortion(audio_path)
-                
-                if distortion_score > 80 : 
-                    result["error_type"] = "Distortion"
-                    # Identify specific distorted syllables/letters
-                    distorted_syllables = identify_distortion(target_syllable, spoken_syllable)
-                    result["error_syllables"] = distorted_syllables
-                    
-                else : 
-                    result["error_type"] = "Substitution"
-                    # Identify specific substituted syllables/letters
-                    substituted_syllables = identify_substitution(target_syllable, spoken_syllable)
-                    result["error_syllables"] = substituted_syllables
-                  
-                result["distortion_score"] = distortion_score
-            
-       
+        def distortion_score():
+            # only needed for same-length mismatches
+            with timer.stage("distortion"):
+                return detect_distortion(features)[1]
+
+        with timer.stage("classify"):
+            errors = classify_errors(
+                target_ids,
+                spoken_ids,
+                distortion_score=distortion_score,
+                gap=GAP,
+            )
+
+        result["error_type"] = errors.error_type
+        if errors.error_type in ("Omission", "Addition"):
+            result["error_syllables"] = vocab.decode(errors.error_syllables)
+        else:
+            # near misses (voicing, length, place slips) vs different sounds
+            result["error_syllables"] = mark_near_misses(vocab.decode_pairs(errors.error_syllables))
+        if errors.distortion_score is not None:
+            result["distortion_score"] = errors.distortion_score
 
         # # ✅ Fixed NumPy bool type handling (np.bool8 removed)
         # if isinstance(distortion_detected, (np.bool_, bool)):
@@ -175,7 +302,7 @@ def perform_soda_analysis(target_word: str, audio_path: str):
 
     except Exception as e:
         print("💥 Error in perform_soda_analysis:", e)
-        return {"error": f"Audio processing failed: {e}"}
+        return {"error": f"Audio processing failed: {e}", "stages": timer.stages}
 
 
 
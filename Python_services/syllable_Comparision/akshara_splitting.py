@@ -1,40 +1,95 @@
+import re
+
+# Code point classes of the Kannada block used to build aksharas
+CONSONANTS = '\u0C95-\u0CB9\u0CDE'                 # ಕ to ಹ, ೞ
+INDEPENDENT_VOWELS = '\u0C85-\u0C94\u0CE0\u0CE1'  # ಅ to ಔ, ೠ ೡ
+VOWEL_SIGNS = '\u0CBE-\u0CCC\u0CD5\u0CD6\u0CE2\u0CE3'  # ಾ to ೌ + ೕ ೖ ೢ ೣ
+DIACRITICS = '\u0C81-\u0C83\u0CF3'               # candrabindu, ಂ (anusvara), ಃ (visarga)
+NUKTA = '\u0CBC'                                 # ಼
+VIRAMA = '\u0CCD'                                # ್ (halant)
+ZWNJ = '\u200C'
+ZWJ = '\u200D'
+KANNADA_BLOCK = '\u0C80-\u0CFF'
+
+# One match per akshara. Tried in order:
+#   consonant (+ nukta), then any ್ + consonant cluster (ತ್ + ತ, ಭ್ + ಯ; a
+#   ZWJ after ್ keeps the cluster, a ZWNJ ends it), then a vowel sign or a
+#   final ್, then diacritics like ಂ or ಃ
+#   independent vowel + diacritics
+#   any other Kannada code point on its own (e.g. a stray vowel sign)
+#   whitespace and joiners, which separate aksharas and are dropped
+#   a run of non-Kannada text (latin, digits, punctuation)
+AKSHARA_RE = re.compile(
+    '[{C}]{N}?(?:{V}{ZWJ}?[{C}]{N}?)*(?:[{M}]|{V}[{ZWNJ}{ZWJ}]?)?[{D}]*'
+    '|[{A}][{D}]*'
+    '|[{K}][{D}]*'
+    '|(?P<space>[\\s{ZWNJ}{ZWJ}]+)'
+    '|(?P<other>[^{K}\\s{ZWNJ}{ZWJ}]+)'.format(
+        C=CONSONANTS, N=NUKTA, V=VIRAMA, ZWJ=ZWJ, ZWNJ=ZWNJ, M=VOWEL_SIGNS,
+        D=DIACRITICS, A=INDEPENDENT_VOWELS, K=KANNADA_BLOCK,
+    )
+)
+
+# Characters read per chunk when iter_aksharas is given a file
+CHUNK_SIZE = 1 << 16
+
+
 def is_kannada_consonant(ch):
-    return '\u0C95' <= ch <= '\u0CB9'   # ಕ to ಹ
+    return '\u0C95' <= ch <= '\u0CB9' or ch == '\u0CDE'   # ಕ to ಹ, ೞ
 
 def is_kannada_vowel_sign(ch):
-    return '\u0CBE' <= ch <= '\u0CCC' or ch in ['\u0CD5', '\u0CD6']  # ಾ to ೌ + ೕ ೖ
+    return '\u0CBE' <= ch <= '\u0CCC' or ch in ['\u0CD5', '\u0CD6', '\u0CE2', '\u0CE3']  # ಾ to ೌ + ೕ ೖ ೢ ೣ
 
 def is_kannada_diacritic(ch):
-    return ch in ['\u0C82', '\u0C83']  # ಂ (anusvara), ಃ (visarga)
-
-def split_into_aksharas(word):
-    aksharas = []
-    i = 0
-
-    while i < len(word):
-        akshara = word[i]     # First letter
-        i += 1
-
-        # Handle consonant clusters: ತ್ + ತ , ಭ್ + ಯ etc.
-        while (
-            i + 1 < len(word) and
-            word[i] == '್' and
-            is_kannada_consonant(word[i + 1])
-        ):
-            akshara += word[i]      # halant
-            akshara += word[i + 1]  # next consonant
-            i += 2
-
-        # Add vowel sign (ಾ ಿ ೀ ು ೂ ೆ ೇ ೈ ೊ ೋ ೌ)
-        if i < len(word) and is_kannada_vowel_sign(word[i]):
-            akshara += word[i]
-            i += 1
-
-        # Add diacritics like ಂ or ಃ
-        while i < len(word) and is_kannada_diacritic(word[i]):
-            akshara += word[i]
-            i += 1
-
-        aksharas.append(akshara)
-
-    return aksharas
+    return ch in ['\u0C81', '\u0C82', '\u0C83', '\u0CF3']  # ಂ (anusvara), ಃ (visarga), candrabindu
+
+
+def _chunks(source):
+    # a file is read in fixed size pieces so one huge line is not loaded whole
+    if hasattr(source, 'read'):
+        return iter(lambda: source.read(CHUNK_SIZE), '')
+    return source
+
+
+def _matches(source):
+    if isinstance(source, str):
+        yield from AKSHARA_RE.finditer(source)
+        return
+
+    # A match that reaches the end of the buffer may continue in the next
+    # chunk, so it is held back and matched again with the new text.
+    pending = ''
+    for chunk in _chunks(source):
+        buffer = pending + chunk
+        last = None
+        for m in AKSHARA_RE.finditer(buffer):
+            if last is not None:
+                yield last
+            last = m
+        if last is not None and last.end() == len(buffer):
+            pending = buffer[last.start():]
+        else:
+            pending = ''
+            if last is not None:
+                yield last
+    if pending:
+        yield from AKSHARA_RE.finditer(pending)
+
+
+def iter_aksharas(source, keep_other=False):
+    """
+    Lazily yield the aksharas of `source`: a string, an iterable of string
+    chunks, or a text file object (read CHUNK_SIZE characters at a time).
+
+    Whitespace and ZWJ / ZWNJ between aksharas are dropped. Runs of
+    non-Kannada text are dropped too, unless keep_other is set, in which
+    case each run is yielded as one item.
+    """
+    for m in _matches(source):
+        kind = m.lastgroup
+        if kind is None or (kind == 'other' and keep_other):
+            yield m.group()
+
+
+def split_into_aksharas(word, keep_other=False):
+    return list(iter_aksharas(word, keep_other))
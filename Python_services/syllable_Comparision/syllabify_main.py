@@ -1,20 +1,62 @@
-from .akshara_splitting import split_into_aksharas
+from .akshara_splitting import iter_aksharas, split_into_aksharas
+from txt2ipa.kannada2ipa.ipaconvert import kannada2ipa
 
-import sys
 import os
+from functools import lru_cache
 
-# Add parent directory (IPA folder) to Python path
-parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(parent_dir)
-from audio2text.a2t import convert_audio_to_kannada_text
-from txt2ipa.kannada2ipa.ipaconvert import kannada2ipa
+# Per-process memo sizes. Children repeat a small set of aksharas and words,
+# so these stay small while still catching nearly every repeat.
+AKSHARA_CACHE_SIZE = int(os.environ.get("AKSHARA_CACHE_SIZE", 4096))
+SYLLABIFY_CACHE_SIZE = int(os.environ.get("SYLLABIFY_CACHE_SIZE", 2048))
 
 
+# lru_cache is bounded and safe to share between request threads
+@lru_cache(maxsize=AKSHARA_CACHE_SIZE)
+def akshara_to_ipa(akshara):
+    return kannada2ipa(akshara)
 
-def syllabify(kannada_text):
+
+@lru_cache(maxsize=SYLLABIFY_CACHE_SIZE)
+def _syllabify_cached(kannada_text):
     kannada_aksharas = split_into_aksharas(kannada_text)
-    print(kannada_aksharas)
-    kannada_ipa_list = [kannada2ipa(ak) for ak in kannada_aksharas]
-    return kannada_ipa_list
+    return tuple(akshara_to_ipa(ak) for ak in kannada_aksharas)
+
+
+def syllabify(kannada_text):
+    # fresh list per call, callers are free to modify it
+    return list(_syllabify_cached(kannada_text))
+
+
+def syllabify_ids(kannada_text, vocab):
+    # same syllables as syllabify, interned in the request's SyllableVocab
+    return vocab.encode(_syllabify_cached(kannada_text))
+
+
+def iter_syllables(source):
+    """
+    Lazily yield IPA syllables for long text, an iterable of text chunks or
+    a text file (see iter_aksharas). Unlike syllabify nothing is kept per
+    text, so story retells and whole corpora stream through in constant memory.
+    """
+    for ak in iter_aksharas(source):
+        yield akshara_to_ipa(ak)
+
+
+def syllabify_cache_stats():
+    stats = {}
+    for name, fn in (("akshara", akshara_to_ipa), ("text", _syllabify_cached)):
+        info = fn.cache_info()
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+    return stats
+
+
+def clear_syllabify_cache():
+    akshara_to_ipa.cache_clear()
+    _syllabify_cached.cache_clear()
 
 # print(compare_syllable_lists("bəˈnænə", "bæˈnænə"))
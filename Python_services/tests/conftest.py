@@ -0,0 +1,54 @@
+import io
+import os
+import sys
+import wave
+
+import numpy as np
+
+# The service imports its packages from Python_services/ (utils, txt2ipa, ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Sample rate of the synthetic test signals (the default analysis rate)
+RATE = 16000
+
+
+def synth(seconds=0.6, freq=220.0, level=0.3, harmonics=1, noise=0.0, pad=0.0, seed=0):
+    """
+    Synthetic test signal at RATE: a tone of `harmonics` harmonics of
+    `freq` (harmonic k at level / k), plus white noise at `noise`, with
+    `pad` seconds of room noise (1e-3) on each side. level=0 gives noise only.
+    """
+    t = np.arange(int(seconds * RATE)) / RATE
+    x = sum(level / k * np.sin(2 * np.pi * k * freq * t) for k in range(1, harmonics + 1))
+    rng = np.random.default_rng(seed)
+    if noise:
+        x = x + noise * rng.standard_normal(t.size)
+    if pad:
+        room = 1e-3 * rng.standard_normal(int(pad * RATE))
+        x = np.concatenate([room, x, room])
+    return x
+
+
+def wav_bytes(pcm, rate=RATE, width=2):
+    """WAV file bytes for integer PCM of shape (channels, frames)."""
+    pcm = np.atleast_2d(pcm)
+    frames = pcm.T.astype(np.int64)
+    if width == 1:
+        raw = (frames + 128).astype(np.uint8).tobytes()
+    elif width == 3:
+        b = (frames & 0xFFFFFF).astype("<u4").view(np.uint8).reshape(-1, 4)[:, :3]
+        raw = b.tobytes()
+    else:
+        raw = frames.astype("<i%d" % width).tobytes()
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(pcm.shape[0])
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        w.writeframes(raw)
+    return out.getvalue()
+
+
+def synth_wav(*args, **kwargs):
+    """16-bit mono WAV bytes of synth(*args, **kwargs)."""
+    return wav_bytes(np.round(synth(*args, **kwargs) * 32767))
@@ -0,0 +1,62 @@
+"""Akshara splitter (syllable_Comparision/akshara_splitting.py)."""
+
+import io
+
+import pytest
+
+from syllable_Comparision import akshara_splitting
+from syllable_Comparision.akshara_splitting import iter_aksharas, split_into_aksharas
+from utils.target_cache import find_words_json
+
+
+@pytest.mark.parametrize("word, aksharas", [
+    ("ಅಮ್ಮ", ["ಅ", "ಮ್ಮ"]),
+    ("ಅಂಗಡಿ", ["ಅಂ", "ಗ", "ಡಿ"]),
+    ("ಸ್ತ್ರೀ", ["ಸ್ತ್ರೀ"]),
+    ("ದುಃಖ", ["ದುಃ", "ಖ"]),
+    # a final ್ stays on its consonant (the old splitter gave "ಕ", "್")
+    ("ಕೇಕ್", ["ಕೇ", "ಕ್"]),
+    ("ಶರ್ಟ್", ["ಶ", "ರ್ಟ್"]),
+    ("ಟೇಬಲ್", ["ಟೇ", "ಬ", "ಲ್"]),
+])
+def test_split(word, aksharas):
+    assert split_into_aksharas(word) == aksharas
+
+
+def test_joiners_after_virama():
+    # ZWJ keeps the conjunct together, ZWNJ ends the akshara at the ್
+    assert split_into_aksharas("ಕ್‍ಷ") == ["ಕ್‍ಷ"]
+    assert split_into_aksharas("ಕ್‌ಷ") == ["ಕ್‌", "ಷ"]
+
+
+def test_spaces_are_dropped():
+    assert split_into_aksharas("ಅಮ್ಮ  ಬಾ\nಇಲ್ಲಿ") == ["ಅ", "ಮ್ಮ", "ಬಾ", "ಇ", "ಲ್ಲಿ"]
+    assert split_into_aksharas(" \t ") == []
+
+
+def test_non_kannada_is_dropped_unless_kept():
+    text = "ಅಮ್ಮ, abc 12 ಬಾ!"
+    assert split_into_aksharas(text) == ["ಅ", "ಮ್ಮ", "ಬಾ"]
+    assert split_into_aksharas(text, keep_other=True) == ["ಅ", "ಮ್ಮ", ",", "abc", "12", "ಬಾ", "!"]
+
+
+def test_stray_sign_is_its_own_akshara():
+    assert split_into_aksharas("ಾಕ") == ["ಾ", "ಕ"]
+
+
+def long_text():
+    with open(find_words_json(), encoding="utf-8") as f:
+        text = f.read()
+    return text * 3
+
+
+@pytest.mark.parametrize("keep_other", [False, True])
+def test_streaming_matches_whole_text(monkeypatch, keep_other):
+    text = long_text()
+    expected = split_into_aksharas(text, keep_other)
+    # every chunk size cuts clusters, spaces and latin runs at some point
+    for size in (1, 2, 3, 7, 64):
+        chunks = (text[i:i + size] for i in range(0, len(text), size))
+        assert list(iter_aksharas(chunks, keep_other)) == expected
+    monkeypatch.setattr(akshara_splitting, "CHUNK_SIZE", 5)
+    assert list(iter_aksharas(io.StringIO(text), keep_other)) == expected
@@ -0,0 +1,152 @@
+"""Syllable / phoneme aligner (utils/alignment.py)."""
+
+import random
+from array import array
+
+import numpy as np
+import pytest
+
+from utils.alignment import (
+    ADDITION,
+    CORRECT,
+    OMISSION,
+    SUBSTITUTION,
+    align_batch,
+    align_phonemes_list,
+    edit_ops,
+    op_indices,
+    phonetic_distance,
+    summarize,
+)
+from utils.phonetic_costs import get_cost_matrix
+
+MODES = ("full", "banded", "hirschberg")
+
+
+def reference_distance(t, s, sub=1.0, omit=1.0, add=1.0):
+    """Textbook Levenshtein DP, the ground truth for every mode."""
+    prev = [j * add for j in range(len(s) + 1)]
+    for i in range(1, len(t) + 1):
+        row = [i * omit]
+        for j in range(1, len(s) + 1):
+            row.append(min(prev[j - 1] + (0 if t[i - 1] == s[j - 1] else sub),
+                           prev[j] + omit, row[j - 1] + add))
+        prev = row
+    return prev[-1]
+
+
+def ops_cost(t, s, ops, sub=1.0, omit=1.0, add=1.0):
+    """Check the ops are a valid alignment of t onto s and return its cost."""
+    ti, si = op_indices(ops)
+    assert sorted(ti[ti >= 0].tolist()) == list(range(len(t)))
+    assert sorted(si[si >= 0].tolist()) == list(range(len(s)))
+    cost = 0.0
+    for op, i, j in zip(ops.tolist(), ti.tolist(), si.tolist()):
+        if op == CORRECT:
+            assert t[i] == s[j]
+        elif op == SUBSTITUTION:
+            assert t[i] != s[j]
+            cost += sub
+        else:
+            cost += omit if op == OMISSION else add
+    return cost
+
+
+def random_pairs(count, seed=0, max_len=40):
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        t = [rng.randrange(1, 8) for _ in range(rng.randrange(max_len))]
+        s = list(t)
+        for _ in range(rng.randrange(len(t) // 3 + 2)):
+            k = rng.randrange(len(s) + 1)
+            edit = rng.random()
+            if edit < 0.4 and k < len(s):
+                s[k] = rng.randrange(1, 8)
+            elif edit < 0.7 and k < len(s):
+                del s[k]
+            else:
+                s.insert(k, rng.randrange(1, 8))
+        pairs.append((array("H", t), array("H", s)))
+    return pairs
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_every_mode_is_optimal(mode):
+    for t, s in random_pairs(200):
+        alignment = edit_ops(t, s, mode=mode)
+        expected = reference_distance(t, s)
+        assert alignment.distance == expected
+        assert ops_cost(t, s, alignment.ops) == expected
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_weighted_costs(mode):
+    for t, s in random_pairs(100, seed=1):
+        alignment = edit_ops(t, s, sub_cost=1.5, omit_cost=1.0, add_cost=0.5, mode=mode)
+        expected = reference_distance(t, s, 1.5, 1.0, 0.5)
+        assert alignment.distance == pytest.approx(expected)
+        assert ops_cost(t, s, alignment.ops, 1.5, 1.0, 0.5) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_long_sequences(mode):
+    rng = random.Random(2)
+    t = np.array([rng.randrange(1, 30) for _ in range(1500)], dtype=np.uint16)
+    s = t.copy()
+    s[rng.sample(range(len(s)), 100)] = 31
+    s = np.delete(s, rng.sample(range(len(s)), 50))
+    alignment = edit_ops(t, s, mode=mode)
+    assert alignment.distance == edit_ops(t, s, mode="full").distance
+    assert ops_cost(t, s, alignment.ops) == alignment.distance
+
+
+def test_empty_sides():
+    assert edit_ops("", "").ops.size == 0
+    np.testing.assert_array_equal(edit_ops("ab", "").ops, [OMISSION, OMISSION])
+    np.testing.assert_array_equal(edit_ops("", "ab").ops, [ADDITION, ADDITION])
+
+
+def test_align_phonemes_list_shape():
+    result = align_phonemes_list(["ka", "ma", "la"], ["ka", "na"])
+    assert [row["type"] for row in result["alignment"]] == ["Correct", "Substitution", "Omission"]
+    assert result["summary"] == {"S": 1, "O": 1, "D": 0, "A": 0, "Correct": 1}
+
+
+def test_phonetic_costs():
+    assert phonetic_distance("ʌmmʌ", "ʌmmʌ") == 0.0
+    # a place slip is nearer than an unrelated consonant
+    assert phonetic_distance("t̪ʌ", "ʈʌ") < phonetic_distance("t̪ʌ", "mʌ")
+    # an added or left-out phoneme costs 1
+    assert phonetic_distance("kʌ", "ʌ") == 1.0
+
+
+def test_phonetic_costs_reject_ids_and_other_matrices():
+    costs = get_cost_matrix()
+    with pytest.raises(TypeError):
+        edit_ops(array("H", [60, 61]), array("H", [60]), sub_costs=costs)
+    with pytest.raises(ValueError):
+        edit_ops("ka", "ga", sub_costs=np.ones((3, 3)))
+
+
+def test_batch_matches_edit_ops():
+    pairs = random_pairs(300, seed=3, max_len=60)
+    alignments, summaries = align_batch(pairs)
+    for (t, s), alignment, summary in zip(pairs, alignments, summaries):
+        expected = edit_ops(t, s)
+        assert alignment.distance == expected.distance
+        np.testing.assert_array_equal(alignment.ops, expected.ops)
+        assert summary == summarize(expected.ops)
+
+
+def test_batch_small_cell_budget_and_long_pairs():
+    pairs = random_pairs(50, seed=4) + [(np.arange(1, 600, dtype=np.uint16),
+                                         np.arange(2, 600, dtype=np.uint16))]
+    alignments, _ = align_batch(pairs, max_cells=500)
+    assert [a.distance for a in alignments] == [edit_ops(t, s).distance for t, s in pairs]
+
+
+def test_batch_with_phonetic_costs():
+    costs = get_cost_matrix()
+    (batched,), _ = align_batch([("t̪ʌ", "ʈʌ")], sub_costs=costs)
+    assert batched.distance == edit_ops("t̪ʌ", "ʈʌ", sub_costs=costs).distance
@@ -0,0 +1,97 @@
+"""Flask endpoints (app.py), with the recognizer stubbed out."""
+
+import io
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import app as app_module
+import soda_analysis
+from conftest import synth_wav
+from utils import audio as audio_io
+from utils.audio import AudioBuffer
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Every clip "says" its target word; no network / model needed
+    monkeypatch.setattr(soda_analysis, "transcribe_audio_to_text", lambda audio: "ಅಮ್ಮ")
+    # Anything that isn't WAV would need ffmpeg, make sure it fails
+    monkeypatch.setattr(audio_io, "FFMPEG_PATH", "/nonexistent/ffmpeg")
+    return app_module.app.test_client()
+
+
+def post_batch(client, items):
+    data = {
+        "target_word": [word for word, _ in items],
+        "audio": [(io.BytesIO(body), f"{i}.wav") for i, (_, body) in enumerate(items)],
+    }
+    return client.post("/analyze_soda/batch", data=data, content_type="multipart/form-data")
+
+
+def test_trimmed_clip_returns_json(client):
+    # silence around the word is trimmed by VAD; the span must still encode
+    data = {"target_word": "ಅಮ್ಮ", "audio": (io.BytesIO(synth_wav(pad=1.0)), "padded.wav")}
+    response = client.post("/analyze_soda", data=data, content_type="multipart/form-data")
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result["speech_span"]["trimmed"] is True
+    assert result["speech_span"]["original_duration"] == pytest.approx(2.6)
+    assert result["early_exit"] == "exact_match"
+
+
+def test_batch_of_trimmed_clips_returns_json(client):
+    response = post_batch(client, [("ಅಮ್ಮ", synth_wav(pad=1.0)), ("ಅಮ್ಮ", synth_wav(pad=0.5))])
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [r["speech_span"]["trimmed"] for r in results] == [True, True]
+
+
+def test_batch_isolates_bad_items(client, monkeypatch):
+    analyze = app_module.perform_soda_analysis
+
+    def analyze_or_unserialisable(target_word, audio):
+        if target_word == "ಅನ್ನ":
+            return {"word": target_word, "flag": np.bool_(True)}
+        return analyze(target_word, audio)
+
+    monkeypatch.setattr(app_module, "perform_soda_analysis", analyze_or_unserialisable)
+    response = post_batch(client, [
+        ("ಅಮ್ಮ", synth_wav()),
+        ("ಅಮ್ಮ", b"not audio at all"),
+        ("ಅನ್ನ", synth_wav()),
+        ("", synth_wav()),
+        ("ಅಮ್ಮ", synth_wav(0.8)),
+    ])
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert len(results) == 5
+    for good in (results[0], results[4]):
+        assert "error" not in good
+        assert good["word"] == "ಅಮ್ಮ" and good["early_exit"] == "exact_match"
+    assert results[1]["error"].startswith("Audio processing failed")
+    assert results[2]["error"].startswith("Audio processing failed")
+    assert results[3] == {"error": "Missing target word or audio file"}
+
+
+def test_batch_rejects_unpaired_fields(client):
+    data = {"target_word": ["ಅಮ್ಮ", "ಅನ್ನ"], "audio": [(io.BytesIO(synth_wav()), "0.wav")]}
+    response = client.post("/analyze_soda/batch", data=data, content_type="multipart/form-data")
+    assert response.status_code == 400
+
+
+def test_warm_up_loads_the_resampler(monkeypatch):
+    seen = []
+    to_analysis_format = AudioBuffer.to_analysis_format
+
+    def spy(self, *args, **kwargs):
+        seen.append((self.sample_rate, self.channels))
+        return to_analysis_format(self, *args, **kwargs)
+
+    monkeypatch.setattr(AudioBuffer, "to_analysis_format", spy)
+    monkeypatch.setattr(app_module, "get_recognizer", lambda: SimpleNamespace(load=lambda: None))
+    app_module.warm_up()
+    # a buffer that has to be downmixed and resampled, like a browser upload
+    assert (44100, 2) in seen
@@ -0,0 +1,133 @@
+"""In-memory WAV parsing and canonical analysis format (utils/audio.py)."""
+
+import shutil
+import struct
+import subprocess
+
+import numpy as np
+import pytest
+
+from conftest import wav_bytes
+from utils import audio as audio_module
+from utils.audio import AudioBuffer, AudioDecodeError, _input_format, parse_wav
+
+
+def chunk(chunk_id, body):
+    pad = b"\0" if len(body) & 1 else b""
+    return chunk_id + struct.pack("<I", len(body)) + body + pad
+
+
+def riff(*chunks):
+    body = b"WAVE" + b"".join(chunks)
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def fmt_chunk(tag=1, channels=1, rate=16000, bits=16):
+    align = channels * bits // 8
+    return chunk(b"fmt ", struct.pack("<HHIIHH", tag, channels, rate, rate * align, align, bits))
+
+
+@pytest.mark.parametrize("width", [1, 2, 3, 4])
+def test_parse_every_integer_width(width):
+    top = (1 << (8 * width - 1)) - 1
+    pcm = np.array([[0, 1, -1, top, -top - 1, top // 3]])
+    parsed = parse_wav(wav_bytes(pcm, rate=22050, width=width))
+    assert parsed is not None
+    out, rate, got_width = parsed
+    assert (rate, got_width) == (22050, width)
+    np.testing.assert_array_equal(out, pcm)
+
+
+def test_parse_stereo_is_channels_by_frames():
+    pcm = np.array([[1, 2, 3], [-1, -2, -3]])
+    out, _, _ = parse_wav(wav_bytes(pcm))
+    assert out.shape == (2, 3)
+    np.testing.assert_array_equal(out, pcm)
+
+
+def test_parse_skips_odd_sized_chunks():
+    data = struct.pack("<3h", 5, -5, 7)
+    wav = riff(fmt_chunk(), chunk(b"LIST", b"odd"), chunk(b"data", data))
+    out, _, _ = parse_wav(wav)
+    np.testing.assert_array_equal(out, [[5, -5, 7]])
+
+
+def test_parse_unknown_data_size_reads_to_the_end():
+    # ffmpeg writing to a pipe cannot seek back to fill in the sizes
+    data = struct.pack("<4h", 1, 2, 3, 4)
+    wav = riff(fmt_chunk()) + b"data" + struct.pack("<I", 0xFFFFFFFF) + data
+    out, _, _ = parse_wav(wav)
+    np.testing.assert_array_equal(out, [[1, 2, 3, 4]])
+
+
+def test_parse_truncated_data_keeps_whole_frames():
+    wav = wav_bytes(np.array([[1, 2], [3, 4]]))
+    out, _, _ = parse_wav(wav[:-1])
+    np.testing.assert_array_equal(out, [[1], [3]])
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"ID3\x03\x00" + b"\0" * 40,                                             # mp3
+    riff(chunk(b"data", b"\0\0")),                                           # no fmt
+    riff(fmt_chunk(tag=3, bits=32), chunk(b"data", b"\0" * 8)),              # float
+    riff(fmt_chunk(bits=12), chunk(b"data", b"\0" * 8)),
+])
+def test_parse_rejects_non_pcm(data):
+    assert parse_wav(data) is None
+
+
+def test_from_bytes_scales_like_praat():
+    audio = AudioBuffer.from_bytes(wav_bytes(np.array([[16384, -32768]])))
+    assert audio.sample_rate == 16000
+    np.testing.assert_array_equal(audio.samples, [[0.5, -1.0]])
+
+
+def test_analysis_format_is_mono_at_the_analysis_rate():
+    t = np.arange(44100) / 44100
+    tone = np.sin(2 * np.pi * 440 * t)
+    audio = AudioBuffer(np.stack([tone, tone]), 44100)
+    mono = audio.to_analysis_format(16000)
+    assert (mono.channels, mono.sample_rate, mono.samples.shape[1]) == (1, 16000, 16000)
+    assert mono.source_format == (44100, 2, 1.0)
+    # the resampled tone keeps its level away from the edges
+    assert np.abs(mono.samples[0, 1000:-1000]).max() == pytest.approx(1.0, abs=0.01)
+
+
+def test_analysis_format_keeps_a_canonical_buffer():
+    audio = AudioBuffer(np.zeros(160), 16000)
+    assert audio.to_analysis_format(16000) is audio
+
+
+@pytest.mark.parametrize("log, expected", [
+    (b"  Stream #0:0: Audio: opus, 48000 Hz, stereo, fltp\n", (48000, 2)),
+    (b"  Stream #0:0(eng): Audio: aac (LC) (mp4a / 0x6134706D), 44100 Hz, 5.1(side), fltp\n", (44100, 6)),
+    (b"  Stream #0:1: Audio: pcm_f32le, 8000 Hz, 3 channels, flt\n", (8000, 3)),
+    (b"Stream mapping:\n  Stream #0:0 -> #0:0 (opus (native) -> pcm_s16le (native))\n", None),
+])
+def test_input_format_from_ffmpeg_log(log, expected):
+    assert _input_format(log) == expected
+
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which(audio_module.FFMPEG_PATH) is None, reason="ffmpeg not installed")
+
+
+@needs_ffmpeg
+def test_ffmpeg_decodes_straight_to_analysis_format():
+    proc = subprocess.run(
+        [audio_module.FFMPEG_PATH, "-hide_banner", "-loglevel", "error", "-f", "lavfi",
+         "-i", "sine=frequency=300:duration=1:sample_rate=48000", "-ac", "2",
+         "-f", "flac", "pipe:1"],
+        capture_output=True, check=True,
+    )
+    audio = AudioBuffer.from_bytes(proc.stdout, sample_rate=16000)
+    assert (audio.channels, audio.sample_rate) == (1, 16000)
+    assert audio.source_format[:2] == (48000, 2)
+    assert audio.duration == pytest.approx(1.0, abs=0.01)
+    assert audio.to_analysis_format(16000) is audio
+
+
+@needs_ffmpeg
+def test_ffmpeg_undecodable_upload():
+    with pytest.raises(AudioDecodeError):
+        AudioBuffer.from_bytes(b"not audio" * 100)
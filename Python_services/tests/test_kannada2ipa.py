@@ -0,0 +1,111 @@
+"""
+Parity of the kannada2ipa engines with kannada2ipaMap.py.
+
+The compiled matcher must give what the original ordered str.replace loop
+gave, the rules engine must reproduce the map itself, and the reverse
+lookup must return the first key (in map order) of every IPA value.
+"""
+
+import json
+
+import pytest
+
+from txt2ipa.kannada2ipa import maptable, rules
+from txt2ipa.kannada2ipa.ipaconvert import (
+    CharmapMatcher,
+    RuleMatcher,
+    ipa2kannada_batch,
+    ipa2kannada_value,
+    kannada2ipa,
+    reverse_charmap,
+)
+from txt2ipa.kannada2ipa.kannada2ipaMap import kan2ipa
+from utils.target_cache import find_words_json
+
+RANK = {key: rank for rank, key in enumerate(kan2ipa)}
+
+
+def ordered_replace(text):
+    """The original unicode2ipa loop: every key in map order, str.replace."""
+    # Only keys already in the text can ever match (values share no
+    # character with any key), so the loop is limited to those.
+    present = {text[i:j] for i in range(len(text)) for j in range(i + 1, len(text) + 1)}
+    for key in sorted(present.intersection(RANK), key=RANK.get):
+        if key in text:
+            text = text.replace(key, kan2ipa[key])
+    return text
+
+
+def load_words():
+    path = find_words_json()
+    if not path:
+        return []
+    with open(path, encoding="utf-8") as f:
+        bands = json.load(f)
+    return [item["word"] for band in bands.values() for item in band if item.get("word")]
+
+
+SAMPLES = list(kan2ipa) + load_words()
+
+
+@pytest.fixture(scope="module")
+def table_matcher():
+    return CharmapMatcher(kan2ipa)
+
+
+def test_table_matcher_matches_ordered_replace(table_matcher):
+    bad = [s for s in SAMPLES if table_matcher.convert(s) != ordered_replace(s)]
+    assert not bad, bad[:10]
+
+
+def test_rules_generate_the_map():
+    assert list(rules.build_kan2ipa().items()) == list(kan2ipa.items())
+
+
+def test_rule_lookup_every_key(table_matcher):
+    bad = [key for key in kan2ipa if rules.rule_lookup(key) != table_matcher.table[key]]
+    assert not bad, bad[:10]
+
+
+def test_rules_engine_converts_like_table(table_matcher):
+    matcher = RuleMatcher()
+    bad = [s for s in SAMPLES if matcher.convert(s) != table_matcher.convert(s)]
+    assert not bad, bad[:10]
+    assert kannada2ipa("ಅಮ್ಮ") == table_matcher.convert("ಅಮ್ಮ")
+
+
+def test_reverse_lookup_every_value():
+    reverse = reverse_charmap(kan2ipa)
+    bad = [val for val in reverse if rules.rule_reverse(val) != reverse[val]]
+    assert not bad, bad[:10]
+    bad = [val for val in reverse if ipa2kannada_value(val) != reverse[val]]
+    assert not bad, bad[:10]
+
+
+def test_reverse_charmap_keeps_first_key():
+    assert reverse_charmap({"a": "x", "b": "x", "c": "y"}) == {"x": "a", "y": "c"}
+
+
+def test_reverse_lookup_passes_unknown_through():
+    assert ipa2kannada_value("not ipa") == "not ipa"
+
+
+def test_batch_blanks_only_malformed_items():
+    words = ipa2kannada_batch([["ʌ"], ["ʌ", 1], "ʌ", None, []])
+    assert words == [ipa2kannada_value("ʌ"), "", "", "", ""]
+
+
+def test_artifact_round_trip(tmp_path):
+    path = str(tmp_path / "kannada2ipaMap.bin")
+    maptable.build_artifact(path)
+    loaded, table, reverse = maptable.load_tables(path)
+    assert list(loaded.items()) == list(kan2ipa.items())
+    assert table == CharmapMatcher(kan2ipa).table
+    assert reverse == reverse_charmap(kan2ipa)
+
+
+def test_stale_artifact_falls_back_to_source(tmp_path):
+    path = tmp_path / "kannada2ipaMap.bin"
+    path.write_bytes(b"not an artifact")
+    loaded, _, _ = maptable.load_tables(str(path))
+    assert list(loaded.items()) == list(kan2ipa.items())
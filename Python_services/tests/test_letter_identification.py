@@ -0,0 +1,122 @@
+"""Error classification (utils/letter_identification.py)."""
+
+import pytest
+
+from syllable_Comparision.syllabify_main import syllabify
+from utils import letter_identification
+from utils.alignment import phonetic_distance
+from utils.letter_identification import (
+    DISTORTION_THRESHOLD,
+    classify_errors,
+    identify_addition,
+    identify_omission,
+    mark_near_misses,
+)
+from utils.syllable_vocab import GAP, SyllableVocab
+
+
+def not_called():
+    raise AssertionError("distortion score computed for a length mismatch")
+
+
+def test_exact_match():
+    result = classify_errors(syllabify("ಅಂಗಡಿ"), syllabify("ಅಂಗಡಿ"), distortion_score=not_called)
+    assert result.error_type == ""
+    assert result.error_syllables == []
+    assert result.distortion_score is None
+    assert result.counts == {"S": 0, "O": 0, "D": 0, "A": 0, "Correct": 3}
+
+
+def test_repeated_syllable_addition():
+    # ಅಮ್ಮ said as ಅಮ್ಮಮ್ಮ: one extra mmʌ, though mmʌ is also in the target
+    result = classify_errors(syllabify("ಅಮ್ಮ"), syllabify("ಅಮ್ಮಮ್ಮ"), distortion_score=not_called)
+    assert result.error_type == "Addition"
+    assert result.error_syllables == ["mmʌ"]
+
+
+def test_repeated_syllable_omission():
+    result = classify_errors(syllabify("ಅಮ್ಮಮ್ಮ"), syllabify("ಅಮ್ಮ"), distortion_score=not_called)
+    assert result.error_type == "Omission"
+    assert result.error_syllables == ["mmʌ"]
+    assert identify_omission(["ʌ", "mmʌ", "mmʌ"], ["ʌ", "mmʌ"]) == ["mmʌ"]
+    assert identify_addition(["ʌ", "mmʌ"], ["ʌ", "mmʌ", "mmʌ"]) == ["mmʌ"]
+
+
+def test_same_length_substitution_pairs():
+    result = classify_errors(syllabify("ಕಮಲ"), syllabify("ಗಮನ"), distortion_score=lambda: 10.0)
+    assert result.error_type == "Substitution"
+    assert result.distortion_score == 10.0
+    assert result.error_syllables == [
+        {"target": "kʌ", "spoken": "gʌ"},
+        {"target": "lʌ", "spoken": "nʌ"},
+    ]
+
+
+def test_same_length_pairs_follow_the_alignment():
+    # a shifted word is one omission and one addition, not three substitutions
+    result = classify_errors(["kʌ", "mʌ", "lʌ"], ["mʌ", "lʌ", "nʌ"])
+    assert result.error_syllables == [
+        {"target": "kʌ", "spoken": ""},
+        {"target": "", "spoken": "nʌ"},
+    ]
+
+
+def test_distortion_above_threshold():
+    result = classify_errors(["kʌ"], ["gʌ"], distortion_score=lambda: DISTORTION_THRESHOLD + 1)
+    assert result.error_type == "Distortion"
+    assert result.error_syllables == [{"target": "kʌ", "spoken": "gʌ"}]
+
+
+def test_interned_ids_use_the_gap():
+    vocab = SyllableVocab()
+    target = vocab.encode(["kʌ", "mʌ", "lʌ"])
+    spoken = vocab.encode(["mʌ", "lʌ", "nʌ"])
+    result = classify_errors(target, spoken, gap=GAP)
+    assert vocab.decode_pairs(result.error_syllables) == [
+        {"target": "kʌ", "spoken": ""},
+        {"target": "", "spoken": "nʌ"},
+    ]
+
+
+def test_near_miss_threshold(monkeypatch):
+    distance = phonetic_distance("t̪ʌ", "ʈʌ")
+
+    def graded():
+        return mark_near_misses([{"target": "t̪ʌ", "spoken": "ʈʌ"}, {"target": "kʌ", "spoken": ""}])
+
+    monkeypatch.setattr(letter_identification, "NEAR_MISS_DISTANCE", distance)
+    pairs = graded()
+    assert pairs[0] == {"target": "t̪ʌ", "spoken": "ʈʌ",
+                        "phonetic_distance": round(distance, 3), "near_miss": True}
+    # a pair with a gap is not graded
+    assert pairs[1] == {"target": "kʌ", "spoken": ""}
+
+    monkeypatch.setattr(letter_identification, "NEAR_MISS_DISTANCE", distance - 1e-6)
+    assert graded()[0]["near_miss"] is False
+
+
+@pytest.mark.parametrize("target, spoken, near", [
+    # one slip of a single feature
+    ("t̪ʌ", "ʈʌ", True),    # dental for retroflex
+    ("kʌ", "gʌ", True),    # voicing
+    ("kʌ", "kʰʌ", True),   # aspiration
+    ("be", "be:", True),   # vowel length
+    # place changes
+    ("pʌ", "kʌ", False),
+    ("bʌ", "gʌ", False),
+    # manner changes
+    ("kʌ", "tʃʌ", False),
+    ("lʌ", "nʌ", False),
+    # unrelated sound, and a phoneme left out
+    ("t̪ʌ", "mʌ", False),
+    ("kʌ", "ʌ", False),
+])
+def test_near_miss_default_threshold(target, spoken, near):
+    (pair,) = mark_near_misses([{"target": target, "spoken": spoken}])
+    assert pair["near_miss"] is near
+
+
+def test_shared_vowel_does_not_dilute_the_consonant():
+    # the grade is the consonant's own cost, whatever else the syllables share
+    assert phonetic_distance("pʌ", "kʌ") == phonetic_distance("p", "k")
+    assert phonetic_distance("ppʌ", "pkʌ") == phonetic_distance("p", "k")
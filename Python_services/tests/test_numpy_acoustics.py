@@ -0,0 +1,45 @@
+"""NumPy pitch / intensity backend (utils/numpy_acoustics.py) against Praat."""
+
+import numpy as np
+import pytest
+
+from conftest import RATE, synth
+from utils.acoustics import extract_features
+from utils.audio import AudioBuffer
+from utils.numpy_acoustics import intensity_track, pitch_track
+
+
+@pytest.mark.parametrize("f0, noise", [(120, 0.0), (220, 0.01), (350, 0.05)])
+def test_agrees_with_praat(f0, noise):
+    pytest.importorskip("parselmouth")
+    # five harmonics with a little room noise, like a sustained vowel
+    samples = synth(1.0, freq=f0, harmonics=5, noise=noise)
+    praat = extract_features(AudioBuffer(samples, RATE), "praat")
+    numpy = extract_features(AudioBuffer(samples, RATE), "numpy")
+
+    np.testing.assert_allclose(numpy.pitch_times, praat.pitch_times, atol=1e-9)
+    np.testing.assert_allclose(numpy.intensity_times, praat.intensity_times, atol=1e-9)
+    assert numpy.mean_pitch == pytest.approx(praat.mean_pitch, rel=0.01)
+    assert numpy.mean_pitch == pytest.approx(f0, rel=0.05)
+    assert numpy.mean_intensity == pytest.approx(praat.mean_intensity, abs=0.1)
+    assert numpy.sd_intensity == pytest.approx(praat.sd_intensity, abs=0.1)
+
+
+def test_silence_is_unvoiced():
+    samples = np.zeros((1, RATE))
+    pitch, _ = pitch_track(samples, RATE)
+    intensity, _ = intensity_track(samples, RATE)
+    assert pitch.size and not pitch.any()
+    assert (intensity == -300.0).all()
+
+
+@pytest.mark.parametrize("n_samples", [0, 100, 600])
+def test_too_short_input_gives_empty_tracks(n_samples):
+    # shorter than one analysis window (40 ms pitch, 64 ms intensity)
+    samples = synth(n_samples / RATE, harmonics=5)[np.newaxis, :]
+    for track in (pitch_track, intensity_track):
+        values, times = track(samples, RATE)
+        assert values.size == 0 and times.size == 0
+
+    features = extract_features(AudioBuffer(samples, RATE), "numpy")
+    assert features.mean_pitch == 0.0 and features.mean_intensity == 0.0
@@ -0,0 +1,39 @@
+"""ASR backend registry (audio2text/recognizers.py)."""
+
+import pytest
+
+from audio2text import recognizers
+from audio2text.recognizers import Recognizer
+
+
+def test_incomplete_backend_fails_when_created(monkeypatch):
+    class NoTranscribe(Recognizer):
+        name = "broken"
+
+    monkeypatch.setattr(recognizers, "RECOGNIZERS", {"broken": NoTranscribe})
+    monkeypatch.setattr(recognizers, "ASR_BACKEND", "broken")
+    monkeypatch.setattr(recognizers, "_recognizer", None)
+    with pytest.raises(TypeError):
+        recognizers.get_recognizer()
+
+
+def test_unknown_backend(monkeypatch):
+    monkeypatch.setattr(recognizers, "ASR_BACKEND", "nope")
+    monkeypatch.setattr(recognizers, "_recognizer", None)
+    with pytest.raises(ValueError):
+        recognizers.get_recognizer()
+
+
+def test_backend_is_created_once(monkeypatch):
+    class Fixed(Recognizer):
+        name = "fixed"
+
+        def transcribe(self, audio):
+            return "ಅಮ್ಮ"
+
+    monkeypatch.setattr(recognizers, "RECOGNIZERS", {"fixed": Fixed})
+    monkeypatch.setattr(recognizers, "ASR_BACKEND", "fixed")
+    monkeypatch.setattr(recognizers, "_recognizer", None)
+    first = recognizers.get_recognizer()
+    assert isinstance(first, Fixed) and recognizers.get_recognizer() is first
+    assert first.transcribe(None) == "ಅಮ್ಮ"
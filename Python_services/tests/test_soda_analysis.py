@@ -0,0 +1,131 @@
+"""Staged SODA pipeline (soda_analysis.py), with the recognizer stubbed out."""
+
+import threading
+
+import numpy as np
+import pytest
+
+import soda_analysis
+from conftest import RATE, synth
+from soda_analysis import perform_soda_analysis
+from utils.audio import AudioBuffer
+
+
+def tone():
+    return AudioBuffer(synth(), RATE)
+
+
+def stage_names(result):
+    return [stage["stage"] for stage in result["stages"]]
+
+
+@pytest.fixture
+def asr(monkeypatch):
+    """Make the recognizer "hear" asr.text, recording each call."""
+
+    class StubASR:
+        text = ""
+        calls = 0
+
+        def __call__(self, audio):
+            self.calls += 1
+            return self.text
+
+    stub = StubASR()
+    monkeypatch.setattr(soda_analysis, "transcribe_audio_to_text", stub)
+    return stub
+
+
+@pytest.fixture
+def serial(monkeypatch):
+    monkeypatch.setattr(soda_analysis, "ASR_OVERLAP", False)
+
+
+@pytest.mark.parametrize("overlap", [False, True])
+def test_silence_stops_before_praat_and_asr(asr, monkeypatch, overlap):
+    monkeypatch.setattr(soda_analysis, "ASR_OVERLAP", overlap)
+    result = perform_soda_analysis("ಅಮ್ಮ", AudioBuffer(np.zeros(RATE), RATE))
+    assert result["early_exit"] == "no_speech"
+    assert result["error"] == soda_analysis.NO_SPEECH_REMARK
+    assert stage_names(result) == ["ingest", "vad"]
+    assert asr.calls == 0
+
+
+@pytest.mark.parametrize("overlap", [False, True])
+def test_unvoiced_noise_stops_before_praat_and_asr(asr, monkeypatch, overlap):
+    monkeypatch.setattr(soda_analysis, "ASR_OVERLAP", overlap)
+    noise = synth(1.0, level=0, noise=0.1)
+    result = perform_soda_analysis("ಅಮ್ಮ", AudioBuffer(noise, RATE))
+    assert result["early_exit"] == "no_speech"
+    assert stage_names(result) == ["ingest", "vad", "voicing"]
+    assert asr.calls == 0
+
+
+def test_exact_match_stops_before_distortion(asr, serial, monkeypatch):
+    def no_distortion(features):
+        raise AssertionError("distortion scored for an exact match")
+
+    monkeypatch.setattr(soda_analysis, "detect_distortion", no_distortion)
+    asr.text = "ಅಮ್ಮ"
+    result = perform_soda_analysis("ಅಮ್ಮ", tone())
+    assert "error" not in result
+    assert result["early_exit"] == "exact_match"
+    assert result["error_type"] == ""
+    assert stage_names(result) == ["ingest", "vad", "voicing", "features", "target", "asr", "syllabify"]
+    assert asr.calls == 1
+
+
+def test_mismatch_runs_every_stage(asr, serial):
+    asr.text = "ಗಮನ"
+    result = perform_soda_analysis("ಕಮಲ", tone())
+    assert result["early_exit"] is None
+    assert result["error_type"] in ("Substitution", "Distortion")
+    assert stage_names(result) == [
+        "ingest", "vad", "voicing", "features", "target", "asr", "syllabify", "distortion", "classify",
+    ]
+    assert all(stage["ms"] >= 0 for stage in result["stages"])
+
+
+def test_length_mismatch_skips_distortion(asr, serial):
+    asr.text = "ಅಮ್ಮಮ್ಮ"
+    result = perform_soda_analysis("ಅಮ್ಮ", tone())
+    assert result["error_type"] == "Addition"
+    assert result["error_syllables"] == ["mmʌ"]
+    assert "distortion" not in stage_names(result)
+
+
+def test_praat_pass_overlaps_asr(asr, monkeypatch):
+    monkeypatch.setattr(soda_analysis, "ASR_OVERLAP", True)
+    extract_features = soda_analysis.extract_features
+    praat_started = threading.Event()
+    seen = []
+
+    def features_on_the_pool(audio):
+        praat_started.set()
+        return extract_features(audio)
+
+    def waiting_asr(audio):
+        # Praat must start while the recognizer is still waiting
+        seen.append(praat_started.wait(5))
+        return "ಅಮ್ಮ"
+
+    monkeypatch.setattr(soda_analysis, "extract_features", features_on_the_pool)
+    monkeypatch.setattr(soda_analysis, "transcribe_audio_to_text", waiting_asr)
+    result = perform_soda_analysis("ಅಮ್ಮ", tone())
+    assert seen == [True]
+    assert result["early_exit"] == "exact_match"
+    assert stage_names(result) == [
+        "ingest", "vad", "voicing", "asr", "features_wait", "features", "target", "syllabify",
+    ]
+    assert result["stages"][5]["overlapped"] is True
+
+
+def test_overlapped_result_matches_serial(asr, monkeypatch):
+    asr.text = "ಗಮನ"
+    results = []
+    for overlap in (False, True):
+        monkeypatch.setattr(soda_analysis, "ASR_OVERLAP", overlap)
+        result = perform_soda_analysis("ಕಮಲ", tone())
+        results.append({k: v for k, v in result.items() if k != "stages"})
+    assert results[0] == results[1]
+    assert "distortion" in stage_names(result)
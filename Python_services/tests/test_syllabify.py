@@ -0,0 +1,60 @@
+"""Memoized syllabification (syllable_Comparision/syllabify_main.py)."""
+
+from itertools import islice, product
+
+import pytest
+
+from syllable_Comparision import syllabify_main
+from syllable_Comparision.syllabify_main import (
+    clear_syllabify_cache,
+    iter_syllables,
+    syllabify,
+    syllabify_cache_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_syllabify_cache()
+    yield
+    clear_syllabify_cache()
+
+
+def test_repeated_words_hit_the_cache():
+    assert syllabify("ಅಮ್ಮ") == ["ʌ", "mmʌ"]
+    assert syllabify("ಅಮ್ಮ") == ["ʌ", "mmʌ"]
+    syllabify("ಅನ್ನ")
+    stats = syllabify_cache_stats()
+    assert (stats["text"]["hits"], stats["text"]["misses"], stats["text"]["size"]) == (1, 2, 2)
+    # ಅ is shared by both words, so the second word reuses it
+    assert (stats["akshara"]["hits"], stats["akshara"]["misses"]) == (1, 3)
+
+
+def test_callers_get_their_own_list():
+    first = syllabify("ಅಮ್ಮ")
+    first.append("x")
+    assert syllabify("ಅಮ್ಮ") == ["ʌ", "mmʌ"]
+
+
+def test_clear_resets_counters():
+    syllabify("ಅಮ್ಮ")
+    syllabify("ಅಮ್ಮ")
+    clear_syllabify_cache()
+    for stats in syllabify_cache_stats().values():
+        assert (stats["hits"], stats["misses"], stats["size"]) == (0, 0, 0)
+
+
+def test_cache_stays_within_max_size():
+    consonants = [chr(c) for c in range(0x0C95, 0x0CBA) if chr(c).isalpha()]
+    count = syllabify_main.SYLLABIFY_CACHE_SIZE + 50
+    for letters in islice(product(consonants, repeat=3), count):
+        syllabify("".join(letters))
+    stats = syllabify_cache_stats()
+    assert stats["text"]["max_size"] == syllabify_main.SYLLABIFY_CACHE_SIZE
+    assert stats["text"]["size"] == syllabify_main.SYLLABIFY_CACHE_SIZE
+    assert stats["akshara"]["size"] <= syllabify_main.AKSHARA_CACHE_SIZE
+
+
+def test_streaming_matches_syllabify():
+    text = "ಅಮ್ಮ ಅನ್ನ ಅಂಗಡಿ"
+    assert list(iter_syllables(text)) == syllabify(text)
@@ -0,0 +1,65 @@
+"""Target-word cache (utils/target_cache.py)."""
+
+import json
+
+import pytest
+
+from syllable_Comparision.syllabify_main import syllabify
+from txt2ipa.kannada2ipa.ipaconvert import kannada2ipa
+from utils.target_cache import analyze_target, clear_target_cache, target_cache_stats, warm_target_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_target_cache()
+    yield
+    clear_target_cache()
+
+
+@pytest.fixture
+def words_json(tmp_path):
+    path = tmp_path / "words.json"
+    bands = {"2": [{"word": "ಅಮ್ಮ"}, {"word": "ಅನ್ನ"}], "5": [{"word": "ಅಮ್ಮ"}, {"image": "x.jpg"}]}
+    path.write_text(json.dumps(bands, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def test_analysis_matches_uncached_pipeline():
+    target = analyze_target("ಅಂಗಡಿ")
+    assert target.ipa == kannada2ipa("ಅಂಗಡಿ")
+    assert list(target.syllables) == syllabify("ಅಂಗಡಿ")
+    assert "".join(target.aksharas) == "ಅಂಗಡಿ"
+
+
+def test_hits_and_misses():
+    analyze_target("ಅಮ್ಮ")
+    assert analyze_target("ಅಮ್ಮ") is analyze_target("ಅಮ್ಮ")
+    stats = target_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 1)
+    assert stats["hit_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+
+def test_warming_is_not_counted_as_request_misses(words_json):
+    assert warm_target_cache(words_json) == 2
+    analyze_target("ಅಮ್ಮ")
+    analyze_target("ಅಂಗಡಿ")
+    stats = target_cache_stats()
+    assert stats["warmed"] == 2
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 3)
+
+
+def test_missing_words_json_fills_lazily(tmp_path):
+    assert warm_target_cache(str(tmp_path / "missing.json")) == 0
+    assert target_cache_stats()["size"] == 0
+
+
+def test_clear_resets_entries_and_counters(words_json):
+    warm_target_cache(words_json)
+    analyze_target("ಅಮ್ಮ")
+    clear_target_cache()
+    assert target_cache_stats() == {
+        "hits": 0, "misses": 0, "warmed": 0, "hit_rate": 0.0,
+        "size": 0, "max_size": target_cache_stats()["max_size"],
+    }
+    analyze_target("ಅಮ್ಮ")
+    assert target_cache_stats()["misses"] == 1
@@ -0,0 +1,82 @@
+"""Voice-activity trimming (utils/vad.py)."""
+
+import numpy as np
+
+from conftest import RATE, synth
+from utils import vad
+from utils.audio import AudioBuffer
+from utils.vad import SpeechSpan, find_speech_span, rough_mean_pitch, trim_to_speech
+
+
+def clip(*parts):
+    return AudioBuffer(np.concatenate(parts), RATE)
+
+
+def noise(seconds, level=1e-3, seed=0):
+    return synth(seconds, level=0, noise=level, seed=seed)
+
+
+def tone(seconds):
+    return synth(seconds)
+
+
+def test_trims_silence_around_speech():
+    audio = clip(noise(1.0), tone(0.5), noise(1.5, seed=1))
+    span = find_speech_span(audio)
+    pad = int(RATE * vad.VAD_PAD_MS / 1000)
+    assert span.trimmed is True
+    assert type(span.start) is int and type(span.end) is int
+    # the tone is kept whole, with at most the padding (plus a frame) around it
+    assert RATE - pad - RATE // 50 <= span.start <= RATE
+    assert int(1.5 * RATE) <= span.end <= int(1.5 * RATE) + pad + RATE // 50
+
+
+def test_keeps_weak_fricatives():
+    hiss = noise(0.2, level=0.002, seed=2)
+    audio = clip(noise(1.0), tone(0.3), hiss, noise(1.0, seed=3))
+    span = find_speech_span(audio)
+    assert span.end >= int(1.5 * RATE)
+
+
+def test_all_noise_or_all_speech_is_left_alone():
+    for samples in (noise(2.0), tone(2.0)):
+        audio = AudioBuffer(samples, RATE)
+        assert find_speech_span(audio) == SpeechSpan(0, len(samples), False)
+        trimmed, span = trim_to_speech(audio)
+        assert trimmed is audio and not span.trimmed
+
+
+def test_short_blip_grows_to_min_duration():
+    audio = clip(noise(1.0), tone(0.02), noise(1.0, seed=4))
+    span = find_speech_span(audio)
+    assert span.end - span.start >= int(RATE * vad.VAD_MIN_DURATION)
+    assert span.start <= RATE <= span.end
+
+
+def test_too_short_clip_is_untouched():
+    audio = AudioBuffer(np.zeros(100), RATE)
+    assert find_speech_span(audio) == SpeechSpan(0, 100, False)
+
+
+def test_trim_returns_a_view_of_the_span():
+    audio = clip(noise(1.0), tone(0.5), noise(1.0, seed=5))
+    trimmed, span = trim_to_speech(audio)
+    assert trimmed.samples.shape[1] == span.end - span.start
+    assert np.shares_memory(trimmed.samples, audio.samples)
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(vad, "VAD_ENABLED", False)
+    audio = clip(noise(1.0), tone(0.5), noise(1.0, seed=6))
+    trimmed, span = trim_to_speech(audio)
+    assert trimmed is audio and span == SpeechSpan(0, audio.samples.shape[1], False)
+
+
+def test_rough_pitch_of_voiced_and_unvoiced_clips():
+    for f0 in (120, 220, 350):
+        voiced = AudioBuffer(synth(0.5, freq=f0, harmonics=5, noise=0.01), RATE)
+        assert abs(rough_mean_pitch(voiced) - f0) < 0.05 * f0
+    assert rough_mean_pitch(AudioBuffer(noise(0.5, level=0.1), RATE)) == 0.0
+    assert rough_mean_pitch(AudioBuffer(np.zeros(RATE), RATE)) == 0.0
+    # shorter than one 40 ms frame
+    assert rough_mean_pitch(AudioBuffer(tone(0.02), RATE)) == 0.0
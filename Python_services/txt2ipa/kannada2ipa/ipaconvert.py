@@ -20,43 +20,203 @@
 #                                                                            #
 ##############################################################################
 
+import os
+
 from .orddic import OrderedDict
 
-from .kannada2ipaMap import kan2ipa 
+from . import maptable
+from . import rules
 
-__all__ = ['kan2ipa', 'kannada2ipa']
-    
+__all__ = ['kan2ipa', 'kannada2ipa', 'compile_charmap', 'ipa2kannada_value',
+           'ipa2kannada_word', 'ipa2kannada_batch']
 
-def unicode2ipa(text, charmap):
+
+class CharmapMatcher(object):
+    '''
+    Compiled form of an ordered charmap.
+
+    Applying the charmap key by key with str.replace gives earlier keys
+    priority over later ones, wherever they occur in the text. The matcher
+    reproduces exactly that result in a single pass : it collects every
+    key occurrence with one hash lookup per (position, key length), then
+    claims spans in (map order, position) order, skipping any span that
+    overlaps an already claimed one. This is only equivalent while no
+    value shares a character with any key (true for kan2ipa), which is
+    checked when compiling.
+    '''
+
+    def __init__(self, charmap=None, table=None):
+        '''
+        Compile from charmap, or reuse a table of key : (rank, value)
+        built earlier (see maptable), which skips the checks below.
+        '''
+        if table is None:
+            table = {}
+            for rank, (key, val) in enumerate(charmap.items()):
+                table[key] = (rank, val)
+            # end of for rank, (key, val) in enumerate(charmap.items()):
+            keychars = set(''.join(table))
+            for key, (rank, val) in table.items():
+                if not val or keychars.intersection(val):
+                    raise ValueError("charmap value %r for key %r can re-enter "
+                                     "the replacement; cannot compile" % (val, key))
+            # end of for key, (rank, val) in table.items():
+        # end of if table is None:
+        self.table = table
+        self.lookup = table.get
+        self.lengths = sorted(set(len(key) for key in table))
+
+    def convert(self, text):
+        lookup = self.lookup
+        size = len(text)
+        matches = []
+        for pos in range(size):
+            for length in self.lengths:
+                if pos + length > size:
+                    break
+                hit = lookup(text[pos:pos + length])
+                if hit is not None:
+                    matches.append((hit[0], pos, length, hit[1]))
+            # end of for length in self.lengths:
+        # end of for pos in range(size):
+        if not matches:
+            return text
+
+        matches.sort()
+        claimed = [None] * size
+        for rank, pos, length, val in matches:
+            end = pos + length
+            if any(claimed[pos:end]):
+                continue
+            claimed[pos] = (length, val)
+            for idx in range(pos + 1, end):
+                claimed[idx] = True
+        # end of for rank, pos, length, val in matches:
+
+        out = []
+        pos = 0
+        while pos < size:
+            span = claimed[pos]
+            if span is None:
+                out.append(text[pos])
+                pos += 1
+            else:
+                out.append(span[1])
+                pos += span[0]
+        # end of while pos < size:
+        return ''.join(out)
+# end of class CharmapMatcher(object):
+
+
+class RuleMatcher(CharmapMatcher):
+    '''
+    CharmapMatcher for kan2ipa that computes (rank, ipa) of a candidate
+    key from the consonant / vowel sign tables in rules.py instead of
+    looking it up in a 17,899 entry table. Output is identical.
+    '''
+
+    def __init__(self):
+        self.table = None
+        self.lookup = rules.rule_lookup
+        self.lengths = list(range(1, rules.MAX_KEY_LENGTH + 1))
+# end of class RuleMatcher(CharmapMatcher):
+
+
+def compile_charmap(charmap):
     '''
     charmap : dictionary which has both unicode as key, ipa as value
+    Returns a CharmapMatcher that unicode2ipa can use directly.
     '''
+    if isinstance(charmap, CharmapMatcher):
+        return charmap
+    return CharmapMatcher(charmap)
+# end of def compile_charmap(charmap):
+
+
+def unicode2ipa(text, charmap):
+    '''
+    charmap : dictionary which has both unicode as key, ipa as value,
+              or a CharmapMatcher already compiled from one
+    '''
+    if charmap is _kan2ipa_matcher or (_kan2ipa_dict is not None and charmap is _kan2ipa_dict):
+        matcher = _kan2ipa_matcher
+    else:
+        matcher = compile_charmap(charmap)
+    # end of if charmap is _kan2ipa_matcher or ...:
     if isinstance(text, (list, tuple)):
-        unitxt = ''
-        for line in text:
-            for key,val in charmap.iteritems():
-                if key in line:
-                    line = line.replace(key, val)
-                # end of if key in text:
-            unitxt += line
-        # end of for line in text:
-        return unitxt
+        return ''.join(matcher.convert(line) for line in text)
     elif isinstance(text, str):
-        for key, val in charmap.items():
-            if key in text:
-                text = text.replace(key, val)
-            # end of if key in text:
-        # end of for key,val in charmap.iteritems():
-        return text
+        return matcher.convert(text)
     # end of if isinstance(text, (list, tuple)):
 # end of def encode2unicode(text, charmap):
 
 def kannada2ipa(text):
-    return unicode2ipa(text, kan2ipa)
+    return unicode2ipa(text, _kan2ipa_matcher)
+
+def reverse_charmap(charmap):
+    '''
+    Build an ipa -> unicode dictionary from charmap. When several keys map
+    to the same ipa value, the first one in charmap order wins, as the
+    old linear reverse scan did.
+    '''
+    reverse = {}
+    for key, val in charmap.items():
+        reverse.setdefault(val, key)
+    # end of for key, val in charmap.items():
+    return reverse
+# end of def reverse_charmap(charmap):
+
+
+# KAN2IPA_ENGINE selects how kan2ipa is held in memory :
+#   rules (default) : computed on the fly from the small tables in rules.py
+#   table           : the full map with its compiled matcher and reverse
+#                     index, from kannada2ipaMap.bin when available
+#                     (see maptable.py) else kannada2ipaMap.py
+# Both give identical results.
+KAN2IPA_ENGINE = os.environ.get('KAN2IPA_ENGINE', 'rules').lower()
+
+if KAN2IPA_ENGINE == 'table':
+    kan2ipa, _kan2ipa_table, _ipa2kan_table = maptable.load_tables()
+    _kan2ipa_dict = kan2ipa
+    _kan2ipa_matcher = CharmapMatcher(table=_kan2ipa_table)
+    _ipa2kan = _ipa2kan_table.get
+else:
+    _kan2ipa_dict = None  # built on first access, see __getattr__
+    _kan2ipa_matcher = RuleMatcher()
+    _ipa2kan = rules.rule_reverse
+# end of if KAN2IPA_ENGINE == 'table':
+
+
+def __getattr__(name):
+    # With the rules engine the 17,899 entry kan2ipa dict is only built
+    # when something actually asks for it.
+    if name == 'kan2ipa':
+        global kan2ipa, _kan2ipa_dict
+        kan2ipa = _kan2ipa_dict = rules.build_kan2ipa()
+        return kan2ipa
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+# end of def __getattr__(name):
+
 
 def ipa2kannada_value(ipa_value):
-    for key, value in kan2ipa.items():
-        if value == ipa_value:
-            return key
-    return ipa_value  # if not found
+    key = _ipa2kan(ipa_value)
+    return ipa_value if key is None else key  # if not found, return as is
 
+def ipa2kannada_word(syllables):
+    '''
+    syllables : list of ipa syllable strings
+    Returns the Kannada word made by joining each syllable's Kannada value.
+    '''
+    return ''.join(ipa2kannada_value(syl) for syl in syllables)
+
+def _is_syllable_list(syllables):
+    return isinstance(syllables, list) and all(isinstance(syl, str) for syl in syllables)
+
+def ipa2kannada_batch(syllable_lists):
+    '''
+    syllable_lists : list of ipa syllable lists
+    Returns one Kannada word per syllable list, in the same order. An item
+    that is not a list of strings gives '' so it cannot fail the others.
+    '''
+    return [ipa2kannada_word(syllables) if _is_syllable_list(syllables) else ''
+            for syllables in syllable_lists]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Precompiled binary form of kannada2ipaMap.
+#
+# Importing kannada2ipaMap.py means parsing (or unmarshalling) and running
+# an 18k line literal, then compiling the matcher and reverse index on top
+# of it. The build step below does all of that once and stores the result
+# next to the source as kannada2ipaMap.bin :
+#
+#   magic (8 bytes) | sha256 of kannada2ipaMap.py (32 bytes) | marshal payload
+#
+# The payload is the tuple (keys, values, matcher table, reverse index).
+# At runtime the file is memory-mapped and unmarshalled directly. If it is
+# missing, was built from a different kannada2ipaMap.py, or was written by
+# another Python version, we fall back to importing the .py source.
+#
+# Build it with :
+#   python -m txt2ipa.kannada2ipa.maptable
+#
+
+import hashlib
+import marshal
+import mmap
+import os
+import sys
+
+from .orddic import OrderedDict
+
+__all__ = ['ARTIFACT_PATH', 'SOURCE_PATH', 'build_artifact', 'load_tables']
+
+_here = os.path.dirname(os.path.abspath(__file__))
+SOURCE_PATH = os.path.join(_here, 'kannada2ipaMap.py')
+# KAN2IPA_ARTIFACT can point somewhere else, e.g. a read-only volume, or at
+# a missing file to force the .py source path.
+ARTIFACT_PATH = os.environ.get('KAN2IPA_ARTIFACT',
+                               os.path.join(_here, 'kannada2ipaMap.bin'))
+
+# The magic carries the marshal format and Python version, since marshal
+# output is only guaranteed to load on the interpreter that wrote it.
+_MAGIC = b'K2I' + bytes([marshal.version, sys.version_info[0],
+                         sys.version_info[1]]) + b'\r\n'
+_HEADER = len(_MAGIC) + 32
+
+
+def _source_digest(path=SOURCE_PATH):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+# end of def _source_digest(path=SOURCE_PATH):
+
+
+def _tables_from_source():
+    # imported here so that the artifact path never executes the big literal
+    from .kannada2ipaMap import kan2ipa
+    from .ipaconvert import CharmapMatcher, reverse_charmap
+    return kan2ipa, CharmapMatcher(kan2ipa).table, reverse_charmap(kan2ipa)
+# end of def _tables_from_source():
+
+
+def build_artifact(path=ARTIFACT_PATH):
+    '''
+    Serialize kan2ipa, its compiled matcher table and reverse index to path.
+    Returns the number of bytes written.
+    '''
+    kan2ipa, table, reverse = _tables_from_source()
+    payload = marshal.dumps((tuple(kan2ipa.keys()), tuple(kan2ipa.values()),
+                             table, reverse))
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(_source_digest())
+        f.write(payload)
+    os.replace(tmp, path)   # readers never see a half written file
+    return _HEADER + len(payload)
+# end of def build_artifact(path=ARTIFACT_PATH):
+
+
+def _load_artifact(path):
+    try:
+        f = open(path, 'rb')
+    except (IOError, OSError):
+        return None
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return None    # empty file
+        try:
+            if (mm[:len(_MAGIC)] != _MAGIC or
+                    mm[len(_MAGIC):_HEADER] != _source_digest()):
+                return None    # other interpreter, or stale
+            view = memoryview(mm)
+            try:
+                keys, values, table, reverse = marshal.loads(view[_HEADER:])
+            finally:
+                view.release()
+        except (EOFError, ValueError, TypeError):
+            return None    # truncated or corrupt
+        finally:
+            mm.close()
+    # end of with f:
+    return OrderedDict(zip(keys, values)), table, reverse
+# end of def _load_artifact(path):
+
+
+def load_tables(path=ARTIFACT_PATH):
+    '''
+    Returns (kan2ipa, matcher table, reverse index), from the binary
+    artifact when it is present and fresh, else from kannada2ipaMap.py.
+    '''
+    tables = _load_artifact(path)
+    if tables is None:
+        tables = _tables_from_source()
+    return tables
+# end of def load_tables(path=ARTIFACT_PATH):
+
+
+if __name__ == '__main__':
+    size = build_artifact()
+    print("wrote %s (%d bytes)" % (ARTIFACT_PATH, size))
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Rule based (generative) form of kannada2ipaMap.
+#
+# The 17,899 entries of kannada2ipaMap.py are, apart from 15 independent
+# vowel entries, the product of three small tables :
+#
+#   consonant (34)  x  [virama + consonant (34)]  x  vowel sign (15)
+#
+# in a fixed nesting order, with
+#
+#   ipa(C1 + virama + C2 + sign) = coda(C1) + onset(C2) + vowel(sign)
+#   ipa(C1 + sign)               = onset(C1) + vowel(sign)
+#   ipa(C1 + virama)             = coda(C1)
+#
+# so both the ipa value and the position (rank) of any key in the map can
+# be computed from these tables instead of being stored. RuleMatcher plugs
+# that into the CharmapMatcher single pass conversion; rule_reverse does
+# the ipa -> Kannada direction. Anything that does not follow the rules
+# belongs in EXCEPTIONS.
+#
+
+from .orddic import OrderedDict
+
+__all__ = ['CONSONANTS', 'VOWEL_SIGNS', 'INDEPENDENT_VOWELS', 'EXCEPTIONS',
+           'iter_kan2ipa', 'build_kan2ipa', 'rule_lookup', 'rule_reverse']
+
+VIRAMA = '್'   # U+0CCD
+
+# Consonants in map order. coda is the ipa with virama (no vowel),
+# onset is the ipa before a vowel sign; they only differ for ಙ.
+CONSONANTS = [
+    # (consonant, coda)
+    ('ಳ', 'ɭ'), ('ಹ', 'ɦ'), ('ಸ', 's'), ('ಷ', 'ʂ'), ('ಶ', 'ʃ'),
+    ('ವ', 'ʋ'), ('ಲ', 'l'), ('ರ', 'ɾ'), ('ಯ', 'j'), ('ಮ', 'm'),
+    ('ಭ', 'bʰ'), ('ಬ', 'b'), ('ಫ', 'pʰ'), ('ಪ', 'p'), ('ನ', 'n'),
+    ('ಧ', 'd̪ʰ'), ('ದ', 'd̪'), ('ಥ', 't̪ʰ'), ('ತ', 't̪'), ('ಣ', 'ɳ'),
+    ('ಢ', 'ɖʰ'), ('ಡ', 'ɖ'), ('ಠ', 'ʈʰ'), ('ಟ', 'ʈ'), ('ಞ', 'ɲ'),
+    ('ಝ', 'dʒʰ'), ('ಜ', 'dʒ'), ('ಛ', 'tʃʰ'), ('ಚ', 'tʃ'), ('ಙ', 'ŋ'),
+    ('ಘ', 'gʰ'), ('ಗ', 'g'), ('ಖ', 'kʰ'), ('ಕ', 'k'),
+]
+ONSET_EXCEPTIONS = {'ಙ': 'ŋk'}
+
+# Vowel signs (plus visarga / anusvara / inherent vowel) in map order
+VOWEL_SIGNS = [
+    ('ಃ', 'əɦə'), ('ಂ', 'əm'), ('ೌ', 'əʋ'), ('ೋ', 'o:'), ('ೊ', 'o'),
+    ('ೈ', 'aj'), ('ೇ', 'e:'), ('ೆ', 'e'), ('ೃ', 'ɻ̩'), ('ೂ', 'u:'),
+    ('ು', 'ʊ'), ('ೀ', 'i:'), ('ಿ', 'i'), ('ಾ', 'a:'), ('', 'ʌ'),
+]
+
+# Independent vowels, after all consonant entries, with the vowel sign
+# whose sound they carry
+INDEPENDENT_VOWELS = [
+    ('ಅಃ', 'ಃ'), ('ಅಂ', 'ಂ'), ('ಔ', 'ೌ'), ('ಓ', 'ೋ'), ('ಒ', 'ೊ'),
+    ('ಐ', 'ೈ'), ('ಏ', 'ೇ'), ('ಎ', 'ೆ'), ('ಋ', 'ೃ'), ('ಊ', 'ೂ'),
+    ('ಉ', 'ು'), ('ಈ', 'ೀ'), ('ಇ', 'ಿ'), ('ಆ', 'ಾ'), ('ಅ', ''),
+]
+
+# Explicit key -> ipa overrides for entries the rules get wrong. The key
+# keeps its rule position in the map order. Currently none are needed.
+EXCEPTIONS = {}
+
+_NCONS = len(CONSONANTS)
+_NSIGN = len(VOWEL_SIGNS)
+# per first consonant : C1್C2<sign> block, C1<sign> block, C1್
+_BLOCK = _NCONS * _NSIGN + _NSIGN + 1
+_VOWEL_BASE = _NCONS * _BLOCK
+
+_cons_index = dict((c, i) for i, (c, coda) in enumerate(CONSONANTS))
+_coda = [coda for c, coda in CONSONANTS]
+_onset = [ONSET_EXCEPTIONS.get(c, coda) for c, coda in CONSONANTS]
+_sign_index = dict((s, i) for i, (s, ipa) in enumerate(VOWEL_SIGNS))
+_vowel = [ipa for s, ipa in VOWEL_SIGNS]
+_independent = dict((key, (_VOWEL_BASE + i, _vowel[_sign_index[sign]]))
+                    for i, (key, sign) in enumerate(INDEPENDENT_VOWELS))
+
+SIZE = _VOWEL_BASE + len(INDEPENDENT_VOWELS)
+MAX_KEY_LENGTH = 4
+
+
+def _rule(key):
+    # (rank, ipa) from the rules alone, or None if key is not a map key
+    i1 = _cons_index.get(key[0])
+    if i1 is None:
+        return _independent.get(key)
+    if len(key) == 1:
+        return (i1 * _BLOCK + _NCONS * _NSIGN + _NSIGN - 1, _onset[i1] + 'ʌ')
+    if key[1] == VIRAMA:
+        if len(key) == 2:
+            return (i1 * _BLOCK + _BLOCK - 1, _coda[i1])
+        i2 = _cons_index.get(key[2])
+        si = _sign_index.get(key[3:])
+        if i2 is None or si is None:
+            return None
+        return (i1 * _BLOCK + i2 * _NSIGN + si,
+                _coda[i1] + _onset[i2] + _vowel[si])
+    si = _sign_index.get(key[1:])
+    if si is None or si == _NSIGN - 1:
+        return None
+    return (i1 * _BLOCK + _NCONS * _NSIGN + si, _onset[i1] + _vowel[si])
+# end of def _rule(key):
+
+
+def rule_lookup(key):
+    '''
+    Returns (rank, ipa) of key in kannada2ipaMap order, or None when key
+    is not in the map. Same contract as CharmapMatcher.table.get.
+    '''
+    hit = _rule(key)
+    if hit is not None and key in EXCEPTIONS:
+        return (hit[0], EXCEPTIONS[key])
+    return hit
+# end of def rule_lookup(key):
+
+
+def iter_kan2ipa():
+    '''Yields every (key, ipa) pair in kannada2ipaMap order.'''
+    for c1, coda1 in CONSONANTS:
+        for c2, coda2 in CONSONANTS:
+            for sign, vowel in VOWEL_SIGNS:
+                key = c1 + VIRAMA + c2 + sign
+                yield key, rule_lookup(key)[1]
+        for sign, vowel in VOWEL_SIGNS:
+            key = c1 + sign
+            yield key, rule_lookup(key)[1]
+        yield c1 + VIRAMA, rule_lookup(c1 + VIRAMA)[1]
+    # end of for c1, coda1 in CONSONANTS:
+    for key, sign in INDEPENDENT_VOWELS:
+        yield key, rule_lookup(key)[1]
+# end of def iter_kan2ipa():
+
+
+def build_kan2ipa():
+    '''The full kan2ipa OrderedDict, generated from the rules.'''
+    return OrderedDict(iter_kan2ipa())
+
+
+# ipa -> indices, for the reverse direction
+def _group(values):
+    groups = {}
+    for i, val in enumerate(values):
+        groups.setdefault(val, []).append(i)
+    return groups
+
+_coda_rev = _group(_coda)
+_onset_rev = _group(_onset)
+_vowel_rev = dict((ipa, i) for i, ipa in enumerate(_vowel))
+_coda_lengths = sorted(set(len(v) for v in _coda))
+_onset_lengths = sorted(set(len(v) for v in _onset))
+
+
+def _rule_parses(ipa):
+    # every (rank, key) whose rule ipa equals ipa
+    if ipa in _vowel_rev:
+        sign = VOWEL_SIGNS[_vowel_rev[ipa]][0]
+        for key, ksign in INDEPENDENT_VOWELS:
+            if ksign == sign:
+                yield _independent[key][0], key
+    for n1 in _onset_lengths:
+        si = _vowel_rev.get(ipa[n1:])
+        if si is None:
+            continue
+        for i1 in _onset_rev.get(ipa[:n1], ()):
+            key = CONSONANTS[i1][0] + VOWEL_SIGNS[si][0]
+            yield _rule(key)[0], key
+    for i1 in _coda_rev.get(ipa, ()):
+        yield i1 * _BLOCK + _BLOCK - 1, CONSONANTS[i1][0] + VIRAMA
+    for n1 in _coda_lengths:
+        head = _coda_rev.get(ipa[:n1])
+        if not head:
+            continue
+        rest = ipa[n1:]
+        for n2 in _onset_lengths:
+            si = _vowel_rev.get(rest[n2:])
+            if si is None:
+                continue
+            for i2 in _onset_rev.get(rest[:n2], ()):
+                for i1 in head:
+                    yield (i1 * _BLOCK + i2 * _NSIGN + si,
+                           CONSONANTS[i1][0] + VIRAMA + CONSONANTS[i2][0] +
+                           VOWEL_SIGNS[si][0])
+    # end of for n1 in _coda_lengths:
+# end of def _rule_parses(ipa):
+
+
+def rule_reverse(ipa):
+    '''
+    Kannada key for an ipa value, or None. Like a reverse scan of the map,
+    the first matching key in map order wins.
+    '''
+    best = None
+    for rank, key in _rule_parses(ipa):
+        if key not in EXCEPTIONS and (best is None or rank < best[0]):
+            best = (rank, key)
+    for key, val in EXCEPTIONS.items():
+        rank = _rule(key)[0]
+        if val == ipa and (best is None or rank < best[0]):
+            best = (rank, key)
+    return best[1] if best is not None else None
+# end of def rule_reverse(ipa):
@@ -0,0 +1,84 @@
+"""
+Frame-level acoustic features computed once per recording.
+
+The Praat passes (pitch, intensity) run once on the shared AudioBuffer
+and their tracks are kept as NumPy arrays in an AcousticFeatures bundle.
+Every scorer (speech gate, distortion, ...) reads from the bundle instead
+of re-running Praat. New features belong here, next to the existing ones.
+
+Two backends fill the bundle, chosen with ACOUSTICS_BACKEND:
+    praat  parselmouth's Sound.to_pitch() / to_intensity() (default)
+    numpy  utils/numpy_acoustics.py, the same analyses on the raw samples
+           with no parselmouth.Sound, no Praat objects and no copies
+"""
+
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+from utils.audio import AudioBuffer
+
+
+class AcousticFeatures(NamedTuple):
+    duration: float               # seconds
+    pitch: np.ndarray             # F0 in Hz per frame, 0 where unvoiced
+    pitch_times: np.ndarray       # frame centre times (s) of `pitch`
+    intensity: np.ndarray         # dB per frame
+    intensity_times: np.ndarray   # frame centre times (s) of `intensity`
+
+    @property
+    def mean_pitch(self):
+        # unvoiced frames count as 0 Hz, as in the original pitch.mean()
+        return float(self.pitch.mean()) if self.pitch.size else 0.0
+
+    @property
+    def mean_intensity(self):
+        return float(self.intensity.mean()) if self.intensity.size else 0.0
+
+    @property
+    def sd_intensity(self):
+        return float(self.intensity.std()) if self.intensity.size else 0.0
+
+
+def _praat_features(audio):
+    sound = audio.to_sound()
+    pitch = sound.to_pitch()
+    intensity = sound.to_intensity()
+    return AcousticFeatures(
+        duration=float(audio.duration),
+        pitch=np.asarray(pitch.selected_array["frequency"], dtype=np.float64),
+        pitch_times=np.asarray(pitch.xs()),
+        intensity=np.asarray(intensity.values, dtype=np.float64).ravel(),
+        intensity_times=np.asarray(intensity.xs()),
+    )
+
+
+def _numpy_features(audio):
+    from utils.numpy_acoustics import intensity_track, pitch_track
+
+    pitch, pitch_times = pitch_track(audio.samples, audio.sample_rate)
+    intensity, intensity_times = intensity_track(audio.samples, audio.sample_rate)
+    return AcousticFeatures(
+        duration=float(audio.duration),
+        pitch=pitch,
+        pitch_times=pitch_times,
+        intensity=intensity,
+        intensity_times=intensity_times,
+    )
+
+
+BACKENDS = {"praat": _praat_features, "numpy": _numpy_features}
+ACOUSTICS_BACKEND = os.environ.get("ACOUSTICS_BACKEND", "praat").lower()
+if ACOUSTICS_BACKEND not in BACKENDS:
+    raise ValueError(f"ACOUSTICS_BACKEND must be one of {sorted(BACKENDS)}, got {ACOUSTICS_BACKEND!r}")
+
+
+def extract_features(audio, backend=None):
+    """
+    AcousticFeatures for an AudioBuffer (or a file path, decoded here),
+    from `backend` ("praat" / "numpy", default ACOUSTICS_BACKEND).
+    """
+    if not isinstance(audio, AudioBuffer):
+        audio = AudioBuffer.from_file(audio)
+    return BACKENDS[backend or ACOUSTICS_BACKEND](audio)
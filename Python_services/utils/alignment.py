@@ -1,3 +1,514 @@
+"""
+Minimum-cost (edit distance) alignment of target and spoken sequences.
+
+edit_ops() aligns two sequences (IPA strings, syllable lists or interned
+syllable ID arrays) and returns one op code per aligned position:
+
+    CORRECT       target and spoken unit match
+    SUBSTITUTION  target unit replaced by a different spoken unit
+    OMISSION      target unit missing from the spoken sequence
+    ADDITION      extra spoken unit
+
+The DP runs one NumPy vector update per target unit. Along a row, the
+addition dependency is a running minimum (np.minimum.accumulate). Of the
+alignments with minimal cost, the one that matches units as early as
+possible is returned, so gaps land at the end like the old index-wise loop
+put them.
+
+Substitutions cost sub_cost by default. Passing sub_costs, the phonetic
+cost matrix from utils/phonetic_costs.py, aligns two IPA strings phoneme
+by phoneme and makes near misses cheaper than unrelated substitutions, at
+one row lookup per target phoneme; align_ipa() and phonetic_distance()
+wrap that.
+
+Long sequences (sentences, story retells) do not need the whole table.
+edit_ops picks a mode from the lengths and the expected error rate:
+the full table for words, a band around the diagonal (Ukkonen, widened
+until the result is provably optimal) when the errors fit in a narrow
+band, and Hirschberg's linear-memory divide and conquer otherwise. All
+modes return a minimum-cost alignment in the same format.
+
+align_batch() runs the same DP for many pairs at once, one NumPy update
+per target row across each chunk of the batch; chunks are capped by DP
+cells, and pairs too long for the full table go through edit_ops.
+
+align_phonemes_string / align_phonemes_list keep their JSON shape on top
+of it.
+"""
+
+import os
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from utils.phonetic_costs import UNKNOWN, get_cost_matrix, phoneme_ids, phonemes
+
+CORRECT, SUBSTITUTION, OMISSION, ADDITION = 0, 1, 2, 3
+OP_NAMES = ("Correct", "Substitution", "Omission", "Addition")
+_SUMMARY_KEYS = ("Correct", "S", "O", "A")
+
+# traceback moves
+_DIAG, _UP, _LEFT = 0, 1, 2
+
+# DP cells (pairs x rows x cols) per tensor in align_batch; the traceback
+# alone is one byte per cell and each row step adds a few float64 rows
+ALIGN_BATCH_MAX_CELLS = int(os.environ.get("ALIGN_BATCH_MAX_CELLS", 1 << 22))
+
+# edit_ops mode selection (see choose_mode): tables up to this many cells
+# use the full DP, longer sequences a band sized for this share of errors
+ALIGN_FULL_MAX_CELLS = int(os.environ.get("ALIGN_FULL_MAX_CELLS", 1 << 16))
+ALIGN_ERROR_RATE = float(os.environ.get("ALIGN_ERROR_RATE", 0.15))
+# Hirschberg stops splitting below this many cells
+HIRSCHBERG_BASE_CELLS = 1 << 12
+
+
+class Alignment(NamedTuple):
+    ops: np.ndarray   # uint8 op code per aligned position
+    distance: float   # total cost of the alignment
+
+
+def _codes(target, spoken):
+    """Both sequences as integer NumPy arrays with a shared coding."""
+    if isinstance(target, str) and isinstance(spoken, str):
+        return (np.frombuffer(target.encode("utf-32-le"), dtype=np.uint32),
+                np.frombuffer(spoken.encode("utf-32-le"), dtype=np.uint32))
+    if isinstance(target, np.ndarray) and isinstance(spoken, np.ndarray):
+        return target.astype(np.int64, copy=False), spoken.astype(np.int64, copy=False)
+    try:
+        # array('H') / integer arrays already are codes
+        t = np.frombuffer(target, dtype=np.uint16) if target.typecode == "H" else None
+        s = np.frombuffer(spoken, dtype=np.uint16) if spoken.typecode == "H" else None
+        if t is not None and s is not None:
+            return t, s
+    except AttributeError:
+        pass
+    ids = {}
+    t = np.fromiter((ids.setdefault(x, len(ids)) for x in target), dtype=np.int64, count=len(target))
+    s = np.fromiter((ids.setdefault(x, len(ids)) for x in spoken), dtype=np.int64, count=len(spoken))
+    return t, s
+
+
+def _cost_codes(target, spoken, sub_costs):
+    """
+    Phoneme IDs of two IPA strings for an alignment with `sub_costs`.
+
+    The matrix is indexed by utils.phonetic_costs phoneme IDs, so only
+    IPA strings are accepted: other codes (e.g. interned syllable IDs)
+    would silently land in the UNKNOWN row and get meaningless costs.
+    """
+    if np.shape(sub_costs) != (UNKNOWN + 1, UNKNOWN + 1):
+        raise ValueError(f"sub_costs must be the {UNKNOWN + 1} x {UNKNOWN + 1} phonetic cost matrix")
+    if not (isinstance(target, str) and isinstance(spoken, str)):
+        raise TypeError("alignments with sub_costs take IPA strings, got "
+                        f"{type(target).__name__} / {type(spoken).__name__}")
+    return phoneme_ids(target), phoneme_ids(spoken)
+
+
+class _Costs(NamedTuple):
+    sub: float
+    omit: float
+    add: float
+    matrix: Optional[np.ndarray]
+
+    def rows(self, s):
+        """
+        Row / column index into matrix for every code of s. Codes past
+        UNKNOWN are characters outside the inventory (see phoneme_ids)
+        and use the UNKNOWN row.
+        """
+        return None if self.matrix is None else np.minimum(s, len(self.matrix) - 1)
+
+    def substitution(self, code, s, s_rows):
+        """Cost of substituting `code` by each unit of s (0 where equal)."""
+        if self.matrix is None:
+            sub = self.sub
+        else:
+            sub = self.matrix[min(code, len(self.matrix) - 1)][s_rows]
+        return np.where(s == code, 0.0, sub)
+
+
+def _full_ops(t, s, costs):
+    """Full (n + 1) x (m + 1) DP with traceback."""
+    n, m = len(t), len(s)
+
+    # The DP runs on the reversed sequences, so the traceback (which walks
+    # from the far corner back) visits the original sequences front to back
+    # and, preferring the diagonal on ties, matches units as early as possible.
+    t = t[::-1]
+    s = s[::-1]
+    s_rows = costs.rows(s)
+
+    add_ramp = np.arange(m + 1) * costs.add
+    prev = add_ramp.copy()
+    back = np.empty((n + 1, m + 1), dtype=np.uint8)
+    back[0] = _LEFT
+    for i in range(1, n + 1):
+        diag = prev[:-1] + costs.substitution(t[i - 1], s, s_rows)
+        up = prev[1:] + costs.omit
+        best = np.empty(m + 1)
+        best[0] = prev[0] + costs.omit
+        np.minimum(diag, up, out=best[1:])
+        move = np.empty(m + 1, dtype=np.uint8)
+        move[0] = _UP
+        move[1:] = np.where(diag <= up, _DIAG, _UP)
+
+        # row[j] = min(best[j], row[j - 1] + add_cost) as a running minimum
+        shifted = best - add_ramp
+        running = np.minimum.accumulate(shifted)
+        move[running < shifted] = _LEFT
+        back[i] = move
+        prev = running + add_ramp
+
+    ops = np.empty(n + m, dtype=np.uint8)
+    k = 0
+    i, j = n, m
+    while i or j:
+        move = back[i, j]
+        if move == _DIAG:
+            i -= 1
+            j -= 1
+            ops[k] = CORRECT if t[i] == s[j] else SUBSTITUTION
+        elif move == _UP:
+            i -= 1
+            ops[k] = OMISSION
+        else:
+            j -= 1
+            ops[k] = ADDITION
+        k += 1
+    return Alignment(ops[:k], float(prev[m]))
+
+
+def _banded_ops(t, s, costs, band):
+    """
+    DP restricted to the diagonals within `band` of the main one (and of
+    the corner when the lengths differ); None when the best path found
+    might leave the band, i.e. cost above band * cheapest gap.
+    """
+    n, m = len(t), len(s)
+    t = t[::-1]
+    s = s[::-1]
+    s_rows = costs.rows(s)
+
+    # cell (i, j) lives at offset d = j - i - lo of a row of width w
+    lo = min(0, m - n) - band
+    hi = max(0, m - n) + band
+    w = hi - lo + 1
+    offsets = np.arange(w)
+    add_ramp = offsets * costs.add
+
+    # s padded with a never-matching code on both sides, so every row reads
+    # one contiguous slice; padding cells are masked to inf below
+    s_pad = np.full(m + 2 * w, -1, dtype=np.int64)
+    s_pad[w:w + m] = s
+    rows_pad = None if s_rows is None else np.clip(s_pad, 0, None)
+
+    j = lo + offsets
+    prev = np.where((j >= 0) & (j <= m), j * costs.add, np.inf)
+    back = np.empty((n + 1, w), dtype=np.uint8)
+    back[0] = _LEFT
+    up = np.empty(w)
+    up[-1] = np.inf
+    for i in range(1, n + 1):
+        j = i + lo + offsets
+        outside = (j < 0) | (j > m)
+        start = w + i + lo - 1
+        s_row = s_pad[start:start + w]
+        diag = prev + costs.substitution(
+            t[i - 1], s_row, None if rows_pad is None else rows_pad[start:start + w]
+        )
+        up[:-1] = prev[1:] + costs.omit
+        best = np.minimum(diag, up)
+        best[outside] = np.inf
+        move = np.where(diag <= up, _DIAG, _UP).astype(np.uint8)
+
+        shifted = best - add_ramp
+        running = np.minimum.accumulate(shifted)
+        move[running < shifted] = _LEFT
+        back[i] = move
+        prev = running + add_ramp
+        prev[outside] = np.inf
+
+    distance = float(prev[m - n - lo])
+    if distance > band * min(costs.omit, costs.add):
+        return None
+
+    ops = np.empty(n + m, dtype=np.uint8)
+    k = 0
+    i, j, d = n, m, m - n - lo
+    while i or j:
+        move = back[i, d]
+        if move == _DIAG:
+            i -= 1
+            j -= 1
+            ops[k] = CORRECT if t[i] == s[j] else SUBSTITUTION
+        elif move == _UP:
+            i -= 1
+            d += 1
+            ops[k] = OMISSION
+        else:
+            j -= 1
+            d -= 1
+            ops[k] = ADDITION
+        k += 1
+    return Alignment(ops[:k], distance)
+
+
+def _last_row(t, s, costs):
+    """Costs of aligning all of t against every prefix of s, in O(m) memory."""
+    s_rows = costs.rows(s)
+    add_ramp = np.arange(len(s) + 1) * costs.add
+    row = add_ramp.copy()
+    for code in t:
+        best = np.empty(len(s) + 1)
+        best[0] = row[0] + costs.omit
+        np.minimum(row[:-1] + costs.substitution(code, s, s_rows), row[1:] + costs.omit, out=best[1:])
+        row = np.minimum.accumulate(best - add_ramp) + add_ramp
+    return row
+
+
+def _hirschberg_ops(t, s, costs):
+    """Hirschberg divide and conquer: optimal alignment in linear memory."""
+    n, m = len(t), len(s)
+    if n <= 1 or n * m <= HIRSCHBERG_BASE_CELLS:
+        return _full_ops(t, s, costs)
+    mid = n // 2
+    forward = _last_row(t[:mid], s, costs)
+    backward = _last_row(t[mid:][::-1], s[::-1], costs)[::-1]
+    split = int(np.argmin(forward + backward))
+    head = _hirschberg_ops(t[:mid], s[:split], costs)
+    tail = _hirschberg_ops(t[mid:], s[split:], costs)
+    return Alignment(np.concatenate([head.ops, tail.ops]), head.distance + tail.distance)
+
+
+def _expected_band(n, m, error_rate):
+    return max(1, int(np.ceil(error_rate * max(n, m))))
+
+
+def _band_is_narrow(n, m, band):
+    # the banded table is worth it while it covers at most half of each row
+    return abs(n - m) + 2 * band + 1 <= (m + 1) // 2
+
+
+def choose_mode(n, m, error_rate=ALIGN_ERROR_RATE):
+    """
+    Alignment mode for sequences of length n and m:
+
+        full        small tables (n * m <= ALIGN_FULL_MAX_CELLS)
+        banded      the band the expected errors need is narrow
+        hirschberg  otherwise
+    """
+    if n * m <= ALIGN_FULL_MAX_CELLS:
+        return "full"
+    if _band_is_narrow(n, m, _expected_band(n, m, error_rate)):
+        return "banded"
+    return "hirschberg"
+
+
+def edit_ops(target, spoken, sub_cost=1.0, omit_cost=1.0, add_cost=1.0, sub_costs=None,
+             mode="auto", error_rate=ALIGN_ERROR_RATE):
+    """
+    Minimum-cost alignment of `target` against `spoken`.
+
+    `sub_costs` is the optional phonetic cost matrix (get_cost_matrix());
+    with it, `target` and `spoken` must be IPA strings and are aligned
+    phoneme by phoneme. Equal units always cost 0.
+
+    `mode` is "full", "banded", "hirschberg" or "auto" (choose_mode, from
+    the lengths and `error_rate`, the expected share of errors). Every mode
+    returns a minimum-cost alignment; banded starts from the band the
+    expected errors need and doubles it until the result is provably
+    optimal, falling back to hirschberg once the band covers half the
+    table.
+
+    Returns an Alignment with the op code array and the total cost.
+    """
+    t, s = _codes(target, spoken) if sub_costs is None else _cost_codes(target, spoken, sub_costs)
+    costs = _Costs(sub_cost, omit_cost, add_cost, sub_costs)
+    n, m = len(t), len(s)
+    if mode == "auto":
+        mode = choose_mode(n, m, error_rate)
+
+    if mode == "full":
+        return _full_ops(t, s, costs)
+    if mode == "banded":
+        band = _expected_band(n, m, error_rate)
+        while True:
+            alignment = _banded_ops(t, s, costs, band)
+            if alignment is not None:
+                return alignment
+            band *= 2
+            if not _band_is_narrow(n, m, band):
+                return _hirschberg_ops(t, s, costs)
+    if mode == "hirschberg":
+        return _hirschberg_ops(t, s, costs)
+    raise ValueError(f"Unknown alignment mode '{mode}'")
+
+
+def _align_chunk(codes, sub_cost, omit_cost, add_cost, sub_costs):
+    """edit_ops for every (t, s) code pair at once, as a (pairs, rows, cols) DP."""
+    count = len(codes)
+    n = np.array([len(t) for t, _ in codes])
+    m = np.array([len(s) for _, s in codes])
+    width_n, width_m = int(n.max()), int(m.max())
+    pairs = np.arange(count)
+
+    # Reversed sequences (see edit_ops), left aligned and padded with codes
+    # that never match. One spare column keeps the traceback indexable.
+    t_codes = np.full((count, width_n + 1), -1, dtype=np.int64)
+    s_codes = np.full((count, width_m + 1), -2, dtype=np.int64)
+    for b, (t, s) in enumerate(codes):
+        t_codes[b, :len(t)] = t[::-1]
+        s_codes[b, :len(s)] = s[::-1]
+    s_cols = s_codes[:, :width_m]
+    if sub_costs is not None:
+        last = len(sub_costs) - 1
+        t_rows = np.clip(t_codes, 0, last)
+        s_rows = np.clip(s_cols, 0, last)
+
+    add_ramp = np.arange(width_m + 1) * add_cost
+    prev = np.broadcast_to(add_ramp, (count, width_m + 1)).copy()
+    back = np.empty((count, width_n + 1, width_m + 1), dtype=np.uint8)
+    back[:, 0] = _LEFT
+    distance = np.empty(count)
+    ends = n == 0
+    distance[ends] = prev[ends, m[ends]]
+    for i in range(1, width_n + 1):
+        if sub_costs is None:
+            sub = sub_cost
+        else:
+            sub = sub_costs[t_rows[:, i - 1, np.newaxis], s_rows]
+        diag = prev[:, :-1] + np.where(s_cols == t_codes[:, i - 1, np.newaxis], 0.0, sub)
+        up = prev[:, 1:] + omit_cost
+        best = np.empty((count, width_m + 1))
+        best[:, 0] = prev[:, 0] + omit_cost
+        np.minimum(diag, up, out=best[:, 1:])
+        move = np.empty((count, width_m + 1), dtype=np.uint8)
+        move[:, 0] = _UP
+        move[:, 1:] = np.where(diag <= up, _DIAG, _UP)
+
+        shifted = best - add_ramp
+        running = np.minimum.accumulate(shifted, axis=1)
+        move[running < shifted] = _LEFT
+        back[:, i] = move
+        prev = running + add_ramp
+        ends = n == i
+        distance[ends] = prev[ends, m[ends]]
+
+    # Traceback of every pair in lock step
+    ops = np.zeros((count, width_n + width_m), dtype=np.uint8)
+    steps = np.zeros(count, dtype=np.intp)
+    i, j = n.copy(), m.copy()
+    for k in range(width_n + width_m):
+        active = (i > 0) | (j > 0)
+        if not active.any():
+            break
+        b, ib, jb = pairs[active], i[active], j[active]
+        move = back[b, ib, jb]
+        ib = ib - (move != _LEFT)
+        jb = jb - (move != _UP)
+        same = t_codes[b, ib] == s_codes[b, jb]
+        ops[b, k] = np.where(move == _DIAG, np.where(same, CORRECT, SUBSTITUTION),
+                             np.where(move == _UP, OMISSION, ADDITION))
+        i[active], j[active] = ib, jb
+        steps[active] += 1
+
+    used = np.arange(ops.shape[1]) < steps[:, np.newaxis]
+    counts = np.stack([((ops == op) & used).sum(axis=1) for op in range(4)], axis=1)
+    alignments = [Alignment(ops[b, :steps[b]].copy(), float(distance[b])) for b in range(count)]
+    return alignments, counts
+
+
+def align_batch(pairs, sub_cost=1.0, omit_cost=1.0, add_cost=1.0, sub_costs=None,
+                max_cells=ALIGN_BATCH_MAX_CELLS):
+    """
+    edit_ops for many (target, spoken) pairs in one vectorised DP.
+
+    Pairs are sorted by length and aligned in padded (pairs, target, spoken)
+    tensors of at most `max_cells` cells, so short words are not padded to
+    the longest sequence of the whole batch and memory stays bounded however
+    long the pairs are. Pairs too long for the full DP (choose_mode) go to
+    edit_ops one at a time. Results are identical to calling edit_ops on
+    each pair (with sub_costs, pairs are IPA strings).
+
+    Returns (alignments, summaries): per pair, in input order, an Alignment
+    and its {"S", "O", "D", "A", "Correct"} summary.
+    """
+    encode = _codes if sub_costs is None else (lambda t, s: _cost_codes(t, s, sub_costs))
+    codes = [encode(target, spoken) for target, spoken in pairs]
+    alignments = [None] * len(codes)
+    summaries = [None] * len(codes)
+
+    batched = []
+    for k, (t, s) in enumerate(codes):
+        if choose_mode(len(t), len(s)) == "full":
+            batched.append(k)
+        else:
+            target, spoken = pairs[k]
+            alignments[k] = edit_ops(target, spoken, sub_cost, omit_cost, add_cost, sub_costs)
+            summaries[k] = summarize(alignments[k].ops)
+    batched.sort(key=lambda k: (len(codes[k][0]), len(codes[k][1])))
+
+    def flush(chunk):
+        chunk_alignments, counts = _align_chunk(
+            [codes[k] for k in chunk], sub_cost, omit_cost, add_cost, sub_costs
+        )
+        for k, alignment, row in zip(chunk, chunk_alignments, counts.tolist()):
+            alignments[k] = alignment
+            summaries[k] = _summary(row)
+
+    # grow each chunk while its padded table fits the cell budget
+    chunk, rows, cols = [], 0, 0
+    for k in batched:
+        n, m = len(codes[k][0]) + 1, len(codes[k][1]) + 1
+        grown_rows, grown_cols = max(rows, n), max(cols, m)
+        if chunk and (len(chunk) + 1) * grown_rows * grown_cols > max_cells:
+            flush(chunk)
+            chunk, grown_rows, grown_cols = [], n, m
+        chunk.append(k)
+        rows, cols = grown_rows, grown_cols
+    if chunk:
+        flush(chunk)
+    return alignments, summaries
+
+
+def op_indices(ops):
+    """
+    Target and spoken index for every op, -1 on the side that has a gap.
+    """
+    ops = np.asarray(ops)
+    uses_target = ops != ADDITION
+    uses_spoken = ops != OMISSION
+    ti = np.where(uses_target, np.cumsum(uses_target) - 1, -1)
+    si = np.where(uses_spoken, np.cumsum(uses_spoken) - 1, -1)
+    return ti, si
+
+
+def _summary(counts):
+    summary = {"S": 0, "O": 0, "D": 0, "A": 0, "Correct": 0}
+    for key, count in zip(_SUMMARY_KEYS, counts):
+        summary[key] = int(count)
+    return summary
+
+
+def summarize(ops):
+    """Op counts in the {"S", "O", "D", "A", "Correct"} summary shape."""
+    return _summary(np.bincount(np.asarray(ops, dtype=np.intp), minlength=4))
+
+
+def _to_result(target, spoken, alignment):
+    ops = alignment.ops
+    ti, si = op_indices(ops)
+    rows = [
+        {
+            "target": target[i] if i >= 0 else "",
+            "spoken": spoken[j] if j >= 0 else "",
+            "type": OP_NAMES[op],
+        }
+        for op, i, j in zip(ops.tolist(), ti.tolist(), si.tolist())
+    ]
+    return {"alignment": rows, "summary": summarize(ops)}
+
+
 def align_phonemes_string(target, spoken):
     """
     Compare phoneme lists and classify differences as:
@@ -6,36 +517,31 @@ def align_phonemes_string(target, spoken):
     D - Distortion (from pitch/energy)
     A - Addition
     """
-    alignment = []
-    i, j = 0, 0
-    while i < len(target) or j < len(spoken):
-        if i < len(target) and j < len(spoken):
-            if target[i] == spoken[j]:
-                alignment.append({"target": target[i], "spoken": spoken[j], "type": "Correct"})
-            else:
-                alignment.append({"target": target[i], "spoken": spoken[j], "type": "Substitution"})
-            i += 1
-            j += 1
-        elif i < len(target):
-            alignment.append({"target": target[i], "spoken": "", "type": "Omission"})
-            i += 1
-        elif j < len(spoken):
-            alignment.append({"target": "", "spoken": spoken[j], "type": "Addition"})
-            j += 1
-
-    # Count summary
-    summary = {"S": 0, "O": 0, "D": 0, "A": 0, "Correct": 0}
-    for a in alignment:
-        if a["type"] == "Substitution":
-            summary["S"] += 1
-        elif a["type"] == "Omission":
-            summary["O"] += 1
-        elif a["type"] == "Addition":
-            summary["A"] += 1
-        elif a["type"] == "Correct":
-            summary["Correct"] += 1
+    return _to_result(target, spoken, edit_ops(target, spoken))
 
-    return {"alignment": alignment, "summary": summary}
+
+def align_ipa(target, spoken):
+    """
+    Align two IPA strings phoneme by phoneme with phonetic-feature
+    substitution costs. Same result shape as align_phonemes_string, with
+    phonemes as units, plus the weighted "distance".
+    """
+    alignment = edit_ops(target, spoken, sub_costs=get_cost_matrix())
+    result = _to_result(phonemes(target), phonemes(spoken), alignment)
+    result["distance"] = alignment.distance
+    return result
+
+
+def phonetic_distance(target, spoken):
+    """
+    Phonetic-feature edit distance of two IPA strings: the summed cost of
+    the substituted phonemes plus 1 per phoneme added or left out. Matched
+    phonemes (the shared vowel of two syllables) add nothing, so one slip
+    costs what the cost matrix gives it: 0.15-0.3 for near misses (ʈ for
+    t̪, e for e:, voicing), 0.4 or more for a place or manner change, 1 for
+    unrelated sounds.
+    """
+    return float(edit_ops(target, spoken, sub_costs=get_cost_matrix()).distance)
 
 
 def align_phonemes_list(target_list, spoken_list):
@@ -46,63 +552,7 @@ def align_phonemes_list(target_list, spoken_list):
     - Omission
     - Addition
     """
-
-    alignment = []
-    i, j = 0, 0
-
-    # Loop until both lists are fully processed
-    while i < len(target_list) or j < len(spoken_list):
-
-        # Case 1: both present
-        if i < len(target_list) and j < len(spoken_list):
-            if target_list[i] == spoken_list[j]:
-                alignment.append({
-                    "target": target_list[i],
-                    "spoken": spoken_list[j],
-                    "type": "Correct"
-                })
-            else:
-                alignment.append({
-                    "target": target_list[i],
-                    "spoken": spoken_list[j],
-                    "type": "Substitution"
-                })
-            i += 1
-            j += 1
-
-        # Case 2: target has extra → Omission
-        elif i < len(target_list):
-            alignment.append({
-                "target": target_list[i],
-                "spoken": "",
-                "type": "Omission"
-            })
-            i += 1
-
-        # Case 3: spoken has extra → Addition
-        elif j < len(spoken_list):
-            alignment.append({
-                "target": "",
-                "spoken": spoken_list[j],
-                "type": "Addition"
-            })
-            j += 1
-
-    # Summary calculation
-    summary = {"S": 0, "O": 0, "D": 0, "A": 0, "Correct": 0}
-
-    for item in alignment:
-        t = item["type"]
-        if t == "Correct":
-            summary["Correct"] += 1
-        elif t == "Substitution":
-            summary["S"] += 1
-        elif t == "Omission":
-            summary["O"] += 1
-        elif t == "Addition":
-            summary["A"] += 1
-
-    return {"alignment": alignment, "summary": summary}
+    return _to_result(target_list, spoken_list, edit_ops(target_list, spoken_list))
 
 
 def extract_substitutions(target_list, spoken_list):
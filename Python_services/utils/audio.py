@@ -0,0 +1,251 @@
+"""
+In-memory audio shared by every SODA analysis stage.
+
+A recording is decoded once into an AudioBuffer, and pitch, intensity,
+distortion and speech recognition all read from that buffer instead of
+re-opening the file.
+
+Uploads are decoded straight from memory: PCM WAV is parsed in Python,
+anything else is piped through one ffmpeg process (stdin -> stdout), so
+nothing is written to the uploads folder.
+
+Before analysis every recording is brought to one canonical format: mono
+at ANALYSIS_SAMPLE_RATE. ffmpeg decodes non-WAV uploads straight to it;
+WAV is converted by to_analysis_format (polyphase resample). Praat and ASR
+cost then no longer depend on what the browser recorded; the upload's own
+format is kept as `source_format`.
+
+parselmouth is imported on first use so importing this module stays cheap.
+"""
+
+import os
+import re
+import struct
+import subprocess
+import tempfile
+from math import gcd
+from typing import NamedTuple
+
+import numpy as np
+
+# ffmpeg binary used for non-WAV uploads; app.py overrides it from FFMPEG_PATH
+FFMPEG_PATH = os.environ.get("FFMPEG_PATH", "ffmpeg")
+
+# Canonical analysis rate (Hz). 0 keeps the upload's own rate (still mono).
+ANALYSIS_SAMPLE_RATE = int(os.environ.get("ANALYSIS_SAMPLE_RATE", 16000))
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+_UNKNOWN_SIZE = (0, 0xFFFFFFFF)  # what ffmpeg writes when its output is a pipe
+
+# ffmpeg's description of the input, e.g. "Stream #0:0: Audio: opus, 48000 Hz, stereo, fltp"
+_INPUT_STREAM = re.compile(rb"Stream #\d+:\d+.*?: Audio: [^\n]*?, (\d+) Hz, ([^,\n]+)")
+_LAYOUT_CHANNELS = {b"mono": 1, b"stereo": 2, b"quad": 4}
+
+
+class AudioDecodeError(Exception):
+    """Raised when an upload cannot be decoded to PCM."""
+
+
+def parse_wav(data):
+    """
+    Parse integer PCM WAV bytes without touching the disk.
+
+    Returns (pcm, sample_rate, sample_width) with pcm as an int array of
+    shape (channels, frames), or None when `data` is not integer PCM WAV.
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        size = struct.unpack_from("<I", data, pos + 4)[0]
+        body = pos + 8
+
+        if chunk_id == b"fmt " and size >= 16:
+            tag, channels, rate = struct.unpack_from("<HHI", data, body)
+            bits = struct.unpack_from("<H", data, body + 14)[0]
+            if tag == _WAVE_FORMAT_EXTENSIBLE and size >= 26:
+                tag = struct.unpack_from("<H", data, body + 24)[0]
+            fmt = (tag, channels, rate, bits)
+
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            tag, channels, rate, bits = fmt
+            if tag != _WAVE_FORMAT_PCM or bits not in (8, 16, 24, 32) or channels < 1:
+                return None
+            end = len(data) if size in _UNKNOWN_SIZE else min(body + size, len(data))
+            width = bits // 8
+            frames = (end - body) // (width * channels)
+            raw = np.frombuffer(data, dtype=np.uint8, count=frames * width * channels, offset=body)
+
+            if width == 1:
+                pcm = raw.astype(np.int16) - 128          # 8-bit WAV is unsigned
+            elif width == 3:
+                b = raw.reshape(-1, 3).astype(np.int32)
+                pcm = (b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 8
+            else:
+                pcm = raw.view("<i%d" % width)
+            return pcm.reshape(frames, channels).T, rate, width
+
+        pos = body + size + (size & 1)
+
+    return None
+
+
+def _run_ffmpeg(source, data, sample_rate):
+    # info log level so stderr describes the input stream (see _input_format)
+    cmd = [FFMPEG_PATH, "-hide_banner", "-loglevel", "info",
+           "-i", source, "-vn", "-acodec", "pcm_s16le", "-ac", "1"]
+    if sample_rate:
+        cmd += ["-ar", str(sample_rate)]
+    cmd += ["-f", "wav", "pipe:1"]
+    return subprocess.run(cmd, input=data, capture_output=True)
+
+
+def _input_format(log):
+    """(sample rate, channels) of the first input audio stream in an ffmpeg log, or None."""
+    match = _INPUT_STREAM.search(log)
+    if match is None:
+        return None
+    layout = match.group(2).strip().split(b"(")[0]
+    channels = _LAYOUT_CHANNELS.get(layout)
+    if channels is None:
+        count = re.match(rb"(\d+) channels", layout) or re.match(rb"(\d+)\.(\d+)", layout)
+        channels = sum(int(n) for n in count.groups()) if count else None
+    return int(match.group(1)), channels
+
+
+def _ffmpeg_decode(data, sample_rate):
+    proc = _run_ffmpeg("pipe:0", data, sample_rate)
+    if proc.returncode != 0 or not proc.stdout:
+        # Containers with their index at the end (e.g. non-fragmented MP4)
+        # cannot be demuxed from a pipe. Retry from a seekable temp file
+        # that is removed even if decoding fails.
+        with tempfile.NamedTemporaryFile() as tmp:
+            tmp.write(data)
+            tmp.flush()
+            proc = _run_ffmpeg(tmp.name, None, sample_rate)
+    wav = parse_wav(proc.stdout) if proc.returncode == 0 else None
+    if wav is None:
+        lines = proc.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise AudioDecodeError(lines[-1] if lines else "ffmpeg produced no audio")
+    return wav, _input_format(proc.stderr)
+
+
+class SourceFormat(NamedTuple):
+    """Format of the recording as uploaded, before canonical ingest."""
+    sample_rate: int
+    channels: int
+    duration: float
+
+
+class AudioBuffer:
+    """
+    Decoded recording: float samples in [-1, 1] plus sample rate.
+
+    `samples` has shape (channels, frames), the layout parselmouth.Sound
+    takes directly. The parselmouth Sound is built on first use and then
+    reused, so every Praat analysis shares one object.
+
+    `source` is the SourceFormat a converted buffer came from (None for a
+    buffer that is still in its uploaded format).
+    """
+
+    def __init__(self, samples, sample_rate, source=None):
+        samples = np.asarray(samples, dtype=np.float64)
+        if samples.ndim == 1:
+            samples = samples[np.newaxis, :]
+        self.samples = samples
+        self.sample_rate = int(sample_rate)
+        self.source = source
+        self._sound = None
+
+    @classmethod
+    def from_pcm(cls, pcm, sample_rate, sample_width):
+        """Build a buffer from integer PCM of shape (channels, frames)."""
+        # Same scaling Praat uses when it reads integer PCM from a WAV file
+        full_scale = float(1 << (8 * sample_width - 1))
+        return cls(pcm / full_scale, sample_rate)
+
+    @classmethod
+    def from_bytes(cls, data, sample_rate=ANALYSIS_SAMPLE_RATE):
+        """
+        Decode an uploaded recording held in memory.
+
+        PCM WAV is parsed as is (to_analysis_format converts it later);
+        everything else goes through a single ffmpeg pipe that outputs
+        mono at `sample_rate` (0 / None keeps the upload's rate) directly,
+        with the upload's own format kept as `source`.
+        """
+        wav = parse_wav(data)
+        if wav is not None:
+            return cls.from_pcm(*wav)
+        (pcm, rate, width), source = _ffmpeg_decode(data, sample_rate)
+        audio = cls.from_pcm(pcm, rate, width)
+        if source is not None:
+            source_rate, source_channels = source
+            audio.source = SourceFormat(source_rate, source_channels or audio.channels, audio.duration)
+        return audio
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Decode any file ffmpeg understands."""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read(), **kwargs)
+
+    @property
+    def channels(self):
+        return self.samples.shape[0]
+
+    @property
+    def duration(self):
+        return self.samples.shape[1] / self.sample_rate
+
+    @property
+    def source_format(self):
+        """SourceFormat of the original upload."""
+        return self.source or SourceFormat(self.sample_rate, self.channels, self.duration)
+
+    def slice(self, start, end):
+        """New buffer with frames [start, end) (a view, no copy)."""
+        return AudioBuffer(self.samples[:, start:end], self.sample_rate, self.source)
+
+    def to_analysis_format(self, sample_rate=ANALYSIS_SAMPLE_RATE):
+        """
+        Mono buffer at `sample_rate` (0 / None keeps the current rate).
+
+        Channels are averaged, then resampled with scipy's polyphase
+        resample_poly (Kaiser windowed FIR, built-in anti-aliasing). A
+        buffer already in that format is returned as is.
+        """
+        rate = self.sample_rate
+        if self.channels == 1 and sample_rate in (None, 0, rate):
+            return self
+        mono = self.samples.mean(axis=0)
+        if sample_rate and sample_rate != rate:
+            from scipy.signal import resample_poly
+
+            g = gcd(sample_rate, rate)
+            mono = resample_poly(mono, sample_rate // g, rate // g)
+            rate = sample_rate
+        return AudioBuffer(mono, rate, self.source_format)
+
+    def to_sound(self):
+        """parselmouth.Sound view of the buffer (created once)."""
+        if self._sound is None:
+            import parselmouth
+
+            self._sound = parselmouth.Sound(self.samples, sampling_frequency=self.sample_rate)
+        return self._sound
+
+    def to_pcm16(self):
+        """Mono 16-bit little-endian PCM bytes, e.g. for speech_recognition."""
+        # Channels are summed and clipped, the same downmix
+        # speech_recognition.AudioFile applies (audioop.tomono(.., 1, 1))
+        mono = self.samples.sum(axis=0)
+        pcm = np.clip(np.floor(mono * 32768.0), -32768, 32767).astype("<i2")
+        return pcm.tobytes()
@@ -22,15 +22,20 @@
 #         return False, 0.0
 
 
-import parselmouth
-
-def detect_distortion(audio_path):
+from utils.acoustics import AcousticFeatures, extract_features
+
+def detect_distortion(features):
+    """
+    features: AcousticFeatures of the recording, shared with the rest of
+    the pipeline. An AudioBuffer or a file path is also accepted and
+    analysed here.
+    """
     try:
-        snd = parselmouth.Sound(audio_path)
-        intensity = snd.to_intensity()
+        if not isinstance(features, AcousticFeatures):
+            features = extract_features(features)
 
-        mean_intensity = intensity.values.mean()
-        sd_intensity = intensity.values.std()
+        mean_intensity = features.mean_intensity
+        sd_intensity = features.sd_intensity
 
         distorted = (sd_intensity > 10 or mean_intensity < 50)
         score = round(sd_intensity + (100 - mean_intensity), 2)
@@ -39,7 +44,3 @@ def detect_distortion(audio_path):
 
     except Exception:
         return False, 0.0
-
-
-
-
@@ -1,127 +1,164 @@
-
 """
 Utility functions to identify specific letters/syllables for each error type.
 Used for generating age-appropriate practice suggestions.
+
+classify_errors() does the whole job in one pass over a single alignment;
+the identify_* functions are kept for callers that want one error type.
+mark_near_misses() grades substituted syllable pairs with the phonetic
+cost matrix (utils/phonetic_costs.py).
 """
 
-from txt2ipa.kannada2ipa.ipaconvert import ipa2kannada_value
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from utils.alignment import edit_ops, op_indices, phonetic_distance, summarize, SUBSTITUTION, OMISSION, ADDITION
+
+# Distortion score (see utils/distortion.py) above which a same-length
+# mismatch is reported as Distortion instead of Substitution
+DISTORTION_THRESHOLD = 80
+
+# Phonetic distance (see utils.alignment.phonetic_distance) up to which a
+# substituted syllable is a near miss: one vowel length, voicing or
+# aspiration slip, or dental for retroflex (0.15-0.3). A place change like
+# p→k or a manner change like k→tʃ or l→n (0.4 and up) is not.
+NEAR_MISS_DISTANCE = 0.3
+
+
+class Classification(NamedTuple):
+    error_type: str                   # "", "Omission", "Addition", "Substitution" or "Distortion"
+    error_syllables: List[Any]        # syllables, or {"target", "spoken"} pairs for S / D
+    counts: Dict[str, int]            # alignment summary {"S", "O", "D", "A", "Correct"}
+    distortion_score: Optional[float]  # only computed for same-length mismatches
+
+
+def _missing(reference, other):
+    """
+    Units of `reference` not matched in `other`, counting repeats: a syllable
+    said once where the target has it twice is missing once. Linear time.
+    """
+    left = Counter(other)
+    missing = []
+    for unit in reference:
+        if left[unit]:
+            left[unit] -= 1
+        else:
+            missing.append(unit)
+    return missing
+
+
+def _pairs(target_syllable, spoken_syllable, ops, gap):
+    """{"target", "spoken"} for every non-matching aligned position."""
+    ti, si = op_indices(ops)
+    pairs = []
+    for op, i, j in zip(ops.tolist(), ti.tolist(), si.tolist()):
+        if op == SUBSTITUTION:
+            pairs.append({"target": target_syllable[i], "spoken": spoken_syllable[j]})
+        elif op == OMISSION:
+            pairs.append({"target": target_syllable[i], "spoken": gap})
+        elif op == ADDITION:
+            pairs.append({"target": gap, "spoken": spoken_syllable[j]})
+    return pairs
+
+
+def classify_errors(target_syllable, spoken_syllable, distortion_score=None, gap=""):
+    """
+    Error type, error syllables and counts from one alignment.
+
+    Args:
+        target_syllable: sequence of target syllables (IPA strings or interned IDs)
+        spoken_syllable: sequence of spoken syllables (IPA strings or interned IDs)
+        distortion_score: zero-argument callable returning the audio's
+            distortion score; only called for a same-length mismatch
+        gap: value used for the missing side of a pair ("" for strings,
+            utils.syllable_vocab.GAP for IDs)
+
+    Returns:
+        Classification. Fewer spoken syllables is an Omission and more is
+        an Addition, with the syllables missing from the other side
+        (multiset difference). Same length is a Substitution, or a
+        Distortion when the distortion score is above DISTORTION_THRESHOLD,
+        with the aligned {"target", "spoken"} pairs that differ.
+    """
+    ops = edit_ops(target_syllable, spoken_syllable).ops
+    counts = summarize(ops)
+
+    if counts["Correct"] == len(target_syllable) == len(spoken_syllable):
+        return Classification("", [], counts, None)
+    if len(target_syllable) > len(spoken_syllable):
+        return Classification("Omission", _missing(target_syllable, spoken_syllable), counts, None)
+    if len(target_syllable) < len(spoken_syllable):
+        return Classification("Addition", _missing(spoken_syllable, target_syllable), counts, None)
+
+    score = distortion_score() if distortion_score is not None else 0.0
+    error_type = "Distortion" if score > DISTORTION_THRESHOLD else "Substitution"
+    pairs = _pairs(target_syllable, spoken_syllable, ops, gap)
+    return Classification(error_type, pairs, counts, score)
+
+
+def mark_near_misses(pairs):
+    """
+    Add "phonetic_distance" and "near_miss" to every {"target", "spoken"}
+    IPA pair with both sides present (pairs with a gap are left as they
+    are). Returns `pairs`.
+    """
+    for pair in pairs:
+        if pair["target"] and pair["spoken"]:
+            distance = phonetic_distance(pair["target"], pair["spoken"])
+            pair["phonetic_distance"] = round(distance, 3)
+            pair["near_miss"] = distance <= NEAR_MISS_DISTANCE
+    return pairs
+
 
 def identify_omission(target_syllable, spoken_syllable):
     """
     Identify omitted (deleted) syllables.
-    
-    Searches each syllable from target_syllable in spoken_syllable list.
-    If not present, stores it as deleted.
-    
+
     Args:
-        target_syllable: list of target syllables
-        spoken_syllable: list of spoken syllables
-    
+        target_syllable: sequence of target syllables (IPA strings or interned IDs)
+        spoken_syllable: sequence of spoken syllables (IPA strings or interned IDs)
+
     Returns:
-        list: List of deleted/omitted syllables
+        list: target syllables not matched in spoken_syllable (repeats counted)
     """
-    deleted = []
-    
-    for syllable in target_syllable:
-        if syllable not in spoken_syllable:
-            # ds = ipa2kannada_value(syllable)
-            deleted.append(syllable)
-    print("Deleted syllables:", deleted)
-    return deleted
+    return _missing(target_syllable, spoken_syllable)
 
 
 def identify_addition(target_syllable, spoken_syllable):
     """
     Identify added syllables.
-    
-    Searches each syllable from spoken_syllable in target_syllable list.
-    If not there, marks it as addition.
-    
+
     Args:
-        target_syllable: list of target syllables
-        spoken_syllable: list of spoken syllables
-    
+        target_syllable: sequence of target syllables (IPA strings or interned IDs)
+        spoken_syllable: sequence of spoken syllables (IPA strings or interned IDs)
+
     Returns:
-        list: List of added syllables
+        list: spoken syllables not matched in target_syllable (repeats counted)
     """
-    added = []
-    
-    for syllable in spoken_syllable:
-        if syllable not in target_syllable:
-            # ads = ipa2kannada_value(syllable)
-            added.append(syllable)
-    print("Added syllables:", added)
-    return added
+    return _missing(spoken_syllable, target_syllable)
 
 
-def identify_substitution(target_syllable, spoken_syllable):
+def identify_substitution(target_syllable, spoken_syllable, gap=""):
     """
     Identify substituted syllables.
-    
-    Compares both lists index-wise, takes target_syllable as main.
-    If element at same index is not matched (substituted), stores as substituted.
-    
+
     Args:
-        target_syllable: list of target syllables (main reference)
-        spoken_syllable: list of spoken syllables
-    
+        target_syllable: sequence of target syllables (main reference)
+        spoken_syllable: sequence of spoken syllables (IPA strings or interned IDs)
+
     Returns:
         list: List of dictionaries with target and spoken syllables for substitutions
-              Format: [{"target": "syl1", "spoken": "syl2"}, ...]
+              Format: [{"target": "syl1", "spoken": "syl2"}, ...]; an unmatched
+              syllable on either side is paired with `gap`
     """
-    substitutions = []
-    
-    # Compare index-wise, using target_syllable as main reference
-    max_len = max(len(target_syllable), len(spoken_syllable))
-    
-    for i in range(max_len):
-        target_syl = target_syllable[i]
-        spoken_syl = spoken_syllable[i]
-        # ts = ipa2kannada_value(target_syl)
-        # ss = ipa2kannada_value(spoken_syl)
-
-        if i < len(target_syllable) and i < len(spoken_syllable):
-                    
-            if target_syl != spoken_syl:
-                substitutions.append({
-                    "target": target_syl,
-                    "spoken": spoken_syl
-                })
-
-        elif i < len(target_syllable):
-            # Target has more syllables - this is actually an omission case
-            # But we'll include it as substitution for completeness
-            substitutions.append({
-                "target": target_syl,
-                "spoken": ""
-            })
-        elif i < len(spoken_syllable):
-            # Spoken has more syllables - this is actually an addition case
-            # But we'll include it as substitution for completeness
-            substitutions.append({
-                "target": "",
-                "spoken": spoken_syl
-            })
-    print("Sustituted syllables:", substitutions)
-    return substitutions
-
-
-def identify_distortion(target_syllable, spoken_syllable):
+    ops = edit_ops(target_syllable, spoken_syllable).ops
+    return _pairs(target_syllable, spoken_syllable, ops, gap)
+
+
+def identify_distortion(target_syllable, spoken_syllable, gap=""):
     """
     Identify distorted syllables (similar to substitution but with distortion context).
-    
-    For distortion, we compare index-wise similar to substitution,
-    as distortion often manifests as substitution-like errors.
-    
-    Args:
-        target_syllable: list of target syllables
-        spoken_syllable: list of spoken syllables
-    
-    Returns:
-        list: List of dictionaries with target and spoken syllables for distortions
-    """
-    # Distortion detection is similar to substitution
-    # The difference is in the audio analysis, but for letter identification
-    # we use the same approach
-    return identify_substitution(target_syllable, spoken_syllable)
 
+    Distortion shows up in the audio, not in the syllables, so the letters
+    are found the same way as for substitution.
+    """
+    return identify_substitution(target_syllable, spoken_syllable, gap)
@@ -0,0 +1,191 @@
+"""
+Pure-NumPy pitch and intensity tracks, a drop-in for the Praat passes.
+
+Both follow Praat's defaults for Sound.to_pitch() / Sound.to_intensity()
+so the two backends agree on the numbers the pipeline uses (mean pitch,
+mean and sd intensity):
+
+  intensity_track  mean-subtracted, Kaiser-20 weighted power per frame in
+                   dB re 2e-5 Pa; window 6.4 / minimum_pitch, step
+                   0.8 / minimum_pitch (minimum_pitch 100 Hz).
+  pitch_track      Boersma's autocorrelation method: Hanning window of
+                   3 periods of the pitch floor, autocorrelation divided
+                   by the window's own, best lags per frame as candidates,
+                   then a Viterbi path with Praat's octave / voicing costs.
+
+Every frame is analysed at once (sliding-window views + batched FFTs).
+Only the Viterbi pass loops, once per frame over a few candidates.
+Selected with ACOUSTICS_BACKEND=numpy, see utils/acoustics.py.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import fft
+
+# Sound.to_intensity() defaults
+MINIMUM_PITCH = 100.0
+# Sound.to_pitch() (autocorrelation method) defaults
+PITCH_FLOOR = 75.0
+PITCH_CEILING = 600.0
+PERIODS_PER_WINDOW = 3.0
+MAX_CANDIDATES = 15
+SILENCE_THRESHOLD = 0.03
+VOICING_THRESHOLD = 0.45
+OCTAVE_COST = 0.01
+OCTAVE_JUMP_COST = 0.35
+VOICED_UNVOICED_COST = 0.14
+
+_REFERENCE_POWER = 4e-10   # (2e-5 Pa) ** 2
+
+
+def _frame_times(n_samples, rate, window, step):
+    # Praat's Sampled_shortTermAnalysis: as many frames as fit, centred
+    duration = n_samples / rate
+    count = int(np.floor((duration - window) / step)) + 1
+    if count < 1:
+        return np.zeros(0)
+    first = 0.5 * duration - 0.5 * count * step + 0.5 * step
+    return first + step * np.arange(count)
+
+
+def _frames(x, rate, times, half):
+    # rows of 2 * half + 1 samples centred on the sample nearest each time
+    centres = np.rint(times * rate - 0.5).astype(np.int64)
+    padded = np.pad(x, (half, half))
+    return sliding_window_view(padded, 2 * half + 1)[centres]
+
+
+@lru_cache(maxsize=8)
+def _kaiser(half, half_window):
+    # Praat's intensity window, normalised to sum 1 (built once per rate)
+    x = np.arange(-half, half + 1) / half_window
+    weights = np.i0((2 * np.pi ** 2 + 0.5) * np.sqrt(np.clip(1 - x * x, 0, None)))
+    weights[np.abs(x) >= 1] = 0
+    return weights / weights.sum()
+
+
+@lru_cache(maxsize=8)
+def _hanning(size, nfft):
+    # the pitch window and its own autocorrelation (built once per rate)
+    hanning = 0.5 - 0.5 * np.cos(2 * np.pi * (np.arange(size) + 1) / (size + 1))
+    return hanning, fft.irfft(np.abs(fft.rfft(hanning, nfft)) ** 2, nfft)
+
+
+def intensity_track(samples, rate, minimum_pitch=MINIMUM_PITCH):
+    """(dB per frame, frame times) like Sound.to_intensity(minimum_pitch)."""
+    window = 6.4 / minimum_pitch
+    times = _frame_times(samples.shape[1], rate, window, 0.8 / minimum_pitch)
+    if not times.size:
+        return np.zeros(0), times
+
+    half = int(np.floor(0.5 * window * rate))
+    weights = _kaiser(half, 0.5 * window * rate)
+
+    power = np.zeros(times.size)
+    for channel in samples:
+        # sum w (x - m)^2 expanded, so the frames are never copied again
+        frames = _frames(channel, rate, times, half)
+        mean = frames.mean(axis=1)
+        power += np.einsum("ij,ij,j->i", frames, frames, weights) - 2 * mean * (frames @ weights) + mean * mean
+    power /= samples.shape[0]
+    with np.errstate(divide="ignore"):
+        db = np.where(power > 0, 10 * np.log10(power / _REFERENCE_POWER), -300.0)
+    return db, times
+
+
+def _candidates(r, lags, rate, min_lag, max_lag, count):
+    # local maxima of the normalised autocorrelation, refined by a
+    # parabola through each peak; returns (frequency, strength) per frame
+    mid = r[:, min_lag:max_lag + 1]
+    left = r[:, min_lag - 1:max_lag]
+    right = r[:, min_lag + 1:max_lag + 2]
+    peak = (mid > left) & (mid >= right) & (mid > 0.5 * VOICING_THRESHOLD)
+
+    curve = left - 2 * mid + right
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shift = np.where(curve < 0, 0.5 * (left - right) / curve, 0.0)
+    value = mid - 0.25 * (left - right) * shift
+    with np.errstate(divide="ignore"):
+        value = np.where(value > 1, 1 / value, value)      # as Praat does
+    frequency = rate / (lags[min_lag:max_lag + 1] + shift)
+
+    # octave cost: prefer the higher of near-equal candidates
+    with np.errstate(invalid="ignore"):
+        strength = np.where(peak, value - OCTAVE_COST * np.log2(PITCH_CEILING / frequency), -np.inf)
+    k = min(count, strength.shape[1])
+    best = np.argpartition(-strength, k - 1, axis=1)[:, :k]
+    rows = np.arange(r.shape[0])[:, None]
+    return frequency[rows, best], strength[rows, best]
+
+
+def _viterbi(frequency, strength, unvoiced):
+    # candidate 0 is "unvoiced", 1.. are the voiced ones (-inf if absent)
+    n = frequency.shape[0]
+    used = int(np.isfinite(strength).sum(axis=1).max()) if n else 0
+    order = np.argsort(-strength, axis=1)[:, :used]
+    rows = np.arange(n)[:, None]
+    cand_f = np.concatenate([np.zeros((n, 1)), frequency[rows, order]], axis=1)
+    cand_s = np.concatenate([unvoiced[:, None], strength[rows, order]], axis=1)
+
+    # every transition cost up front, so the loop is three array ops a frame
+    voiced = cand_f > 0
+    with np.errstate(divide="ignore"):
+        octave = np.where(voiced, np.log2(np.where(voiced, cand_f, 1.0)), 0.0)
+    both = voiced[:-1, :, None] & voiced[1:, None, :]
+    either = voiced[:-1, :, None] ^ voiced[1:, None, :]
+    jump = OCTAVE_JUMP_COST * np.abs(octave[1:, None, :] - octave[:-1, :, None])
+    cost = np.where(both, jump, np.where(either, VOICED_UNVOICED_COST, 0.0))
+
+    score = cand_s[0]
+    back = np.zeros(cand_f.shape, dtype=np.int64)
+    for i in range(1, n):
+        total = score[:, None] - cost[i - 1]
+        back[i] = total.argmax(axis=0)
+        score = total.max(axis=0) + cand_s[i]
+
+    path = np.empty(n, dtype=np.int64)
+    path[-1] = int(np.argmax(score))
+    for i in range(n - 1, 0, -1):
+        path[i - 1] = back[i, path[i]]
+    return cand_f[np.arange(n), path]
+
+
+def pitch_track(samples, rate, floor=PITCH_FLOOR, ceiling=PITCH_CEILING):
+    """(F0 per frame, 0 where unvoiced, frame times) like Sound.to_pitch()."""
+    x = samples.mean(axis=0)
+    window = PERIODS_PER_WINDOW / floor
+    times = _frame_times(x.size, rate, window, window / 4)
+    if not times.size:
+        return np.zeros(0), times
+
+    half = int(np.floor(window * rate)) // 2 - 1
+    frames = _frames(x, rate, times, half)
+    frames = frames - frames.mean(axis=1, keepdims=True)
+    global_peak = np.abs(x - x.mean()).max()
+    local_peak = np.abs(frames).max(axis=1)
+
+    size = frames.shape[1]
+    max_lag = min(int(np.ceil(rate / floor)), size // 2)
+    min_lag = max(1, int(np.floor(rate / ceiling)))
+    # zero padding to size + max_lag keeps the lags we read free of wrap-around;
+    # single precision is plenty for picking peaks and halves the FFT time
+    nfft = fft.next_fast_len(size + max_lag + 2, real=True)
+    hanning, ac_window = _hanning(size, nfft)
+    spectrum = fft.rfft((frames * hanning).astype(np.float32), nfft)
+    ac = fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, nfft)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (ac[:, :max_lag + 2] / ac[:, :1]) / (ac_window[:max_lag + 2] / ac_window[0])
+    r = np.nan_to_num(r)
+    frequency, strength = _candidates(r, np.arange(max_lag + 2, dtype=np.float64), rate,
+                                      min_lag, max_lag, MAX_CANDIDATES - 1)
+    frequency = np.where(np.isfinite(strength), frequency, 0.0)
+
+    if global_peak > 0:
+        relative = local_peak / global_peak
+    else:
+        relative = np.zeros_like(local_peak)
+    unvoiced = VOICING_THRESHOLD + np.maximum(
+        0.0, 2 - relative / (SILENCE_THRESHOLD / (1 + VOICING_THRESHOLD)))
+    return _viterbi(frequency, strength, unvoiced), times
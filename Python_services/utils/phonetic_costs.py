@@ -0,0 +1,189 @@
+"""
+Phonetic-feature substitution costs for alignment.
+
+Every phoneme the kan2ipa map can produce is described by a few
+articulatory features. The substitution cost of two phonemes is their
+feature distance in [0, 1]. Near misses are cheap: dental vs retroflex,
+aspirated vs unaspirated, short vs long vowel. Consonant vs vowel costs
+the full 1.
+
+The full pairwise matrix is built once and indexed by phoneme ID, so the
+aligner looks up a whole row per target phoneme (edit_ops(sub_costs=...)).
+It is saved next to this file as phonetic_costs.npz and reloaded if the
+inventory or features are unchanged. Build it with:
+    python -m utils.phonetic_costs
+
+Row / column UNKNOWN (the last one) is used for any character outside the
+inventory and costs 1 against everything.
+"""
+
+import hashlib
+import os
+import re
+
+import numpy as np
+
+# (phoneme, place, manner, voiced, aspirated)
+CONSONANT_FEATURES = [
+    ("p", "labial", "stop", 0, 0), ("pʰ", "labial", "stop", 0, 1),
+    ("b", "labial", "stop", 1, 0), ("bʰ", "labial", "stop", 1, 1),
+    ("m", "labial", "nasal", 1, 0), ("ʋ", "labiodental", "approximant", 1, 0),
+    ("t̪", "dental", "stop", 0, 0), ("t̪ʰ", "dental", "stop", 0, 1),
+    ("d̪", "dental", "stop", 1, 0), ("d̪ʰ", "dental", "stop", 1, 1),
+    ("n", "alveolar", "nasal", 1, 0), ("s", "alveolar", "fricative", 0, 0),
+    ("l", "alveolar", "lateral", 1, 0), ("ɾ", "alveolar", "tap", 1, 0),
+    ("tʃ", "postalveolar", "affricate", 0, 0), ("tʃʰ", "postalveolar", "affricate", 0, 1),
+    ("dʒ", "postalveolar", "affricate", 1, 0), ("dʒʰ", "postalveolar", "affricate", 1, 1),
+    ("ʃ", "postalveolar", "fricative", 0, 0),
+    ("ʈ", "retroflex", "stop", 0, 0), ("ʈʰ", "retroflex", "stop", 0, 1),
+    ("ɖ", "retroflex", "stop", 1, 0), ("ɖʰ", "retroflex", "stop", 1, 1),
+    ("ɳ", "retroflex", "nasal", 1, 0), ("ʂ", "retroflex", "fricative", 0, 0),
+    ("ɭ", "retroflex", "lateral", 1, 0),
+    ("ɲ", "palatal", "nasal", 1, 0), ("j", "palatal", "approximant", 1, 0),
+    ("k", "velar", "stop", 0, 0), ("kʰ", "velar", "stop", 0, 1),
+    ("g", "velar", "stop", 1, 0), ("gʰ", "velar", "stop", 1, 1),
+    ("ŋ", "velar", "nasal", 1, 0), ("ɦ", "glottal", "fricative", 1, 0),
+]
+
+# (phoneme, height 0 close .. 3 open, backness 0 front .. 2 back, long, rounded)
+VOWEL_FEATURES = [
+    ("i", 0, 0, 0, 0), ("i:", 0, 0, 1, 0),
+    ("e", 1, 0, 0, 0), ("e:", 1, 0, 1, 0),
+    ("a", 3, 1, 0, 0), ("a:", 3, 1, 1, 0),
+    ("ə", 2, 1, 0, 0), ("ʌ", 2, 2, 0, 0), ("ɻ̩", 2, 1, 0, 0),
+    ("ʊ", 0, 2, 0, 1), ("u:", 0, 2, 1, 1),
+    ("o", 1, 2, 0, 1), ("o:", 1, 2, 1, 1),
+]
+
+PLACES = ["labial", "labiodental", "dental", "alveolar", "postalveolar",
+          "retroflex", "palatal", "velar", "glottal"]
+# manners that are close to each other cost half
+_NEAR_MANNERS = {frozenset(("stop", "affricate")), frozenset(("affricate", "fricative")),
+                 frozenset(("lateral", "approximant")), frozenset(("tap", "lateral"))}
+
+PLACE_STEP = 0.1        # per step along PLACES, so dental vs retroflex is 0.3
+PLACE_MAX = 0.4
+MANNER_COST = 0.4
+VOICE_COST = 0.2
+ASPIRATION_COST = 0.15
+VOWEL_STEP = 0.15       # per step of height / backness
+LENGTH_COST = 0.15
+ROUNDING_COST = 0.15
+RHOTIC_COST = 0.3       # ɻ̩ against any other vowel
+
+# Costs are rounded to this grid so sums along a DP path stay exact in
+# float64 and tied alignments resolve the same way every time.
+QUANTUM = 1 / 64
+
+PHONEMES = [p for p, *_ in CONSONANT_FEATURES] + [p for p, *_ in VOWEL_FEATURES]
+PHONEME_IDS = {p: i for i, p in enumerate(PHONEMES)}
+UNKNOWN = len(PHONEMES)
+
+COSTS_PATH = os.environ.get(
+    "PHONETIC_COSTS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "phonetic_costs.npz")
+)
+
+# Longest phoneme first, so "d̪ʰ" wins over "d̪" and "d"
+_PHONEME_RE = re.compile("|".join(re.escape(p) for p in sorted(PHONEMES, key=len, reverse=True)) + "|.", re.S)
+
+
+def _consonant_cost(a, b):
+    _, place_a, manner_a, voiced_a, asp_a = a
+    _, place_b, manner_b, voiced_b, asp_b = b
+    cost = min(PLACE_MAX, PLACE_STEP * abs(PLACES.index(place_a) - PLACES.index(place_b)))
+    if manner_a != manner_b:
+        near = frozenset((manner_a, manner_b)) in _NEAR_MANNERS
+        cost += MANNER_COST / 2 if near else MANNER_COST
+    cost += VOICE_COST * (voiced_a != voiced_b)
+    cost += ASPIRATION_COST * (asp_a != asp_b)
+    return cost
+
+
+def _vowel_cost(a, b):
+    name_a, height_a, back_a, long_a, round_a = a
+    name_b, height_b, back_b, long_b, round_b = b
+    cost = VOWEL_STEP * (abs(height_a - height_b) + abs(back_a - back_b))
+    cost += LENGTH_COST * (long_a != long_b)
+    cost += ROUNDING_COST * (round_a != round_b)
+    cost += RHOTIC_COST * ((name_a == "ɻ̩") != (name_b == "ɻ̩"))
+    return cost
+
+
+def build_cost_matrix():
+    """(len(PHONEMES) + 1) square float64 matrix, last row / column UNKNOWN."""
+    features = CONSONANT_FEATURES + VOWEL_FEATURES
+    n_cons = len(CONSONANT_FEATURES)
+    size = len(PHONEMES) + 1
+    costs = np.ones((size, size))
+    for i, a in enumerate(features):
+        for j, b in enumerate(features):
+            if i == j:
+                cost = 0.0
+            elif (i < n_cons) != (j < n_cons):
+                cost = 1.0
+            elif i < n_cons:
+                cost = _consonant_cost(a, b)
+            else:
+                cost = _vowel_cost(a, b)
+            costs[i, j] = min(1.0, round(cost / QUANTUM) * QUANTUM)
+    return costs
+
+
+def _digest():
+    # identifies the inventory and cost settings the matrix was built from
+    settings = (CONSONANT_FEATURES, VOWEL_FEATURES, PLACES, sorted(map(sorted, _NEAR_MANNERS)),
+                PLACE_STEP, PLACE_MAX, MANNER_COST, VOICE_COST, ASPIRATION_COST,
+                VOWEL_STEP, LENGTH_COST, ROUNDING_COST, RHOTIC_COST, QUANTUM)
+    return hashlib.sha256(repr(settings).encode("utf-8")).hexdigest()
+
+
+def save_cost_matrix(path=COSTS_PATH):
+    costs = build_cost_matrix()
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, costs=costs, digest=np.array(_digest()))
+    os.replace(tmp, path)
+    return costs
+
+
+def load_cost_matrix(path=COSTS_PATH):
+    """The saved matrix if it matches the current features, else a fresh build."""
+    try:
+        with np.load(path) as data:
+            if str(data["digest"]) == _digest():
+                return data["costs"]
+    except (OSError, KeyError, ValueError):
+        pass
+    return build_cost_matrix()
+
+
+def phoneme_ids(ipa):
+    """
+    Split an IPA string into phonemes and return their IDs (int64 array).
+
+    A character outside the inventory gets UNKNOWN + 1 + its code point,
+    so it still only matches itself.
+    """
+    get = PHONEME_IDS.get
+    return np.array([get(token, UNKNOWN + 1 + ord(token[0])) for token in _PHONEME_RE.findall(ipa)],
+                    dtype=np.int64)
+
+
+def phonemes(ipa):
+    """The phoneme strings phoneme_ids() splits `ipa` into."""
+    return _PHONEME_RE.findall(ipa)
+
+
+_costs = None
+
+
+def get_cost_matrix():
+    """Process-wide cost matrix, loaded on first use."""
+    global _costs
+    if _costs is None:
+        _costs = load_cost_matrix()
+    return _costs
+
+
+if __name__ == "__main__":
+    save_cost_matrix()
+    print(f"wrote {COSTS_PATH} ({len(PHONEMES)} phonemes)")
@@ -0,0 +1,28 @@
+"""
+Per-process thread pools shared by request handlers.
+
+A LazyPool creates its ThreadPoolExecutor on first use, so under gunicorn
+(preload_app) each worker gets its own pool after the fork instead of
+inheriting the master's threads.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LazyPool:
+    """ThreadPoolExecutor created on first get() (i.e. after gunicorn forks)."""
+
+    def __init__(self, max_workers, thread_name_prefix):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix=self.thread_name_prefix)
+        return self._pool
@@ -0,0 +1,58 @@
+"""
+Integer interning of IPA syllables.
+
+Every IPA syllable in an analysis gets a small integer ID, so a syllable
+sequence is a compact array('H') that compares, hashes and aligns as
+integers. ID 0 is the empty string, used for alignment gaps. Strings are
+only recovered (decode) when a result is turned into JSON.
+
+A vocabulary is built per request: the target and spoken syllables are
+interned into a fresh SyllableVocab and decoded with the same one. Target
+words are client input, so a process-wide table would grow without bound;
+a request only ever holds the few dozen syllables it actually compares.
+"""
+
+from array import array
+
+MAX_SYLLABLES = 1 << 16  # array('H') holds IDs 0..65535
+
+GAP = 0
+
+
+class SyllableVocab:
+    """Two-way mapping between IPA syllable strings and integer IDs (one request, one thread)."""
+
+    def __init__(self):
+        self._ids = {"": GAP}
+        self._strings = [""]
+
+    def __len__(self):
+        return len(self._strings)
+
+    def intern(self, syllable):
+        """ID of `syllable`, assigning the next free one on first sight."""
+        sid = self._ids.get(syllable)
+        if sid is None:
+            sid = len(self._strings)
+            if sid >= MAX_SYLLABLES:
+                raise OverflowError(f"too many distinct syllables in one analysis ({MAX_SYLLABLES})")
+            self._strings.append(syllable)
+            self._ids[syllable] = sid
+        return sid
+
+    def encode(self, syllables):
+        """array('H') of IDs for a sequence of syllable strings."""
+        return array("H", map(self.intern, syllables))
+
+    def string(self, sid):
+        return self._strings[sid]
+
+    def decode(self, ids):
+        """List of syllable strings for a sequence of IDs."""
+        strings = self._strings
+        return [strings[i] for i in ids]
+
+    def decode_pairs(self, pairs):
+        """Decode [{"target": id, "spoken": id}, ...] as produced by identify_substitution."""
+        strings = self._strings
+        return [{key: strings[sid] for key, sid in pair.items()} for pair in pairs]
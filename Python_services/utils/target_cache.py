@@ -0,0 +1,101 @@
+"""
+Cache of target-word analysis for the screening vocabulary.
+
+Target words come from the fixed list in words.json, so their IPA string,
+akshara split and IPA syllables are computed once and reused by every
+request. The cache is warmed from words.json at startup, fills lazily for
+any other word, and is a bounded LRU (TARGET_CACHE_SIZE entries).
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+from syllable_Comparision.akshara_splitting import split_into_aksharas
+from txt2ipa.kannada2ipa.ipaconvert import kannada2ipa
+
+TARGET_CACHE_SIZE = int(os.environ.get("TARGET_CACHE_SIZE", 1024))
+
+_here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Local checkout layout first, then the combined Docker image (/app/assets)
+_WORDS_JSON_CANDIDATES = [
+    os.path.join(_here, "..", "Frontend_main", "assets", "data", "words.json"),
+    os.path.join(_here, "..", "assets", "data", "words.json"),
+]
+
+
+# Misses caused by warm_target_cache, kept out of the request-path counters
+_warm_misses = 0
+
+
+class TargetAnalysis(NamedTuple):
+    ipa: str                    # kannada2ipa(word)
+    aksharas: Tuple[str, ...]   # split_into_aksharas(word)
+    syllables: Tuple[str, ...]  # IPA per akshara, i.e. syllabify(word)
+
+
+@lru_cache(maxsize=TARGET_CACHE_SIZE)
+def analyze_target(word):
+    """IPA string, akshara split and IPA syllables for a target word (cached)."""
+    aksharas = tuple(split_into_aksharas(word))
+    syllables = tuple(kannada2ipa(ak) for ak in aksharas)
+    return TargetAnalysis(
+        ipa=kannada2ipa(word),
+        aksharas=aksharas,
+        syllables=syllables,
+    )
+
+
+def find_words_json():
+    path = os.environ.get("WORDS_JSON")
+    if path:
+        return path
+    for candidate in _WORDS_JSON_CANDIDATES:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def warm_target_cache(path=None):
+    """Precompute every word in words.json. Returns how many were loaded."""
+    global _warm_misses
+    path = path or find_words_json()
+    if not path or not os.path.exists(path):
+        print("⚠️ words.json not found; target cache will fill lazily")
+        return 0
+
+    with open(path, encoding="utf-8") as f:
+        bands = json.load(f)
+
+    words = {item["word"] for band in bands.values() for item in band if item.get("word")}
+    before = analyze_target.cache_info().misses
+    for word in words:
+        analyze_target(word)
+    _warm_misses += analyze_target.cache_info().misses - before
+    return len(words)
+
+
+def target_cache_stats():
+    """
+    Hit/miss counters and size of this process's target cache. Misses
+    from warming are reported as `warmed`, not as request misses.
+    """
+    info = analyze_target.cache_info()
+    misses = info.misses - _warm_misses
+    lookups = info.hits + misses
+    return {
+        "hits": info.hits,
+        "misses": misses,
+        "warmed": _warm_misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
+
+
+def clear_target_cache():
+    """Drop every cached word and reset the counters (e.g. after words.json changes)."""
+    global _warm_misses
+    analyze_target.cache_clear()
+    _warm_misses = 0
@@ -0,0 +1,147 @@
+"""
+Voice-activity trimming.
+
+Screening clips often carry seconds of silence or room noise around a
+one-word utterance. find_speech_span() locates the speech with a
+vectorised frame energy + zero-crossing rate pass, and trim_to_speech()
+cuts the AudioBuffer to that span (plus padding) before Praat and ASR see
+it.
+
+Frames count as speech when their energy is well above the clip's noise
+floor, or, for weak fricatives like /s/ and /ʃ/, a little above it with a
+high zero-crossing rate. Clips without enough contrast between speech and
+floor (all speech, or all noise) are left untouched so the speech gate can
+judge them.
+
+rough_mean_pitch() is a cheap voicing check for the same frames: one
+batched autocorrelation, lenient enough that it only rejects clips
+(hiss, clicks, breath) that Praat's pitch pass would find unvoiced too.
+"""
+
+import os
+from typing import NamedTuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+VAD_ENABLED = os.environ.get("VAD_ENABLED", "true").lower() == "true"
+VAD_FRAME_MS = 20
+VAD_HOP_MS = 10
+VAD_PAD_MS = float(os.environ.get("VAD_PAD_MS", 150))          # kept around the speech
+VAD_MIN_DURATION = float(os.environ.get("VAD_MIN_DURATION", 0.3))  # seconds, Praat needs a few pitch periods
+VAD_MIN_CONTRAST_DB = 6.0     # peak above floor needed to trust the split
+VAD_MARGIN_DB = 6.0           # speech: at least this far above the floor ...
+VAD_MARGIN_RATIO = 0.3        # ... or this share of the floor-to-peak range
+VAD_FRICATIVE_DB = 3.0        # weak frames this far above the floor ...
+VAD_FRICATIVE_ZCR = 0.3       # ... count when their zero-crossing rate is this high
+VOICING_FRAME_MS = 40         # two periods of Praat's 75 Hz pitch floor
+VOICING_MIN_CORRELATION = 0.3 # well under Praat's 0.45, so doubtful frames count as voiced
+VOICING_PITCH_RANGE = (75.0, 600.0)  # Hz, Praat's default floor / ceiling
+
+
+# Praat's intensity reference, (2e-5 Pa) ** 2
+_REFERENCE_POWER = 4e-10
+
+
+class SpeechSpan(NamedTuple):
+    start: int   # first sample kept
+    end: int     # one past the last sample kept
+    trimmed: bool
+
+
+def find_speech_span(audio):
+    """SpeechSpan (in samples) covering the speech in an AudioBuffer."""
+    rate = audio.sample_rate
+    mono = audio.samples.mean(axis=0)
+    total = len(mono)
+    whole = SpeechSpan(0, total, False)
+    frame = int(rate * VAD_FRAME_MS / 1000)
+    hop = int(rate * VAD_HOP_MS / 1000)
+    if frame < 1 or hop < 1 or total < frame:
+        return whole
+
+    frames = sliding_window_view(mono, frame)[::hop]
+    energy = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-12)
+    zcr = np.mean(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]), axis=1)
+
+    floor = np.percentile(energy, 10)
+    peak = energy.max()
+    if peak - floor < VAD_MIN_CONTRAST_DB:
+        return whole
+
+    loud = energy > floor + max(VAD_MARGIN_DB, VAD_MARGIN_RATIO * (peak - floor))
+    hiss = (energy > floor + VAD_FRICATIVE_DB) & (zcr > VAD_FRICATIVE_ZCR)
+    speech = np.flatnonzero(loud | hiss)
+    if not speech.size:
+        return whole
+
+    pad = int(rate * VAD_PAD_MS / 1000)
+    start = max(0, speech[0] * hop - pad)
+    end = min(total, speech[-1] * hop + frame + pad)
+
+    # grow short spans evenly so Praat still has enough signal
+    shortfall = int(rate * VAD_MIN_DURATION) - (end - start)
+    if shortfall > 0:
+        start = max(0, start - shortfall // 2)
+        end = min(total, start + int(rate * VAD_MIN_DURATION))
+        start = max(0, end - int(rate * VAD_MIN_DURATION))
+
+    # plain ints, so `trimmed` is a bool jsonify can encode, not np.bool_
+    start, end = int(start), int(end)
+    return SpeechSpan(start, end, start > 0 or end < total)
+
+
+def trim_to_speech(audio):
+    """(trimmed AudioBuffer, SpeechSpan); the buffer is unchanged when VAD is off."""
+    if not VAD_ENABLED:
+        return audio, SpeechSpan(0, audio.samples.shape[1], False)
+    span = find_speech_span(audio)
+    if not span.trimmed:
+        return audio, span
+    return audio.slice(span.start, span.end), span
+
+
+def level_db(audio):
+    """
+    Mean power of the (mean-removed) mono signal in dB, on Praat's
+    intensity scale. The mean of per-frame dB (Praat's mean intensity) is
+    never much above this, so it is a cheap bound for a loudness gate.
+    """
+    mono = audio.samples.mean(axis=0)
+    power = float(np.var(mono)) if mono.size else 0.0
+    return float(10 * np.log10(power / _REFERENCE_POWER)) if power > 0 else -300.0
+
+
+def rough_mean_pitch(audio):
+    """
+    Mean F0 in Hz over non-overlapping 40 ms frames, unvoiced frames
+    counting as 0 like Praat's mean pitch. A frame is voiced when its
+    normalised autocorrelation peaks above VOICING_MIN_CORRELATION within
+    the pitch range. Far cheaper than the Praat pass and errs towards
+    "voiced", so it can gate ASR before Praat has run.
+    """
+    rate = audio.sample_rate
+    mono = audio.samples.mean(axis=0)
+    frame = int(rate * VOICING_FRAME_MS / 1000)
+    count = len(mono) // frame if frame else 0
+    if not count:
+        return 0.0
+
+    frames = mono[:count * frame].reshape(count, frame)
+    frames = frames - frames.mean(axis=1, keepdims=True)
+    spectrum = np.fft.rfft(frames, 2 * frame, axis=1)
+    acf = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, axis=1)[:, :frame]
+
+    low = max(1, int(rate / VOICING_PITCH_RANGE[1]))
+    high = min(frame - 1, int(rate / VOICING_PITCH_RANGE[0]))
+    lags = np.arange(low, high + 1)
+    energy = acf[:, :1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.where(energy > 0, acf[:, low:high + 1] / energy, 0.0)
+    # the plain estimate favours short lags, so it picks the period rather
+    # than a multiple; the threshold uses the unbiased one, since a lag of
+    # L only overlaps frame - L samples
+    best = r.argmax(axis=1)
+    peak = r[np.arange(count), best] * frame / (frame - lags[best])
+    voiced = peak >= VOICING_MIN_CORRELATION
+    return float(np.mean(np.where(voiced, rate / lags[best], 0.0)))